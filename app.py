@@ -1,415 +1,562 @@
 import streamlit as st
-import pandas as pd
-import json
-import yaml
 from datetime import datetime
-from io import BytesIO
 import os
-import glob
+import hashlib
+import threading
+import tracemalloc
+from collections import OrderedDict
+
+from est_parser import (
+    COLUMN_MAPPER,
+    COLUMN_MAPPER_VERSION,
+    PARALLEL_MIN_FILES,
+    PARSE_BATCH_BYTES,
+    PARSE_WORKERS,
+    LocalFile,
+    is_input_name,
+    iter_source_contents,
+    load_configs_folder,
+    run_parse_jobs,
+    scan_config_files,
+    yaml_parser_name,
+)
+from est_archive import ARCHIVE_UPLOAD_TYPES
+from est_collect import COLLECT_CONCURRENCY, COLLECT_TIMEOUT, COLLECT_URL_TEMPLATE, iter_collected, parse_targets
+from est_profile import NULL_PROFILER, StageProfiler
+from est_shared import SharedDatasetCache, enable_copy_on_write
+
+# pandas/numpy와 이를 쓰는 est_* 모듈(통합, 검색, 표, 통계, 드리프트, 저장소, 이력, 편집 내역, 내보내기)은
+# 앱 시작 시간에 들어가지 않도록 쓰는 함수/탭 안에서 불러온다 (est_startup.py로 확인)
 
 # --- [경로 자동 찾기] ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIGS_DIR = os.path.join(BASE_DIR, "configs")
 
-# configs 폴더가 없으면 자동 생성
-if not os.path.exists(CONFIGS_DIR):
-    os.makedirs(CONFIGS_DIR)
+# 파싱 결과 캐시(매니페스트 등) 저장 위치
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+MANIFEST_DIR = os.path.join(CACHE_DIR, "configs_manifest")
+STORE_PATH = os.path.join(CACHE_DIR, "fleet_store.sqlite")
+PATCH_LOG_PATH = os.path.join(CACHE_DIR, "edits.sqlite")
+HISTORY_PATH = os.path.join(CACHE_DIR, "history.sqlite")
 
-# --- [Edwards Korea 디자인 철학 - 간결함] ---
-st.set_page_config(
-    page_title="장비 정보 관리 시스템",
-    page_icon="🔧",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# --- [파일 파싱 캐시] ---
+PARSE_CACHE_MAX_ROWS = 500_000  # 캐시에 보관할 최대 행 수 (초과 시 오래된 파일부터 제거)
+
+class ParseCache:
+    """파일 내용 해시 기준 파싱 결과 캐시 (행 수 기준 LRU)"""
+    
+    def __init__(self, max_rows=PARSE_CACHE_MAX_ROWS):
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._total_rows = 0
+        self._lock = threading.Lock()  # 여러 세션이 동시에 접근
+    
+    def get(self, key):
+        """(행 리스트, 파서 경로) 반환, 없으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def put(self, key, rows, parser=None):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_rows -= len(old[0])
+            self._entries[key] = (rows, parser)
+            self._total_rows += len(rows)
+            
+            # 가장 오래 사용되지 않은 항목부터 제거 (방금 넣은 항목은 유지)
+            while self._total_rows > self.max_rows and len(self._entries) > 1:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._total_rows -= len(evicted)
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'rows': self._total_rows,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+@st.cache_resource
+def get_parse_cache():
+    """Streamlit 재실행 간에 유지되는 파싱 캐시"""
+    return ParseCache()
+
+def make_cache_key(content, file_name):
+    """파일 내용 해시 + 매핑 버전 + 파일명으로 캐시 키 생성"""
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return (digest, COLUMN_MAPPER_VERSION, file_name)
 
-# --- [간결한 디자인 스타일] ---
-st.markdown("""
-    <style>
-    /* Edwards Korea 색상 - 간결하고 전문적 */
-    :root {
-        --primary: #1E3A5F;
-        --secondary: #2C5F8D;
-        --accent: #4A90A4;
-        --light: #F8FAFC;
-        --gray: #6B7280;
-    }
-    
-    .simple-header {
-        background: #1E3A5F;
-        color: white;
-        padding: 1.5rem 2rem;
-        margin: -1rem -1rem 2rem -1rem;
-        border-bottom: 3px solid #4A90A4;
-    }
-    
-    .simple-header h1 {
-        color: white;
-        font-size: 1.8rem;
-        font-weight: 600;
-        margin: 0;
-        font-family: 'Malgun Gothic', 'Segoe UI', Arial, sans-serif;
-    }
-    
-    .simple-header p {
-        color: rgba(255,255,255,0.9);
-        font-size: 0.9rem;
-        margin: 0.5rem 0 0 0;
-    }
-    
-    .stDataFrame {
-        border: 1px solid #E8F0F5;
-        border-radius: 4px;
-    }
-    
-    .stButton > button {
-        background: #2C5F8D;
-        color: white;
-        border: none;
-        border-radius: 4px;
-        font-weight: 500;
-    }
-    
-    .stButton > button:hover {
-        background: #1E3A5F;
-    }
-    
-    .main .block-container {
-        padding-top: 2rem;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-# --- [표준 컬럼 매핑 - Edwards 표준] ---
-COLUMN_MAPPER = {
-    "LineTag": ["lineTag", "id", "Line Tag", "tag", "line_tag"],
-    "장비명": ["name", "applicationName", "장비명", "Device_Name", "deviceName", "equipmentName"],
-    "IP": ["ipAddress", "IP Address", "address", "IP", "ip", "ip_address"],
-    "보고명": ["reportName", "name", "보고명", "description", "report_name"],
-    "System Serial Number": ["systemSerialNumber", "Controller Serial Number", "System Serial Number", "Serial", "serial", "system_serial"],
-    "Pump Type": ["Pump Type", "applicationName", "model", "Application Version", "pumpType", "pump_type"],
-    "Pump Node Module": ["Pump Node Module", "Project Version", "version", "module", "pumpNodeModule", "name"],
-    "SliceType": ["SliceType", "id", "type", "slice", "sliceType"],
-    "FeedEngine": ["feedEngine", "FeedEngine", "engine", "feed_engine"],
-    "ToolType": ["ToolType", "toolType", "tool_type"],
-    "Version": ["version", "Version", "projectVersion", "Project Version"]
-}
-
-# --- [지능형 데이터 추출 함수] ---
-def extract_all_kv(obj, pool=None):
-    """중첩된 구조에서 모든 키-값 쌍을 재귀적으로 추출"""
-    if pool is None:
-        pool = {}
-    
-    if isinstance(obj, dict):
-        # name-version 쌍 특수 처리
-        n, v = obj.get('name'), obj.get('version') or obj.get('value')
-        if n and v is not None:
-            pool[str(n)] = v
+# --- [세션 공용 데이터셋 캐시] ---
+@st.cache_resource
+def get_dataset_cache():
+    """같은 데이터셋을 보는 모든 세션이 통합 데이터프레임 한 벌을 공유"""
+    return SharedDatasetCache()
+
+def shared_dataset(dataset_key, build_frame, conflicts=None):
+    """dataset_key 데이터셋의 이 세션용 읽기 전용 뷰 (다른 세션이 이미 만들었으면 다시 만들지 않음)
+    
+    build_frame(conflicts)는 데이터프레임을 만들며 IP 통합 값 충돌을 conflicts 리스트에 기록한다.
+    세션은 보고 있는 데이터셋 하나만 참조하며, 다른 데이터셋으로 바꾸면 이전 참조를 놓는다.
+    """
+    lease = st.session_state.get("dataset_lease")
+    if lease is None or lease.key != dataset_key:
+        def build():
+            found = []
+            return build_frame(found), {"merge_conflicts": found}
         
-        for k, v_ in obj.items():
-            if isinstance(v_, (dict, list)):
-                extract_all_kv(v_, pool)
-            else:
-                pool[k] = v_
-    elif isinstance(obj, list):
-        for item in obj:
-            extract_all_kv(item, pool)
+        new_lease = get_dataset_cache().acquire(dataset_key, build)
+        if lease is not None:
+            lease.release()
+        lease = st.session_state["dataset_lease"] = new_lease
     
-    return pool
+    if conflicts is not None:
+        conflicts.extend(lease.extras["merge_conflicts"])
+    return lease.view()
 
-# --- [경로 자동 찾기] ---
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-CONFIGS_DIR = os.path.join(BASE_DIR, "configs")
+def release_dataset():
+    """보고 있던 공유 데이터셋 참조를 놓음 (표시할 데이터가 없을 때)"""
+    lease = st.session_state.pop("dataset_lease", None)
+    if lease is not None:
+        lease.release()
 
-# configs 폴더가 없으면 자동 생성
-if not os.path.exists(CONFIGS_DIR):
-    os.makedirs(CONFIGS_DIR)
-
-# --- [configs 폴더 스캔] ---
-def scan_configs_folder():
-    """configs 폴더에서 YAML/JSON 파일 스캔"""
-    config_files = []
-    if os.path.exists(CONFIGS_DIR):
-        all_files = os.listdir(CONFIGS_DIR)
-        config_files = [f for f in all_files if f.endswith(('.yml', '.yaml', '.json'))]
-        config_files.sort()
-    return config_files
-
-# --- [파일 형식 자동 감지 및 파싱] ---
-def detect_and_parse(file_content, file_name):
-    """파일 형식을 자동 감지하여 JSON 또는 YAML로 파싱"""
-    try:
-        # YAML 시도
-        file_content.seek(0)
-        data = yaml.safe_load(file_content)
-        if data is not None:
-            return data, 'yaml'
-    except:
-        pass
-    
-    try:
-        # JSON 시도
-        file_content.seek(0)
-        data = json.load(file_content)
-        return data, 'json'
-    except json.JSONDecodeError as e:
-        st.error(f"파일 '{file_name}' 파싱 실패: JSON 형식 오류")
-        return None, None
-    except Exception as e:
-        st.error(f"파일 '{file_name}' 파싱 실패: {str(e)}")
-        return None, None
-
-def scan_configs_folder():
-    """configs 폴더에서 YAML/JSON 파일 스캔"""
-    config_files = []
-    if os.path.exists(CONFIGS_DIR):
-        all_files = os.listdir(CONFIGS_DIR)
-        config_files = [f for f in all_files if f.endswith(('.yml', '.yaml', '.json'))]
-        config_files.sort()
-    return config_files
+# --- [데이터셋 단위 캐시] ---
+def cached_for_dataset(df, name, build, shared=True):
+    """데이터셋 식별자가 같은 동안 결과(색인/분석)를 재사용
+    
+    공유 데이터셋이면 결과도 모든 세션이 함께 쓰고, shared=False면(검색 등 세션별 상태) 세션에 보관한다.
+    """
+    dataset_key = df.attrs.get("dataset_key")
+    if dataset_key is None:
+        return build()
+    
+    def timed_build():
+        with get_profiler().stage(name) as stage:
+            value = build()
+            stage.rows = len(df)
+        return value
+    
+    lease = st.session_state.get("dataset_lease")
+    if shared and lease is not None and lease.key == dataset_key:
+        return lease.derived(name, timed_build)
+    
+    cache = st.session_state.get("dataset_cache")
+    if cache is None or cache.get("_key") != dataset_key:
+        # 데이터셋이 바뀌면 이전 결과는 모두 버림
+        cache = {"_key": dataset_key}
+        st.session_state["dataset_cache"] = cache
+    if name not in cache:
+        cache[name] = timed_build()
+    return cache[name]
 
-# --- [IP 기준 데이터 통합 함수] ---
-def parse_with_ip_merge(uploaded_files):
-    """여러 파일을 IP 기준으로 통합하여 데이터프레임 생성"""
-    all_rows = []
-    processed_files = 0
-    error_files = []
+def get_filter_index(df):
+    from est_merge import FilterIndex
+    return cached_for_dataset(df, "filter_index", lambda: FilterIndex(df))
+
+def get_fleet_stats(df):
+    from est_stats import compute_fleet_stats
+    return cached_for_dataset(df, "fleet_stats", lambda: compute_fleet_stats(df))
+
+def get_version_drift(df, baseline):
+    from est_drift import analyze_version_drift
+    return cached_for_dataset(df, f"version_drift:{baseline}", lambda: analyze_version_drift(df, baseline))
+
+# --- [장비 리스트 표 (서버 측 페이지/정렬)] ---
+# 필터 결과가 이 행 수를 넘으면 기본으로 페이지 단위 표시
+PAGED_TABLE_MIN_ROWS = 5_000
+
+@st.cache_resource
+def get_patch_log():
+    """모든 세션이 공유하는 편집 내역 (디스크에 영구 저장)"""
+    from est_patches import PatchLog
+    return PatchLog(PATCH_LOG_PATH)
+
+def get_row_keys(df):
+    from est_patches import RowKeys
+    return cached_for_dataset(df, "row_keys", lambda: RowKeys(df))
+
+def get_sort_order(df, column, descending):
+    from est_table import sort_order
+    return cached_for_dataset(df, f"sort:{column}:{descending}", lambda: sort_order(df, column, descending))
+
+# --- [값 검색 (토큰/3-gram 역색인)] ---
+def get_search_index(df, columns):
+    """데이터셋의 검색 색인 (값 사전 포함, 공용 데이터셋 캐시에서 데이터셋과 함께 제거됨)"""
+    from est_search import SearchIndex
+    return cached_for_dataset(df, f"search_index:{columns}", lambda: SearchIndex(df, columns))
+
+# --- [단계별 성능 측정] ---
+# 설정하면 측정 기록을 JSON Lines 파일에 계속 추가 (오프라인 분석용)
+PROFILE_LOG = os.environ.get("EST_PROFILE_LOG")
+
+def get_profiler():
+    """이번 실행의 측정기 (측정을 끄면 아무것도 기록하지 않는 공용 객체)"""
+    return st.session_state.get("profiler", NULL_PROFILER)
+
+def profiled_export(profiler, name, rows, build):
+    """다운로드 버튼 콜백용: 파일 생성 시간과 크기를 기록하며 build 실행"""
+    def run():
+        with profiler.stage(name) as stage:
+            data = build()
+            stage.rows = rows
+            stage.nbytes = len(data)
+        return data
+    return run
+
+def show_profile(profiler, export_profiler):
+    """경로 진단 탭의 단계별 처리 시간 표 + 측정 기록 다운로드"""
+    import pandas as pd
+    
+    combined = StageProfiler()
+    combined.records = profiler.records + export_profiler.records
+    if not combined.records:
+        st.caption("측정 기록이 없습니다.")
+        return
     
+    summary = pd.DataFrame(combined.summary())
+    summary["seconds"] = (summary["seconds"] * 1000).round(1)
+    summary = summary.rename(columns={
+        "stage": "단계", "files": "파일 수", "seconds": "시간(ms)", "rows": "행 수", "bytes": "바이트",
+        "peak_mb": "최대 할당(MB)", "rss_mb": "RSS 변화(MB)",
+    })
+    if summary["최대 할당(MB)"].isna().all():
+        summary = summary.drop(columns="최대 할당(MB)")
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+    
+    with st.expander("파일별 상세"):
+        detail = pd.DataFrame(combined.records)
+        detail["seconds"] = (detail["seconds"] * 1000).round(2)
+        st.dataframe(detail.rename(columns={"seconds": "ms"}), use_container_width=True, hide_index=True)
+    
+    st.download_button(
+        "📥 측정 기록 다운로드 (JSONL)",
+        data=combined.to_jsonl(run_at=datetime.now().isoformat(timespec='seconds')),
+        file_name=f"stage_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+        mime="application/x-ndjson",
+    )
+    if export_profiler.records:
+        st.caption("내보내기 시간은 다운로드 후 다음 화면 갱신 때 반영됩니다.")
+
+# --- [파일 오류 표시] ---
+def add_file_error(error_files, file_name, kind, message):
+    """파싱 실패는 바로 표시하고, 오류 목록에 추가"""
+    if kind == "parse":
+        st.error(f"파일 '{file_name}' 파싱 실패: {message}")
+        error_files.append(file_name)
+    else:
+        error_files.append(f"{file_name}: {message}")
+
+def show_file_errors(error_files):
+    if error_files:
+        st.warning(f"⚠️ {len(error_files)}개 파일 처리 중 오류 발생")
+        for err in error_files[:5]:  # 최대 5개만 표시
+            st.caption(f"  • {err}")
+
+# --- [IP 기준 데이터 통합 함수] ---
+def iter_uploaded_contents(uploaded_files, profiler=NULL_PROFILER):
+    """업로드 파일을 (표시 이름, 내용 bytes, 오류)로 하나씩 읽음 (압축 파일은 항목마다 하나씩)"""
     for file in uploaded_files:
         try:
-            file.seek(0)
-            raw, file_type = detect_and_parse(file, file.name)
-            
-            if raw is None:
-                error_files.append(file.name)
-                continue
-            
-            file_name = file.name
-            processed_files += 1
-            
-            # 파일 전체의 공통 정보 추출
-            global_pool = extract_all_kv(raw)
-            
-            # equipment 배열 처리 (새로운 형식: equipment -> applications -> versionInformation)
-            if 'equipment' in raw and isinstance(raw['equipment'], list):
-                for equipment in raw['equipment']:
-                    equip_ip = equipment.get('ipAddress', '-')
-                    equip_name = equipment.get('name', '-')
-                    
-                    # applications 배열 처리
-                    if 'applications' in equipment and isinstance(equipment['applications'], list):
-                        for app in equipment['applications']:
-                            app_name = app.get('applicationName', '-')
-                            
-                            # versionInformation 배열 처리
-                            if 'versionInformation' in app and isinstance(app['versionInformation'], list):
-                                for version_info in app['versionInformation']:
-                                    version_name = version_info.get('name', '-')
-                                    version_value = version_info.get('version', '-')
-                                    
-                                    row = {
-                                        "Source_File": file_name,
-                                        "IP": equip_ip,
-                                        "장비명": equip_name,
-                                        "applicationName": app_name,
-                                        "name": version_name,
-                                        "Version": version_value
-                                    }
-                                    
-                                    # 각 표준 컬럼별로 값 채우기
-                                    for std_name, candidates in COLUMN_MAPPER.items():
-                                        if std_name in ["IP", "장비명", "Version"]:
-                                            continue
-                                        
-                                        # 특수 처리: name 필드가 표준 컬럼명과 일치하는 경우
-                                        if std_name == "Pump Type" and version_name == "Pump Type":
-                                            row[std_name] = version_value
-                                        elif std_name == "Pump Node Module" and version_name == "Pump Node Module":
-                                            row[std_name] = version_value
-                                        elif std_name == "보고명" and version_name:
-                                            row[std_name] = version_name
-                                        else:
-                                            # 일반 매핑
-                                            for c in candidates:
-                                                val = None
-                                                if c == "applicationName":
-                                                    val = app_name
-                                                elif c == "name":
-                                                    # name 필드가 특정 컬럼과 매칭되는지 확인
-                                                    if std_name == "Pump Type" and version_name == "Pump Type":
-                                                        val = version_value
-                                                    elif std_name == "Pump Node Module" and version_name == "Pump Node Module":
-                                                        val = version_value
-                                                    else:
-                                                        val = version_name
-                                                elif c in version_info:
-                                                    val = version_info.get(c)
-                                                elif c in app:
-                                                    val = app.get(c)
-                                                elif c in equipment:
-                                                    val = equipment.get(c)
-                                                elif c in global_pool:
-                                                    val = global_pool.get(c)
-                                                
-                                                if val:
-                                                    row[std_name] = val
-                                                    break
-                                        
-                                        if std_name not in row:
-                                            row[std_name] = "-"
-                                    
-                                    all_rows.append(row)
-            
-            # summaryVersionInformation 처리 (기존 형식)
-            elif 'summaryVersionInformation' in raw and isinstance(raw['summaryVersionInformation'], list):
-                items = raw['summaryVersionInformation']
-                # 각 항목을 개별 행으로 추가
-                for item in items:
-                    item_pool = extract_all_kv(item)
-                    combined = {**global_pool, **item_pool}
-                    
-                    # IP 찾기
-                    ip = "-"
-                    for ip_key in COLUMN_MAPPER["IP"]:
-                        if combined.get(ip_key):
-                            ip = str(combined.get(ip_key))
-                            break
-                    
-                    # 각 항목을 개별 행으로 추가
-                    row = {"Source_File": file_name, "IP": ip}
-                    
-                    # 각 표준 컬럼별로 값 채우기
-                    for std_name, candidates in COLUMN_MAPPER.items():
-                        if std_name == "IP":
-                            continue
-                        for c in candidates:
-                            val = combined.get(c)
-                            if val:
-                                row[std_name] = val
-                                break
-                        # 값이 없으면 "-"로 설정
-                        if std_name not in row:
-                            row[std_name] = "-"
-                    
-                    all_rows.append(row)
+            if isinstance(file, LocalFile):
+                with file.open() as fp:
+                    for name, content in iter_source_contents(file.name, fp, profiler):
+                        yield name, content, None
             else:
-                # 기존 로직: IP 기준 통합
-                ip_groups = {}
-                
-                for item in items:
-                    item_pool = extract_all_kv(item)
-                    # 항목 정보와 전역 정보를 합침
-                    combined = {**global_pool, **item_pool}
-                    
-                    # IP 찾기
-                    ip = "-"
-                    for ip_key in COLUMN_MAPPER["IP"]:
-                        if combined.get(ip_key):
-                            ip = str(combined.get(ip_key))
-                            break
-                    
-                    # 동일 IP가 있으면 기존 데이터와 병합, 없으면 새로 생성
-                    if ip not in ip_groups:
-                        ip_groups[ip] = {"Source_File": file_name, "IP": ip}
-                    
-                    # 각 표준 컬럼별로 값 채우기
-                    for std_name, candidates in COLUMN_MAPPER.items():
-                        if std_name == "IP":
-                            continue
-                        # 기존에 값이 없을 때만 새로 찾아서 채움
-                        if ip_groups[ip].get(std_name) in [None, "-", ""]:
-                            for c in candidates:
-                                val = combined.get(c)
-                                if val:
-                                    ip_groups[ip][std_name] = val
-                                    break
-                
-                all_rows.extend(list(ip_groups.values()))
-            
+                file.seek(0)
+                for name, content in iter_source_contents(file.name, file, profiler):
+                    yield name, content, None
         except Exception as e:
-            error_files.append(f"{file.name}: {str(e)}")
+            yield file.name, None, ("error", str(e))
+
+# 경로 진단 탭에 표시하는 IP 통합 값 충돌 행 수 (전체 목록은 CSV로 다운로드)
+CONFLICT_DISPLAY_ROWS = 1_000
+
+def parse_with_ip_merge(uploaded_files, report=None, workers=None, profiler=NULL_PROFILER, merge=None, conflicts=None):
+    """여러 파일을 IP 기준으로 통합하여 데이터프레임 생성
+    
+    zip/tar.gz 등 압축 파일은 디스크에 풀지 않고 항목마다 한 파일처럼 처리한다.
+    나머지 인자는 merge_contents와 같다.
+    """
+    return merge_contents(
+        iter_uploaded_contents(uploaded_files, profiler), report, workers, profiler, merge, conflicts,
+    )
+
+def merge_contents(contents, report=None, workers=None, profiler=NULL_PROFILER, merge=None, conflicts=None,
+                   batch_bytes=PARSE_BATCH_BYTES):
+    """(이름, 내용 bytes, 오류) 목록을 파싱하여 IP 기준으로 통합한 데이터프레임 생성
+    
+    report 리스트를 넘기면 파일별 파서 경로/캐시 사용 여부를 기록한다.
+    merge/conflicts는 build_merged_frame의 IP 통합 설정/값 충돌 기록.
+    workers는 병렬 파싱 프로세스 수 (None이면 PARSE_WORKERS 설정 사용).
+    profiler를 넘기면 파일별 읽기/파싱/키 추출/컬럼 매핑과 병합 단계 시간을 기록한다.
+    batch_bytes만큼 내용이 쌓이면 먼저 파싱한다 (0이면 도착하는 대로 하나씩 파싱).
+    """
+    all_blocks = []
+    error_files = []
+    cache = get_parse_cache()
+    
+    # 파일(압축 파일 항목) 순서대로 [이름, 크기, 캐시 키, 결과] 보관
+    # 결과는 (행 블록, 파서 경로, 오류, 캐시 사용 여부)
+    slots = []
+    pending = []
+    pending_bytes = 0
+    
+    def flush():
+        # 새로 바뀐 파일만 파싱 (파일이 많으면 프로세스 풀 사용)
+        nonlocal pending_bytes
+        jobs = [(content, slots[i][0]) for i, content in pending]
+        for (i, _), (rows, parser, error) in zip(pending, run_parse_jobs(jobs, workers, profiler)):
+            if error is None:
+                cache.put(slots[i][2], rows, parser)
+            slots[i][3] = (rows, parser, error, False)
+        pending.clear()
+        pending_bytes = 0
+    
+    # 1단계: 파일 내용을 하나씩 읽고 캐시 확인
+    # 대기 중인 내용이 batch_bytes를 넘으면 먼저 파싱하여 메모리에 쌓아 두지 않음
+    for name, content, error in contents:
+        if error is not None:
+            slots.append([name, 0, None, (None, None, error, False)])
             continue
+        
+        # 내용이 바뀌지 않은 파일은 캐시된 행을 그대로 사용
+        with profiler.stage("cache_lookup", name, len(content)) as stage:
+            cache_key = make_cache_key(content, name)
+            cached = cache.get(cache_key)
+            stage.rows = len(cached[0]) if cached is not None else None
+        
+        if cached is None:
+            slots.append([name, len(content), cache_key, None])
+            pending.append((len(slots) - 1, content))
+            pending_bytes += len(content)
+            if pending_bytes >= batch_bytes:
+                flush()
+        else:
+            rows, parser = cached
+            slots.append([name, len(content), cache_key, (rows, parser, None, True)])
     
-    if error_files:
-        st.warning(f"⚠️ {len(error_files)}개 파일 처리 중 오류 발생")
-        for err in error_files[:5]:  # 최대 5개만 표시
-            st.caption(f"  • {err}")
+    if pending:
+        flush()
+    
+    # 2단계: 파일 순서대로 결과 병합
+    dataset_parts = []
+    for name, size, key, (rows, parser, error, from_cache) in slots:
+        if error is not None:
+            add_file_error(error_files, name, *error)
+            continue
+        
+        all_blocks.append(rows)
+        dataset_parts.append(key)
+        
+        if report is not None:
+            report.append({
+                "파일": name,
+                "파서": parser,
+                "캐시": "사용" if from_cache else "-",
+                "크기(bytes)": size,
+                "행 수": len(rows),
+            })
+    
+    show_file_errors(error_files)
+    
+    from est_merge import build_merged_frame, make_dataset_key
+    dataset_key = make_dataset_key((dataset_parts, merge))
+    with profiler.stage("build_frame") as stage:
+        df = shared_dataset(
+            dataset_key, lambda found: build_merged_frame(all_blocks, dataset_key, merge, found), conflicts,
+        )
+        stage.rows = len(df)
+    return df
+
+# --- [통합 데이터 저장소] ---
+@st.cache_resource
+def get_fleet_store():
+    from est_store import FleetStore
+    return FleetStore(STORE_PATH)
+
+def load_fleet_store(revision):
+    """저장소 데이터 읽기 (저장할 때마다 바뀌는 revision 기준으로 모든 세션이 공유)"""
+    dataset_key = f"store:{revision}"
+    
+    def build_frame(found):
+        df = get_fleet_store().load()
+        df.attrs["dataset_key"] = dataset_key
+        return df
+    return shared_dataset(dataset_key, build_frame)
+
+# --- [스냅샷 이력] ---
+HISTORY_DISPLAY_ROWS = 1_000
+
+@st.cache_resource
+def get_snapshot_history():
+    from est_history import SnapshotHistory
+    return SnapshotHistory(HISTORY_PATH)
+
+def record_snapshot(df, source):
+    """통합 결과를 스냅샷으로 기록 (같은 데이터셋은 한 번만, 반환: 기록 결과)
+    
+    스냅샷 시각은 파일의 내보낸 시각이므로, 마지막 스냅샷보다 오래된 파일이면 기록하지 않고
+    {"error": 메시지}를 돌려준다.
+    """
+    def record():
+        try:
+            return get_snapshot_history().record(df, source=source, dataset_key=df.attrs.get("dataset_key"))
+        except ValueError as e:
+            return {"error": str(e)}
+    return cached_for_dataset(df, "history_snapshot", record)
+
+def show_history(history):
+    """이력 탭: 스냅샷 목록, 두 시점 사이 변경, IP별 변경 이력"""
+    snapshots = history.snapshots()
+    if snapshots.empty:
+        st.warning("⚠️ 기록된 스냅샷이 없습니다.")
+        return
+    
+    st.dataframe(
+        snapshots.rename(columns={
+            "id": "번호", "taken_at": "시각", "recorded_at": "기록 시각", "source": "출처",
+            "rows": "레코드 수", "changes": "변경 셀 수",
+        }),
+        use_container_width=True, hide_index=True,
+    )
+    
+    labels = {int(row.id): f"#{row.id} {row.taken_at} ({row.source or '-'})" for row in snapshots.itertuples()}
+    ids = list(labels)
+    col1, col2 = st.columns(2)
+    with col1:
+        start = st.selectbox("이전 시점", ids, index=max(0, len(ids) - 2), format_func=labels.get)
+    with col2:
+        end = st.selectbox("이후 시점", ids, index=len(ids) - 1, format_func=labels.get)
+    diff = history.changes_between(start, end)
+    if diff.empty:
+        st.info("두 시점 사이에 바뀐 값이 없습니다.")
+    else:
+        from est_export import csv_report_bytes
+        st.caption(f"🔁 {diff[['IP', 'applicationName', 'name']].drop_duplicates().shape[0]}개 항목에서 {len(diff)}개 값 변경")
+        st.dataframe(diff.head(HISTORY_DISPLAY_ROWS), use_container_width=True, hide_index=True)
+        st.download_button(
+            "📥 변경 목록 다운로드 (CSV)",
+            data=lambda: csv_report_bytes(diff),
+            file_name=f"changes_{start}_{end}.csv",
+            mime="text/csv",
+        )
     
-    if not all_rows:
-        return pd.DataFrame()
+    ip = st.text_input("IP별 변경 이력", placeholder="예: 10.0.0.1").strip()
+    if ip:
+        ip_history = history.history(ip)
+        if ip_history.empty:
+            st.info(f"{ip}의 기록이 없습니다.")
+        else:
+            st.dataframe(ip_history, use_container_width=True, hide_index=True)
+
+# --- [configs 폴더 전체 통합] ---
+def load_configs_dataframe(recursive=False, report=None, workers=None, profiler=NULL_PROFILER, merge=None,
+                           conflicts=None):
+    """configs 폴더 전체를 매니페스트 기반으로 증분 적재하여 데이터프레임 생성"""
+    from est_merge import build_merged_frame, make_dataset_key
     
-    df = pd.DataFrame(all_rows)
-    # 최종 보정: 빈칸 처리
-    df = df.fillna("-")
+    sources = []
+    blocks, errors = load_configs_folder(
+        CONFIGS_DIR, MANIFEST_DIR, recursive=recursive, workers=workers,
+        report=report, sources=sources, profiler=profiler,
+    )
     
-    # 표준 컬럼 순서로 정렬
-    standard_cols = list(COLUMN_MAPPER.keys())
-    existing_cols = [col for col in standard_cols if col in df.columns]
-    other_cols = [col for col in df.columns if col not in standard_cols]
-    df = df[existing_cols + other_cols]
+    error_files = []
+    for rel, kind, message in errors:
+        add_file_error(error_files, rel, kind, message)
+    show_file_errors(error_files)
     
+    dataset_key = make_dataset_key((COLUMN_MAPPER_VERSION, sources, merge))
+    with profiler.stage("build_frame") as stage:
+        df = shared_dataset(dataset_key, lambda found: build_merged_frame(blocks, dataset_key, merge, found), conflicts)
+        stage.rows = len(df)
     return df
 
-# --- [펌프별 그룹핑 및 통계] ---
-def analyze_pump_data(df):
-    """펌프 데이터 분석 및 통계 생성"""
-    if df is None or df.empty:
-        return None
-    
-    result = {
-        'total_records': len(df),
-        'unique_ips': 0,
-        'unique_pumps': 0,
-        'pump_breakdown': {},
-        'tooltype_info': {}
-    }
-    
-    if 'IP' in df.columns:
-        result['unique_ips'] = df['IP'].nunique()
-    
-    pump_col = None
-    for col in ['장비명', 'Pump Type', 'applicationName']:
-        if col in df.columns:
-            pump_col = col
-            break
-    
-    if pump_col:
-        # 펌프만 필터링 (Pump가 포함된 항목)
-        pump_mask = df[pump_col].astype(str).str.contains('Pump', case=False, na=False)
-        pump_df = df[pump_mask]
-        result['unique_pumps'] = pump_df[pump_col].nunique() if not pump_df.empty else 0
-        result['pump_breakdown'] = pump_df[pump_col].value_counts().to_dict() if not pump_df.empty else {}
-    
-    # ToolType 정보 추출
-    if 'applicationName' in df.columns:
-        tooltype_mask = df['applicationName'].astype(str).str.contains('ToolType', case=False, na=False)
-        tooltype_df = df[tooltype_mask]
-        if not tooltype_df.empty and 'name' in tooltype_df.columns and 'version' in tooltype_df.columns:
-            tooltype_info = {}
-            for _, row in tooltype_df.iterrows():
-                name = str(row.get('name', ''))
-                version = str(row.get('version', ''))
-                if name and version:
-                    tooltype_info[name] = version
-            result['tooltype_info'] = tooltype_info
-    
-    return result
-
-# --- [엑셀 리포트 생성] --- (간소화)
-def generate_excel_report(df):
-    """간결한 엑셀 리포트 생성"""
-    output = BytesIO()
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # 원본 데이터만
-        df.to_excel(writer, sheet_name='Equipment Data', index=False)
-    
-    output.seek(0)
-    return output
+# --- [페이지 설정 (Edwards Korea 디자인 철학 - 간결함)] ---
+def setup_page():
+    """페이지 설정과 스타일 적용 (import 시 부작용이 없도록 main에서 호출)"""
+    st.set_page_config(
+        page_title="장비 정보 관리 시스템",
+        page_icon="🔧",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    st.markdown("""
+        <style>
+        /* Edwards Korea 색상 - 간결하고 전문적 */
+        :root {
+            --primary: #1E3A5F;
+            --secondary: #2C5F8D;
+            --accent: #4A90A4;
+            --light: #F8FAFC;
+            --gray: #6B7280;
+        }
+    
+        .simple-header {
+            background: #1E3A5F;
+            color: white;
+            padding: 1.5rem 2rem;
+            margin: -1rem -1rem 2rem -1rem;
+            border-bottom: 3px solid #4A90A4;
+        }
+    
+        .simple-header h1 {
+            color: white;
+            font-size: 1.8rem;
+            font-weight: 600;
+            margin: 0;
+            font-family: 'Malgun Gothic', 'Segoe UI', Arial, sans-serif;
+        }
+    
+        .simple-header p {
+            color: rgba(255,255,255,0.9);
+            font-size: 0.9rem;
+            margin: 0.5rem 0 0 0;
+        }
+    
+        .stDataFrame {
+            border: 1px solid #E8F0F5;
+            border-radius: 4px;
+        }
+    
+        .stButton > button {
+            background: #2C5F8D;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            font-weight: 500;
+        }
+    
+        .stButton > button:hover {
+            background: #1E3A5F;
+        }
+    
+        .main .block-container {
+            padding-top: 2rem;
+        }
+        </style>
+    """, unsafe_allow_html=True)
 
 # --- [메인 대시보드] ---
 def main():
+    setup_page()
+    # 세션 공용 데이터셋의 얕은 복사 뷰를 쓰기 위해 (pandas 3 미만만 해당)
+    enable_copy_on_write()
+    
+    # configs 폴더가 없으면 자동 생성
+    if not os.path.exists(CONFIGS_DIR):
+        os.makedirs(CONFIGS_DIR)
+    
     # 간결한 헤더
     st.markdown("""
         <div class="simple-header">
@@ -439,6 +586,7 @@ def main():
         **지원 형식:**
         - JSON 파일
         - YAML 파일
+        - zip/tar.gz 압축 파일 (풀지 않고 바로 읽음)
         - 다중 파일 업로드 가능
         
         **통합 기준:**
@@ -446,68 +594,143 @@ def main():
         - 중복 데이터 병합
         """)
         
+        st.markdown("---")
+        with st.expander("⚙️ 처리 옵션"):
+            parse_workers = st.number_input(
+                "병렬 파싱 프로세스 수",
+                min_value=0,
+                max_value=64,
+                value=PARSE_WORKERS,
+                step=1,
+                help=f"0 = CPU 코어 수, 1 = 순차 처리. 새 파일이 {PARALLEL_MIN_FILES}개 미만이면 항상 순차 처리합니다."
+            )
+            from est_merge import MERGE_KEYS, MERGE_POLICIES
+            merge_key = st.selectbox(
+                "IP 통합 기준",
+                list(MERGE_KEYS),
+                help="equipment/summaryVersionInformation 형식이 아닌 파일의 항목을 모든 파일에 걸쳐 한 행으로 합치는 기준입니다."
+            )
+            merge_policy = st.selectbox(
+                "통합 값 우선순위",
+                list(MERGE_POLICIES),
+                format_func=MERGE_POLICIES.get,
+                help="같은 키에 값이 여러 개면 우선순위가 가장 높은 파일의 값을 쓰고, 비어 있으면 다음 파일 값을 씁니다."
+            )
+            merge_priority = ()
+            if merge_policy == "priority":
+                merge_priority = tuple(
+                    line.strip() for line in st.text_area(
+                        "우선 파일 (한 줄에 하나, 위에 있을수록 우선)",
+                        help="파일 이름 또는 경로. 압축 파일 항목은 '압축 파일/항목 경로' 형식입니다."
+                    ).splitlines() if line.strip()
+                )
+            history_enabled = st.checkbox(
+                "스냅샷 이력 자동 기록",
+                value=True,
+                help="새로 통합한 데이터를 이력 탭의 스냅샷으로 기록합니다. 직전 스냅샷과 달라진 값만 저장합니다."
+            )
+            profile_enabled = st.checkbox(
+                "단계별 성능 측정",
+                help="파일별 읽기/파싱/키 추출/컬럼 매핑, 데이터프레임 생성, 분석, 내보내기 시간과 메모리(RSS 변화)를 경로 진단 탭에 표시합니다."
+            )
+            trace_memory = st.checkbox(
+                "메모리 할당 추적 (tracemalloc)",
+                disabled=not profile_enabled,
+                help="단계별 최대 할당량(MB)도 측정합니다. 추적하는 동안 처리가 느려지며, 병렬 파싱 프로세스 안의 할당은 포함되지 않습니다."
+            )
+        
         st.markdown("---")
         st.caption("개인 프로젝트 | Edwards Korea 스타일")
     
     # 파일 업로드 - 탭으로 구분
-    tab1, tab2, tab3 = st.tabs(["📤 파일 업로드", "📁 configs 폴더", "🔍 경로 진단"])
+    tab1, tab2, tab_collect, tab3, tab4, tab_history = st.tabs(
+        ["📤 파일 업로드", "📁 configs 폴더", "🌐 장비 수집", "🔍 경로 진단", "💾 저장소", "📜 이력"]
+    )
     
     uploaded_files = None
     
     with tab1:
         st.subheader("📤 파일 업로드")
         uploaded_files = st.file_uploader(
-            "JSON 또는 YAML 파일을 선택하세요 (다중 선택 가능)",
-            type=['json', 'yaml', 'yml'],
+            "JSON/YAML 파일 또는 압축 파일을 선택하세요 (다중 선택 가능)",
+            type=['json', 'yaml', 'yml'] + ARCHIVE_UPLOAD_TYPES,
             accept_multiple_files=True,
-            help="Edwards EST에서 내보낸 장비 정보 파일"
+            help="Edwards EST에서 내보낸 장비 정보 파일 또는 이를 묶은 zip/tar.gz 압축 파일"
         )
     
     with tab2:
         st.subheader("📁 configs 폴더에서 불러오기")
         st.info(f"📂 configs 폴더 위치: `{CONFIGS_DIR}`")
         
-        config_files = scan_configs_folder()
+        include_subfolders = st.checkbox("하위 폴더 포함", value=False)
+        config_files = [rel for rel, _ in scan_config_files(CONFIGS_DIR, include_subfolders)]
         
         if config_files:
             st.success(f"✅ {len(config_files)}개의 설정 파일을 찾았습니다.")
-            selected_config = st.selectbox("설정 파일 선택", config_files)
             
-            if st.button("📊 파일 불러오기", type="primary"):
-                config_path = os.path.join(CONFIGS_DIR, selected_config)
-                try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        if selected_config.endswith(('.yml', '.yaml')):
-                            data = yaml.safe_load(f)
-                        else:
-                            data = json.load(f)
-                    
-                    # 파일 객체처럼 만들기 (기존 로직과 호환)
-                    class FileWrapper:
-                        def __init__(self, name, data):
-                            self.name = name
-                            self.data = data
-                            self._content = None
-                        
-                        def seek(self, pos):
-                            pass
-                        
-                        def read(self):
-                            if self._content is None:
-                                if isinstance(self.data, dict):
-                                    self._content = json.dumps(self.data, ensure_ascii=False).encode('utf-8')
-                                else:
-                                    self._content = str(self.data).encode('utf-8')
-                            return self._content
-                    
-                    uploaded_files = [FileWrapper(selected_config, data)]
-                    st.success(f"✅ {selected_config} 로드 성공!")
-                    st.rerun()  # 페이지 새로고침하여 데이터 표시
-                except Exception as e:
-                    st.error(f"❌ 파일 읽기 오류: {str(e)}")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                selected_config = st.selectbox("설정 파일 선택", config_files)
+                if st.button("📊 파일 불러오기", type="primary"):
+                    # 재실행 후에도 유지되도록 세션에 기록 (파일은 디스크에서 직접 읽음)
+                    st.session_state["configs_source"] = {"mode": "file", "path": selected_config}
+                    st.session_state.pop("collected", None)
+            
+            with col2:
+                st.caption("전체 불러오기는 새로 생기거나 바뀐 파일만 다시 파싱합니다.")
+                if st.button("📚 configs 폴더 전체 불러오기"):
+                    st.session_state["configs_source"] = {"mode": "all", "recursive": include_subfolders}
+                    st.session_state.pop("collected", None)
         else:
-            st.warning(f"⚠️ configs 폴더에 YAML/JSON 파일이 없습니다.")
+            st.warning("⚠️ configs 폴더에 YAML/JSON 파일이 없습니다.")
             st.info(f"💡 `{CONFIGS_DIR}` 폴더에 파일을 넣어주세요.")
+        
+        configs_source = st.session_state.get("configs_source")
+        if configs_source:
+            if configs_source["mode"] == "all":
+                target = "configs 폴더 전체" + (" (하위 폴더 포함)" if configs_source["recursive"] else "")
+            else:
+                target = configs_source["path"]
+            st.caption(f"불러온 대상: {target} (업로드한 파일이 있으면 업로드 파일을 우선 표시)")
+            if st.button("불러오기 해제"):
+                del st.session_state["configs_source"]
+                configs_source = None
+    
+    with tab_collect:
+        st.subheader("🌐 장비에서 직접 수집")
+        st.caption("장비 목록에 동시에 요청하여 EST 내보내기 파일을 받고, 도착하는 대로 파싱하여 통합합니다.")
+        collect_text = st.text_area(
+            "장비 목록 (한 줄에 IP, IP:포트 또는 URL 하나)",
+            height=150,
+            placeholder="10.0.0.1\n10.0.0.2:8080\nhttps://10.0.0.3/est/export.yaml",
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            collect_url = st.text_input(
+                "요청 주소 형식", COLLECT_URL_TEMPLATE, help="{host} 자리에 목록의 IP(또는 IP:포트)가 들어갑니다."
+            )
+            collect_timeout = st.number_input("장비당 제한 시간(초)", min_value=1.0, max_value=300.0, value=COLLECT_TIMEOUT)
+        with col2:
+            collect_concurrency = st.number_input("동시 요청 수", min_value=1, max_value=256, value=COLLECT_CONCURRENCY)
+            collect_verify = st.checkbox("HTTPS 인증서 검증", value=True, help="자체 서명 인증서를 쓰는 장비는 끄세요.")
+        
+        collect_targets = None
+        if st.button("🌐 수집 시작", type="primary"):
+            collect_targets = parse_targets(collect_text)
+            if not collect_targets:
+                st.warning("⚠️ 수집할 장비를 입력하세요.")
+                collect_targets = None
+        
+        collected = st.session_state.get("collected")
+        if collected and collect_targets is None:
+            st.caption(
+                f"수집 결과: 장비 {collected['ok']}/{len(collected['items'])}대 ({collected['at']}) "
+                f"(업로드한 파일이 있으면 업로드 파일을 우선 표시)"
+            )
+            if st.button("수집 결과 해제"):
+                del st.session_state["collected"]
+                collected = None
     
     with tab3:
         st.subheader("🔍 경로 진단 도구")
@@ -518,61 +741,382 @@ def main():
             all_files = os.listdir(CONFIGS_DIR)
             st.write(f"📁 configs 폴더 내 전체 파일: {all_files}")
             
-            config_files = [f for f in all_files if f.endswith(('.yml', '.yaml', '.json'))]
+            config_files = [f for f in all_files if is_input_name(f)]
             if config_files:
                 st.success(f"✅ 인식 가능한 파일: {config_files}")
             else:
-                st.error("❌ 인식 가능한 .yml/.yaml/.json 파일이 없습니다!")
+                st.error("❌ 인식 가능한 .yml/.yaml/.json 또는 압축 파일이 없습니다!")
         else:
             st.warning(f"⚠️ {CONFIGS_DIR} 폴더가 없어서 새로 만들었습니다.")
     
-    if uploaded_files:
+    with tab4:
+        st.subheader("💾 통합 데이터 저장소")
+        st.info(f"📂 저장 위치: `{STORE_PATH}`")
+        
+        store = get_fleet_store()
+        store_info = store.info()
+        
+        if store_info:
+            summary = (
+                f"{store_info['rows']:,}개 레코드 저장됨 "
+                f"(저장 시각: {store_info['saved_at']}, 출처: {store_info['source'] or '-'})"
+            )
+            if store_info['stale']:
+                # 예전 컬럼 의미로 저장된 데이터는 불러오지 않음
+                st.error(f"❌ {summary} - 저장한 뒤 컬럼 매핑이 바뀌어 사용할 수 없습니다. 원본 파일에서 다시 통합하여 저장하세요.")
+            else:
+                st.success(f"✅ {summary}")
+            if st.button("🗑️ 저장소 비우기"):
+                store.clear()
+                st.rerun()
+        else:
+            st.warning("⚠️ 저장된 데이터가 없습니다.")
+        st.caption("업로드하거나 configs 폴더에서 불러온 데이터가 없으면 저장소 데이터를 바로 표시합니다.")
+    
+    # 이번 실행의 단계별 측정기 (내보내기는 버튼 콜백에서 실행되므로 세션에 따로 보관)
+    profiler = StageProfiler(enabled=profile_enabled)
+    st.session_state["profiler"] = profiler
+    # 옵션을 켜 둔 동안 할당 추적 (내보내기 콜백 포함), 끄면 이 세션이 켠 추적만 중지
+    if profile_enabled and trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            st.session_state["memory_tracing"] = True
+    elif st.session_state.pop("memory_tracing", False) and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    export_profiler = st.session_state.setdefault("export_profiler", StageProfiler())
+    export_profiler.enabled = profile_enabled
+    if not profile_enabled:
+        export_profiler.records = []
+    
+    df = None
+    parse_report = []
+    merge = {"policy": merge_policy, "key_columns": MERGE_KEYS[merge_key], "priority": merge_priority}
+    merge_conflicts = []
+    from_store = False
+    
+    if collect_targets:
+        # 수집 버튼을 누른 실행: 응답이 도착하는 대로 하나씩 파싱 (나머지 장비는 그동안 계속 수집)
+        collected = {"items": [], "ok": 0, "at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        progress = st.progress(0.0, text=f"장비 {len(collect_targets)}대 수집 중...")
+        
+        def track(items):
+            for i, item in enumerate(items, 1):
+                collected["items"].append(item)
+                collected["ok"] += item[2] is None
+                progress.progress(i / len(collect_targets), text=f"{i}/{len(collect_targets)} 응답: {item[0]}")
+                yield item
+        
+        df = merge_contents(
+            track(iter_collected(
+                collect_targets, url_template=collect_url, concurrency=int(collect_concurrency),
+                timeout=float(collect_timeout), verify_tls=collect_verify,
+            )),
+            report=parse_report, workers=int(parse_workers), profiler=profiler,
+            merge=merge, conflicts=merge_conflicts, batch_bytes=0,
+        )
+        progress.empty()
+        st.session_state["collected"] = collected
+        st.session_state.pop("configs_source", None)
+        source_count = collected["ok"]
+        source_label = f"장비 수집 {source_count}대"
+    elif uploaded_files:
         with st.spinner("파일을 분석하고 IP 기준으로 통합 중입니다..."):
-            df = parse_with_ip_merge(uploaded_files)
+            df = parse_with_ip_merge(
+                uploaded_files, report=parse_report, workers=int(parse_workers), profiler=profiler,
+                merge=merge, conflicts=merge_conflicts,
+            )
+        # 압축 파일은 안에 든 파일 수로 셈
+        source_count = len(parse_report) or len(uploaded_files)
+        source_label = f"업로드 파일 {source_count}개"
+    elif collected:
+        # 수집한 내용은 세션에 보관 (파싱 결과는 파싱 캐시에서 재사용)
+        df = merge_contents(
+            iter(collected["items"]), report=parse_report, workers=int(parse_workers), profiler=profiler,
+            merge=merge, conflicts=merge_conflicts,
+        )
+        source_count = collected["ok"]
+        source_label = f"장비 수집 {source_count}대"
+    elif configs_source:
+        with st.spinner("configs 폴더의 파일을 불러오는 중입니다..."):
+            if configs_source["mode"] == "all":
+                df = load_configs_dataframe(
+                    configs_source["recursive"], report=parse_report, workers=int(parse_workers),
+                    profiler=profiler, merge=merge, conflicts=merge_conflicts,
+                )
+            else:
+                rel = configs_source["path"]
+                local_file = LocalFile(os.path.join(CONFIGS_DIR, rel), rel)
+                df = parse_with_ip_merge(
+                    [local_file], report=parse_report, workers=int(parse_workers), profiler=profiler,
+                    merge=merge, conflicts=merge_conflicts,
+                )
+        source_count = len(parse_report)
+        source_label = f"configs 폴더 파일 {source_count}개"
+    elif store_info and not store_info['stale']:
+        # 다시 파싱하지 않고 저장소에서 바로 읽음
+        df = load_fleet_store(store_info['revision'])
+        from_store = True
+    if df is None:
+        release_dataset()
+    
+    # 저장소 데이터는 저장 전 통합할 때 기록되므로 새로 통합한 경우만 기록
+    if history_enabled and df is not None and not df.empty and not from_store:
+        snapshot = record_snapshot(df, source_label)
+        if snapshot.get("error"):
+            st.warning(f"⚠️ 스냅샷을 기록하지 않았습니다: {snapshot['error']}")
+    with tab_history:
+        st.subheader("📜 스냅샷 이력")
+        st.info(f"📂 저장 위치: `{HISTORY_PATH}`")
+        show_history(get_snapshot_history())
+    
+    # 파일별 파서 경로는 경로 진단 탭에 표시
+    with tab3:
+        # 아래 장비 리스트/리포트에서도 씀
+        import pandas as pd
+        from est_export import csv_report_bytes
+        
+        if parse_report:
+            st.markdown("**📑 파일별 파싱 경로**")
+            st.caption(f"YAML 로더: `{yaml_parser_name()}`")
+            st.dataframe(pd.DataFrame(parse_report), use_container_width=True, hide_index=True)
+        
+        if merge_conflicts:
+            conflict_df = pd.concat(merge_conflicts, ignore_index=True)
+            n_keys = int(conflict_df["선택"].sum())
+            st.markdown("**⚠️ IP 통합 값 충돌**")
+            st.caption(
+                f"{n_keys}개 항목(키 × 컬럼)에서 파일마다 값이 달라 '{MERGE_POLICIES[merge_policy]}' 기준으로 "
+                f"값을 골랐습니다. 각 항목의 첫 행(선택)이 통합 데이터에 쓰인 값입니다."
+            )
+            st.dataframe(conflict_df.head(CONFLICT_DISPLAY_ROWS), use_container_width=True, hide_index=True)
+            st.download_button(
+                "📥 값 충돌 목록 다운로드 (CSV)",
+                data=lambda: csv_report_bytes(conflict_df),
+                file_name=f"merge_conflicts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+            )
+        
+        cache_stats = get_dataset_cache().stats()
+        if cache_stats["datasets"]:
+            st.caption(
+                f"🧠 세션 공용 데이터셋 {cache_stats['datasets']}개 "
+                f"({cache_stats['bytes'] / 2**20:,.1f} / {cache_stats['max_bytes'] / 2**20:,.0f} MB, "
+                f"사용 중 {cache_stats['in_use']}개, 세션 참조 {cache_stats['sessions']}개, "
+                f"재사용 {cache_stats['hits']}회, 제거 {cache_stats['evictions']}회)"
+            )
         
+        # 단계별 측정 결과는 분석/필터까지 끝난 뒤 채움
+        profile_area = st.container() if profile_enabled else None
+    
+    if df is not None:
         if not df.empty:
-            st.success(f"✅ {len(uploaded_files)}개 파일에서 {len(df)}개 레코드를 성공적으로 통합했습니다.")
+            import numpy as np
+            from est_drift import DRIFT_BASELINES
+            from est_export import generate_excel_report
+            from est_merge import make_dataset_key
+            from est_table import PAGE_SIZES, page_count, page_positions, table_frame, view_positions
+            
+            if from_store:
+                st.success(f"💾 저장소에서 {len(df)}개 레코드를 불러왔습니다. (저장 시각: {store_info['saved_at']})")
+            else:
+                st.success(f"✅ {source_count}개 파일에서 {len(df)}개 레코드를 성공적으로 통합했습니다.")
+                
+                if st.button("💾 저장소에 저장", help="통합 결과를 저장해 두면 다음 접속 때 파싱 없이 바로 열립니다."):
+                    store.save(df, source=source_label)
+                    st.success("✅ 저장소에 저장했습니다.")
             
             st.markdown("---")
             st.subheader("📋 장비 리스트")
             
-            # 필터링 옵션 (IP + 장비명)
-            col1, col2 = st.columns(2)
+            display_cols = [col for col in list(COLUMN_MAPPER.keys()) + ["Source_File"] if col in df.columns]
             
-            filtered_df = df.copy()
+            # 필터링 옵션 (IP + 장비명, 여러 값 선택 가능)
+            # 색인은 데이터셋마다 한 번만 만들고, 선택 결과는 행 위치 교집합으로 계산
+            filter_index = get_filter_index(df)
+            selections = {}
+            col1, col2 = st.columns(2)
             
             with col1:
-                if "IP" in df.columns:
-                    unique_ips = ['전체'] + sorted([ip for ip in df['IP'].unique() if ip != "-"])
-                    selected_ip = st.selectbox("IP 주소로 필터링", unique_ips)
-                    
-                    if selected_ip != '전체':
-                        filtered_df = filtered_df[filtered_df['IP'] == selected_ip].copy()
+                if "IP" in filter_index.options:
+                    selections["IP"] = st.multiselect(
+                        "IP 주소로 필터링", filter_index.options["IP"], placeholder="전체"
+                    )
             
             with col2:
-                if "장비명" in df.columns:
-                    unique_equipments = ['전체'] + sorted([eq for eq in df['장비명'].unique() if eq != "-"])
-                    selected_equipment = st.selectbox("장비명으로 필터링", unique_equipments)
-                    
-                    if selected_equipment != '전체':
-                        filtered_df = filtered_df[filtered_df['장비명'] == selected_equipment].copy()
+                if "장비명" in filter_index.options:
+                    selections["장비명"] = st.multiselect(
+                        "장비명으로 필터링", filter_index.options["장비명"], placeholder="전체"
+                    )
+            
+            # 값 검색 (시리얼 번호/버전/애플리케이션 등, 값 사전의 3-gram/토큰 역색인으로 조회)
+            search_index = get_search_index(df, tuple(display_cols))
+            col1, col2, col3 = st.columns([3, 2, 1])
+            query = col1.text_input("값 검색", placeholder="시리얼 번호, 버전, 애플리케이션 이름 등 (대소문자 무시)")
+            search_col = col2.selectbox(
+                "검색 컬럼", [None] + search_index.columns, format_func=lambda c: c or "모든 컬럼"
+            )
+            prefix = col3.toggle(
+                "앞부분 일치",
+                help="끄면 값 중간에 들어 있어도 찾고, 켜면 값 또는 단어(., _, 공백 등으로 나뉜 조각)가 검색어로 시작하는 것만 찾습니다.",
+            )
+            
+            with profiler.stage("filter_select") as stage:
+                positions = filter_index.select(selections)
+                n_selected = len(df) if positions is None else len(positions)
+                stage.rows = n_selected
+            with profiler.stage("search") as stage:
+                found = search_index.search(query, [search_col] if search_col else None, prefix)
+                if found is not None:
+                    positions = found if positions is None else np.intersect1d(positions, found, assume_unique=True)
+                n_filtered = len(df) if positions is None else len(positions)
+                stage.rows = n_filtered
+            if positions is not None:
+                st.caption(f"🔎 {n_filtered} / {len(df)}개 레코드 표시")
+            
+            # 필터/검색이 바뀌면 편집기와 페이지를 새로 시작
+            filter_state = (selections, query, search_col, prefix)
             
             # 데이터 테이블 (편집 가능)
-            display_cols = [col for col in list(COLUMN_MAPPER.keys()) + ["Source_File"] if col in filtered_df.columns]
+            column_config = {
+                "IP": st.column_config.TextColumn("IP 주소", width="medium"),
+                "장비명": st.column_config.TextColumn("장비명", width="medium"),
+                "Version": st.column_config.TextColumn("버전", width="medium"),
+            }
+            # 편집 내역은 행 키(IP + applicationName + name) 기준으로 저장되어 다시 올린 파일에도 적용
+            patch_log = get_patch_log()
+            row_keys = get_row_keys(df)
+            edit_generation = st.session_state.get("edit_generation", 0)
+            
+            # 기본값은 필터 결과 기준 (검색어를 입력하는 동안 표시 방식이 바뀌지 않도록)
+            paged = st.toggle(
+                "페이지 단위 표시 (서버 측 정렬)",
+                value=n_selected > PAGED_TABLE_MIN_ROWS,
+                help="현재 페이지의 행만 브라우저로 보냅니다. 여러 페이지에서 편집한 값은 모두 리포트에 반영됩니다.",
+            )
+            
+            if paged:
+                col1, col2, col3 = st.columns([2, 1, 1])
+                sort_col = col1.selectbox("정렬 기준", [None] + display_cols, format_func=lambda c: c or "원래 순서")
+                descending = col2.toggle("내림차순", disabled=sort_col is None)
+                page_size = col3.selectbox("페이지당 행 수", PAGE_SIZES, index=1)
+                
+                with profiler.stage("table_view") as stage:
+                    order = get_sort_order(df, sort_col, descending) if sort_col else None
+                    view = view_positions(len(df), positions, order)
+                    stage.rows = len(view)
+                
+                # 필터/검색/정렬이 바뀌면 첫 페이지부터
+                view_key = make_dataset_key((df.attrs.get("dataset_key"), filter_state, sort_col, descending, page_size))
+                n_pages = page_count(len(view), page_size)
+                page = st.number_input(
+                    f"페이지 (전체 {n_pages:,}쪽, {len(view):,}개 레코드)",
+                    min_value=1, max_value=n_pages, value=1, step=1, key=f"table_page:{view_key}",
+                )
+                
+                page_pos = page_positions(view, page, page_size)
+                editor_key = f"table_editor:{view_key}:{page}:{edit_generation}"
+                st.data_editor(
+                    patch_log.apply(table_frame(df, page_pos, display_cols), page_pos, row_keys),
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400,
+                    num_rows="fixed",  # 페이지 모드에서는 셀 편집만 가능
+                    column_config=column_config,
+                    key=editor_key,
+                )
+                patch_log.record_editor_state(st.session_state.get(editor_key), df, page_pos, row_keys)
+                
+                # 내보내기는 현재 필터/검색/정렬 결과 전체 + 편집 내역 (버튼을 누를 때 생성)
+                export_rows = len(view)
+                export_frame = lambda: patch_log.apply(table_frame(df, view, display_cols), view, row_keys)
+            else:
+                # 행 편집 기능 (st.data_editor 사용, 저장된 편집 내역을 반영해 표시)
+                view = np.arange(len(df)) if positions is None else positions
+                editor_key = f"table_editor_full:{make_dataset_key((df.attrs.get('dataset_key'), filter_state))}:{edit_generation}"
+                edited_df = st.data_editor(
+                    patch_log.apply(table_frame(df, view, display_cols), view, row_keys),
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400,
+                    num_rows="dynamic",  # 행 추가/삭제 가능 (추가/삭제한 행은 이번 화면의 리포트에만 반영)
+                    column_config=column_config,
+                    key=editor_key,
+                )
+                patch_log.record_editor_state(st.session_state.get(editor_key), df, view, row_keys)
+                export_rows = len(edited_df)
+                export_frame = lambda: edited_df
+            
+            if len(patch_log):
+                with st.expander(f"✏️ 편집 내역 ({len(patch_log)}건, 검색/정렬은 원본 값 기준)"):
+                    st.dataframe(
+                        pd.DataFrame(
+                            [(" / ".join(key), column, old, new, edited_at)
+                             for key, column, old, new, edited_at in patch_log.entries()],
+                            columns=["행 키 (IP / applicationName / name)", "컬럼", "이전 값", "새 값", "편집 시각"],
+                        ).astype(str),
+                        use_container_width=True, hide_index=True,
+                    )
+                    if st.button("🗑️ 편집 내역 비우기"):
+                        patch_log.clear()
+                        # 편집기에 남아 있는 편집 상태도 버리도록 새 키 사용
+                        st.session_state["edit_generation"] = edit_generation + 1
+                        st.rerun()
+            
+            # 펌프별 통계 (필터와 관계없이 전체 데이터 기준)
+            st.markdown("---")
+            st.subheader("📊 펌프별 통계")
+            
+            stats = get_fleet_stats(df)
+            col1, col2, col3 = st.columns(3)
+            col1.metric("전체 레코드", stats['total_records'])
+            col2.metric("IP 수", stats['unique_ips'])
+            col3.metric("펌프 종류", stats['unique_pumps'])
             
-            # 행 편집 기능 (st.data_editor 사용)
-            edited_df = st.data_editor(
-                filtered_df[display_cols],
-                use_container_width=True,
-                hide_index=True,
-                height=400,
-                num_rows="dynamic",  # 행 추가/삭제 가능
-                column_config={
-                    "IP": st.column_config.TextColumn("IP 주소", width="medium"),
-                    "장비명": st.column_config.TextColumn("장비명", width="medium"),
-                    "Version": st.column_config.TextColumn("버전", width="medium"),
-                }
+            col1, col2 = st.columns(2)
+            with col1:
+                if stats['pump_breakdown']:
+                    st.markdown("**펌프별 레코드 수**")
+                    st.bar_chart(pd.Series(stats['pump_breakdown'], name="레코드 수"))
+                if not stats['ip_counts'].empty:
+                    st.markdown("**IP별 레코드 수 (상위 20개)**")
+                    st.bar_chart(stats['ip_counts'].head(20).rename("레코드 수"))
+            with col2:
+                if not stats['application_counts'].empty:
+                    st.markdown("**applicationName별 레코드 수 (상위 20개)**")
+                    st.bar_chart(stats['application_counts'].head(20).rename("레코드 수"))
+                if stats['tooltype_info']:
+                    st.markdown("**🛠️ ToolType 정보**")
+                    st.dataframe(
+                        pd.DataFrame(list(stats['tooltype_info'].items()), columns=["항목", "값"]),
+                        use_container_width=True, hide_index=True,
+                    )
+            
+            # 버전 드리프트 (필터와 관계없이 전체 데이터 기준)
+            st.markdown("---")
+            st.subheader("📈 버전 드리프트")
+            
+            baseline = st.radio(
+                "기준 버전", list(DRIFT_BASELINES), format_func=DRIFT_BASELINES.get, horizontal=True,
+                help="applicationName/name별로 기준 버전보다 낮은 버전을 쓰는 IP를 찾습니다.",
             )
+            drift = get_version_drift(df, baseline)
+            
+            if drift is not None and not drift['summary'].empty:
+                summary = drift['summary']
+                lagging = drift['lagging']
+                
+                col1, col2, col3 = st.columns(3)
+                col1.metric("분석 그룹", len(summary))
+                col2.metric("드리프트 그룹", int((summary["뒤처진 IP 수"] > 0).sum()))
+                col3.metric("뒤처진 IP", lagging["IP"].nunique())
+                
+                st.dataframe(summary, use_container_width=True, hide_index=True)
+                
+                if not lagging.empty:
+                    with st.expander(f"⚠️ 기준 버전보다 뒤처진 항목 ({len(lagging)}건)"):
+                        st.dataframe(lagging, use_container_width=True, hide_index=True)
+            else:
+                st.caption("버전 정보가 있는 레코드가 없습니다.")
             
             # 리포트 다운로드
             st.markdown("---")
@@ -580,26 +1124,27 @@ def main():
             
             col1, col2 = st.columns(2)
             
+            # 파일 내용은 버튼을 눌렀을 때만 생성 (재실행마다 만들지 않음)
             with col1:
-                # CSV 다운로드 (편집된 데이터)
-                csv = edited_df.to_csv(index=False).encode('utf-8-sig')
+                # CSV 다운로드 (편집된 데이터, 청크 단위 변환)
                 st.download_button(
                     "📄 CSV 리포트 다운로드",
-                    data=csv,
+                    data=profiled_export(
+                        export_profiler, "export_csv", export_rows, lambda: csv_report_bytes(export_frame())
+                    ),
                     file_name=f"Equipment_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv",
                     use_container_width=True
                 )
             
             with col2:
-                # Excel 다운로드 (편집된 데이터)
-                output = BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    edited_df.to_excel(writer, sheet_name='Equipment Data', index=False)
-                output.seek(0)
+                # Excel 다운로드 (편집된 데이터 + IP별 요약 + 버전 드리프트 요약)
                 st.download_button(
                     "📊 Excel 리포트 다운로드",
-                    data=output.getvalue(),
+                    data=profiled_export(
+                        export_profiler, "export_excel", export_rows,
+                        lambda: generate_excel_report(export_frame(), baseline=baseline).getvalue(),
+                    ),
                     file_name=f"Equipment_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     use_container_width=True
@@ -630,6 +1175,13 @@ version: D37486834_V5
 ipAddress: 192.168.1.100
                 """, language='yaml')
     
+    if profile_area is not None:
+        with profile_area:
+            st.markdown("**⏱️ 단계별 처리 시간**")
+            show_profile(profiler, export_profiler)
+        if PROFILE_LOG:
+            profiler.append_log(PROFILE_LOG, run_at=datetime.now().isoformat(timespec='seconds'))
+    
     # Footer
     st.markdown("---")
     st.markdown("""
@@ -0,0 +1,80 @@
+"""압축 파일(zip, tar, tar.gz 등) 속 EST 파일을 디스크에 풀지 않고 항목 단위로 읽기
+
+항목은 하나씩 스트림으로 압축 해제되므로 메모리 사용량은 압축 파일 전체가 아니라
+가장 큰 항목 크기에 비례한다.
+"""
+import lzma
+import posixpath
+import tarfile
+import zipfile
+import zlib
+
+ZIP_EXTENSIONS = ('.zip',)
+TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+ARCHIVE_EXTENSIONS = ZIP_EXTENSIONS + TAR_EXTENSIONS
+
+# 업로드 위젯의 type 목록 (위젯은 마지막 확장자만 보므로 .tar.gz는 gz로 허용)
+ARCHIVE_UPLOAD_TYPES = ['zip', 'tar', 'gz', 'tgz', 'bz2', 'tbz2', 'xz', 'txz']
+
+class ArchiveError(ValueError):
+    """압축 파일을 열거나 항목을 읽을 수 없을 때 발생"""
+
+def is_archive_name(name):
+    return name.lower().endswith(ARCHIVE_EXTENSIONS)
+
+def _wanted(member_name, extensions):
+    """읽을 항목인지 (숨김/메타데이터 항목과 확장자가 다른 항목은 제외)"""
+    parts = member_name.split('/')
+    if any(p.startswith('.') or p == '__MACOSX' for p in parts):
+        return False
+    return member_name.lower().endswith(extensions)
+
+def _member_name(name):
+    """압축 파일 안의 경로를 정규화 (백슬래시, 앞쪽 ./ 제거)"""
+    return posixpath.normpath(name.replace('\\', '/')).lstrip('/')
+
+def _iter_zip(fp, extensions):
+    with zipfile.ZipFile(fp) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            name = _member_name(info.filename)
+            if not _wanted(name, extensions):
+                continue
+            with zf.open(info) as stream:
+                yield name, stream.read()
+
+def _iter_tar(fp, extensions):
+    # 'r|*': 앞에서부터 한 번만 읽는 스트림 모드 (되감기 없이 압축 형식 자동 감지)
+    with tarfile.open(fileobj=fp, mode='r|*') as tf:
+        for info in tf:
+            if not info.isfile():
+                continue
+            name = _member_name(info.name)
+            if not _wanted(name, extensions):
+                continue
+            stream = tf.extractfile(info)
+            if stream is None:
+                continue
+            with stream:
+                yield name, stream.read()
+
+def iter_archive_members(fp, archive_name, extensions):
+    """압축 파일의 항목을 (항목 경로, 내용 bytes)로 하나씩 반환
+
+    항목마다 압축 해제 스트림을 열어 그 항목만 읽으므로 한 번에 메모리에 있는 것은 항목 하나뿐이다.
+    zip은 되감을 수 있는 파일 객체가 필요하고, tar 계열은 앞에서부터 한 번만 읽는다.
+    extensions에 해당하는 항목만 돌려주며, 압축 파일 안의 압축 파일은 열지 않는다.
+    """
+    if archive_name.lower().endswith(ZIP_EXTENSIONS):
+        members = _iter_zip(fp, extensions)
+    else:
+        members = _iter_tar(fp, extensions)
+
+    try:
+        yield from members
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, tarfile.TarError, zlib.error, lzma.LZMAError,
+            EOFError, OSError, NotImplementedError, RuntimeError) as e:
+        # OSError: 손상된 gzip/bz2 스트림, RuntimeError: 암호가 걸린 zip 항목,
+        # NotImplementedError: 지원하지 않는 압축 방식
+        raise ArchiveError(f"압축 파일을 읽을 수 없습니다: {e}") from e
@@ -0,0 +1,228 @@
+"""EST 파일 일괄 통합 (Streamlit 없이 실행하는 배치 CLI)
+
+사용 예:
+    python est_batch.py configs/ -r -o fleet.csv -o fleet.xlsx
+    python est_batch.py "exports/**/*.yaml" -o fleet.parquet --workers 8
+    python est_batch.py field_exports.zip -o fleet.xlsx
+    python est_batch.py exports/ -o fleet.csv --merge-policy newest --conflicts conflicts.csv
+    python est_batch.py configs/ -r -o fleet.parquet --history .cache/history.sqlite
+
+종료 코드: 0 성공, 1 통합할 데이터 없음, 2 잘못된 출력 형식/시각, 3 일부 파일 처리 실패, 4 스냅샷 기록 실패
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+from est_archive import ArchiveError
+from est_export import generate_excel_report, write_csv_report
+from est_history import SnapshotHistory, normalize_timestamp
+from est_merge import MERGE_POLICIES, build_merged_frame
+from est_parser import (
+    PARSE_BATCH_BYTES,
+    is_input_name,
+    iter_source_contents,
+    resolve_worker_count,
+    run_parse_jobs,
+    scan_config_files,
+)
+
+OUTPUT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".xlsx": "excel",
+}
+
+# 파일 내용을 한 번에 메모리에 올리는 묶음 크기 (묶음마다 프로세스 풀로 파싱)
+BATCH_FILES = 256
+
+def collect_inputs(patterns, recursive=False):
+    """폴더/glob/파일 경로 목록을 (표시 이름, 전체 경로) 목록으로 변환 (중복 제외)"""
+    found = []
+    seen = set()
+
+    def add(name, path):
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            found.append((name, path))
+
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            # 폴더는 configs 폴더와 같은 규칙으로 스캔, 이름은 폴더 기준 상대 경로
+            for rel, path in scan_config_files(pattern, recursive):
+                add(rel, path)
+        elif os.path.isfile(pattern):
+            add(os.path.basename(pattern), pattern)
+        else:
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                if os.path.isfile(path) and is_input_name(path):
+                    add(os.path.basename(path), path)
+    return found
+
+def parse_inputs(files, workers=None, batch_files=BATCH_FILES, log=None):
+    """파일 목록을 묶음 단위로 병렬 파싱 (반환: 행 블록 목록, 오류 목록, 읽은 바이트 수)
+
+    압축 파일은 항목마다 한 파일로 처리하며, 묶음은 파일 수(batch_files)나
+    내용 크기(PARSE_BATCH_BYTES)가 차면 파싱한다.
+    """
+    blocks = []
+    errors = []
+    total_bytes = 0
+    jobs = []
+    job_bytes = 0
+
+    def flush():
+        nonlocal job_bytes
+        for (_, name), (block, _, error) in zip(jobs, run_parse_jobs(jobs, workers)):
+            if error is not None:
+                errors.append((name, *error))
+            else:
+                blocks.append(block)
+        jobs.clear()
+        job_bytes = 0
+
+    for done, (name, path) in enumerate(files, 1):
+        try:
+            with open(path, 'rb') as f:
+                for member, content in iter_source_contents(name, f):
+                    total_bytes += len(content)
+                    job_bytes += len(content)
+                    jobs.append((content, member))
+                    if len(jobs) >= batch_files or job_bytes >= PARSE_BATCH_BYTES:
+                        flush()
+        except (OSError, ArchiveError) as e:
+            errors.append((name, "error", str(e)))
+
+        if log and (done % batch_files == 0 or done == len(files)):
+            log(f"  {done}/{len(files)}개 파일 읽음")
+
+    flush()
+    return blocks, errors, total_bytes
+
+def write_output(df, path, baseline="newest"):
+    """확장자에 맞는 형식으로 결과 저장"""
+    fmt = OUTPUT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt == "csv":
+        with open(path, 'wb') as f:
+            write_csv_report(df, f)
+    elif fmt == "parquet":
+        # category 컬럼에 숫자/문자열이 섞여 있을 수 있어 문자열로 맞춰 저장
+        df.astype({
+            col: str for col in df.columns
+            if df[col].dtype == object or isinstance(df[col].dtype, pd.CategoricalDtype)
+        }).to_parquet(path, index=False)
+    elif fmt == "excel":
+        with open(path, 'wb') as f:
+            generate_excel_report(df, baseline=baseline, output=f)
+    else:
+        raise ValueError(f"지원하지 않는 출력 형식: {path} (csv, parquet, xlsx)")
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="EST JSON/YAML 파일을 IP 기준으로 통합하여 CSV/Parquet/Excel로 저장",
+    )
+    parser.add_argument("inputs", nargs="+", help="폴더, 파일(zip/tar.gz 포함) 또는 glob 패턴 (예: 'exports/**/*.json')")
+    parser.add_argument("-o", "--output", action="append", required=True,
+                        help="출력 파일 (.csv, .parquet, .xlsx), 여러 번 지정 가능")
+    parser.add_argument("-r", "--recursive", action="store_true", help="폴더 입력 시 하위 폴더 포함")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="병렬 파싱 프로세스 수 (0: CPU 코어 수, 기본: EST_PARSE_WORKERS)")
+    parser.add_argument("--baseline", choices=("newest", "mode"), default="newest",
+                        help="엑셀 버전 드리프트 시트의 기준 버전")
+    parser.add_argument("--merge-policy", choices=tuple(MERGE_POLICIES), default="first",
+                        help="구조가 정해지지 않은 파일을 IP 기준으로 합칠 때 값 우선순위 "
+                             "(first: 입력 순서, newest: generatedAt 최신, priority: --priority 순서)")
+    parser.add_argument("--merge-serial", action="store_true",
+                        help="IP 대신 IP + 시리얼 번호 기준으로 합침")
+    parser.add_argument("--priority", action="append", default=[],
+                        help="--merge-policy priority에서 우선할 파일 이름 (앞에 지정할수록 우선, 여러 번 지정 가능)")
+    parser.add_argument("--conflicts", help="IP 통합 중 값이 서로 다른 항목을 저장할 CSV 파일")
+    parser.add_argument("--history", help="통합 결과를 스냅샷으로 기록할 이력 DB (SQLite, 바뀐 값만 저장)")
+    parser.add_argument("--taken-at", help="--history 스냅샷 시각 (ISO 형식, 시간대가 없으면 현지 시각, "
+                                           "기본: 파일의 generatedAt 중 가장 늦은 시각, 없으면 현재 시각)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황 출력 생략")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    log = None if args.quiet else (lambda msg: print(msg, file=sys.stderr))
+
+    for path in args.output:
+        if os.path.splitext(path)[1].lower() not in OUTPUT_FORMATS:
+            print(f"지원하지 않는 출력 형식: {path} (csv, parquet, xlsx)", file=sys.stderr)
+            return 2
+    if args.taken_at is not None:
+        try:
+            args.taken_at = normalize_timestamp(args.taken_at)
+        except ValueError as e:
+            print(f"잘못된 --taken-at: {e}", file=sys.stderr)
+            return 2
+
+    files = collect_inputs(args.inputs, args.recursive)
+    if not files:
+        print("처리할 YAML/JSON 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    workers = resolve_worker_count(args.workers)
+    if log:
+        log(f"{len(files)}개 파일 파싱 (워커 {workers}개)")
+
+    started = time.perf_counter()
+    blocks, errors, total_bytes = parse_inputs(files, args.workers, log=log)
+    merge = {
+        "policy": args.merge_policy,
+        "key_columns": ("IP", "System Serial Number") if args.merge_serial else ("IP",),
+        "priority": tuple(args.priority),
+    }
+    conflicts = []
+    df = build_merged_frame(blocks, merge=merge, conflicts=conflicts)
+    parsed = time.perf_counter()
+
+    for name, kind, message in errors:
+        label = "파싱 실패" if kind == "parse" else "오류"
+        print(f"  • {name}: {label} - {message}", file=sys.stderr)
+
+    if df.empty:
+        print("❌ 데이터를 추출할 수 없습니다.", file=sys.stderr)
+        return 1
+
+    for path in args.output:
+        write_output(df, path, args.baseline)
+        if log:
+            log(f"  저장: {path}")
+    if args.conflicts:
+        conflict_df = pd.concat(conflicts, ignore_index=True) if conflicts else pd.DataFrame()
+        with open(args.conflicts, 'wb') as f:
+            write_csv_report(conflict_df, f)
+        if log:
+            log(f"  값 충돌 {len(conflict_df)}행 저장: {args.conflicts}")
+    if args.history:
+        try:
+            result = SnapshotHistory(args.history).record(df, taken_at=args.taken_at, source=" ".join(args.inputs))
+        except ValueError as e:
+            print(f"스냅샷 기록 실패: {e}", file=sys.stderr)
+            return 4
+        if log:
+            log(
+                f"  스냅샷 #{result['snapshot_id']} 기록: 추가 {result['added']}, "
+                f"삭제 {result['removed']}, 변경 {result['changed']}행 ({args.history})"
+            )
+    finished = time.perf_counter()
+
+    parse_time = max(parsed - started, 1e-9)
+    # 압축 파일은 안에 든 파일 수로 셈
+    total_files = len(blocks) + len(errors)
+    print(
+        f"파일 {len(blocks)}/{total_files}개, {len(df)}행 통합 "
+        f"(파싱+병합 {parse_time:.2f}s, 저장 {finished - parsed:.2f}s)\n"
+        f"처리량: {total_files / parse_time:.1f} files/s, {len(df) / parse_time:,.0f} rows/s, "
+        f"{total_bytes / parse_time / 1e6:.1f} MB/s"
+    )
+    return 0 if not errors else 3
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""처리 단계별 성능 측정 (가상 EST 장비군 생성 → 단계별 시간/최대 메모리)
+
+단계: 파싱, 헤더 키 추출(extract_header_kv), 컬럼 매핑(행 변환), 병렬 파싱, 데이터프레임 생성,
+필터 색인/조회, 통계, 버전 드리프트, CSV/Excel 내보내기
+
+사용 예:
+    python est_bench.py --tools 500 --apps 40 --json bench.json
+    python est_bench.py --data configs --compare bench.json --skip excel
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+import pandas as pd
+
+from est_archive import ArchiveError
+from est_drift import analyze_version_drift
+from est_export import csv_report_bytes, generate_excel_report
+from est_search import SearchIndex
+from est_merge import FilterIndex, build_merged_frame
+from est_parser import (
+    ParseError,
+    extract_header_kv,
+    iter_source_contents,
+    parse_content,
+    parse_file_rows,
+    resolve_worker_count,
+    run_parse_jobs,
+    scan_config_files,
+    yaml_parser_name,
+)
+from est_stats import compute_fleet_stats
+from est_synth import write_fleet
+
+# 필터 조회 단계에서 실행하는 무작위 조건 수
+FILTER_QUERIES = 200
+
+def measure(func, trace_memory=True):
+    """func 실행 시간과 (선택) 최대 메모리 측정 (반환: 결과, 초, 최대 MB)
+
+    tracemalloc은 실행을 느리게 하므로 시간은 추적 없이 한 번, 메모리는 추적하며 한 번 더 잰다.
+    """
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak_mb
+
+def load_inputs(paths):
+    """파일 내용을 읽어 [(내용, 파일명)] 반환 (압축 파일은 항목별, 파싱할 수 없는 파일은 알리고 제외)"""
+    inputs = []
+    for name, path in paths:
+        with open(path, 'rb') as f:
+            try:
+                contents = list(iter_source_contents(name, f))
+            except ArchiveError as e:
+                print(f"  • {name}: {e}", file=sys.stderr)
+                continue
+        for member, content in contents:
+            try:
+                parse_content(content, member)
+            except ParseError as e:
+                print(f"  • {member}: 파싱 실패로 제외 - {e}", file=sys.stderr)
+                continue
+            inputs.append((content, member))
+    return inputs
+
+def _filter_queries(index, rng):
+    """IP/장비명 조합 조건 목록 (한 컬럼만, 여러 값, 두 컬럼 교집합)"""
+    ips = index.options.get("IP", [])
+    names = index.options.get("장비명", [])
+    queries = []
+    for _ in range(FILTER_QUERIES):
+        query = {}
+        if ips and rng.random() < 0.8:
+            query["IP"] = rng.sample(ips, min(len(ips), rng.randint(1, 3)))
+        if names and rng.random() < 0.5:
+            query["장비명"] = rng.sample(names, min(len(names), rng.randint(1, 2)))
+        queries.append(query)
+    return queries
+
+def _search_queries(index, rng):
+    """값 검색어 목록 (값 일부 문자열 검색, 앞부분 일치 검색)"""
+    terms = index.terms.terms
+    queries = []
+    for _ in range(FILTER_QUERIES if terms else 0):
+        term = rng.choice(terms)
+        start = rng.randrange(len(term))
+        queries.append((term[start:start + rng.randint(3, 8)], rng.random() < 0.3))
+    return queries
+
+def run_benchmark(inputs, workers=None, skip=(), trace_memory=True, baseline="newest"):
+    """입력 [(내용, 파일명)]으로 모든 단계를 측정 (반환: 단계별 기록 목록)"""
+    records = []
+    total_bytes = sum(len(content) for content, _ in inputs)
+
+    def stage(name, func, rows=None, nbytes=None):
+        if name in skip:
+            return None
+        result, seconds, peak_mb = measure(func, trace_memory)
+        records.append({
+            "stage": name,
+            "seconds": round(seconds, 4),
+            "rows": rows(result) if rows else None,
+            "bytes": nbytes,
+            "peak_mb": round(peak_mb, 1) if peak_mb is not None else None,
+        })
+        return result
+
+    parsed = stage("parse", lambda: [parse_content(c, n)[0] for c, n in inputs], nbytes=total_bytes)
+    if parsed is None:
+        parsed = [parse_content(c, n)[0] for c, n in inputs]
+
+    stage("extract_kv", lambda: [extract_header_kv(raw) for raw in parsed],
+          rows=lambda pools: sum(len(p) for p in pools))
+
+    mapped = lambda: [parse_file_rows(raw, name) for raw, (_, name) in zip(parsed, inputs)]
+    blocks = stage("column_mapping", mapped, rows=lambda bs: sum(len(b) for b in bs))
+    if blocks is None:
+        blocks = mapped()
+
+    stage("parallel_parse", lambda: run_parse_jobs(inputs, workers),
+          rows=lambda results: sum(len(b) for b, _, e in results if e is None), nbytes=total_bytes)
+
+    df = stage("build_frame", lambda: build_merged_frame(blocks), rows=len)
+    if df is None:
+        df = build_merged_frame(blocks)
+
+    index = stage("filter_index", lambda: FilterIndex(df), rows=lambda _: len(df)) or FilterIndex(df)
+    queries = _filter_queries(index, random.Random(0))
+    stage("filter_select", lambda: [df.take(p) for p in map(index.select, queries) if p is not None],
+          rows=lambda frames: sum(len(f) for f in frames))
+
+    search = stage("search_index", lambda: SearchIndex(df), rows=lambda _: len(df)) or SearchIndex(df)
+    searches = _search_queries(search, random.Random(0))
+    stage("search_query", lambda: [search.search(q, prefix=p) for q, p in searches],
+          rows=lambda found: sum(len(f) for f in found if f is not None))
+
+    stage("fleet_stats", lambda: compute_fleet_stats(df), rows=lambda _: len(df))
+    stage("version_drift", lambda: analyze_version_drift(df, baseline),
+          rows=lambda drift: len(drift['lagging']) if drift else 0)
+    stage("export_csv", lambda: csv_report_bytes(df), rows=lambda _: len(df))
+    stage("export_excel", lambda: generate_excel_report(df, baseline, BytesIO()), rows=lambda _: len(df))
+
+    return records
+
+def print_records(records, previous=None):
+    table = pd.DataFrame(records).astype({"rows": "Int64", "bytes": "Int64"})
+    if previous:
+        before = {r["stage"]: r["seconds"] for r in previous}
+        table["이전 대비"] = [
+            f"{r['seconds'] / before[r['stage']]:.2f}x" if before.get(r["stage"]) else "-"
+            for r in records
+        ]
+    print(table.astype(object).where(table.notna(), "-").to_string(index=False))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EST 처리 단계별 성능 측정")
+    parser.add_argument("--data", help="측정할 EST 파일 폴더 (없으면 가상 장비군 생성)")
+    parser.add_argument("--tools", type=int, default=200, help="생성할 장비(파일) 수")
+    parser.add_argument("--apps", type=int, default=40, help="장비당 애플리케이션 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-w", "--workers", type=int, default=None, help="병렬 파싱 프로세스 수")
+    parser.add_argument("--skip", action="append", default=[],
+                        help="건너뛸 단계 (예: export_excel), 여러 번 지정 가능")
+    parser.add_argument("--no-memory", action="store_true", help="최대 메모리 측정 생략 (더 빠름)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장 (회귀 비교용)")
+    parser.add_argument("--compare", help="이전 --json 결과와 시간 비교")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.data:
+            paths = scan_config_files(args.data, recursive=True)
+        else:
+            generated = write_fleet(tmp, args.tools, args.apps, seed=args.seed)
+            paths = [(os.path.basename(p), p) for p in generated]
+        inputs = load_inputs(paths)
+
+    if not inputs:
+        print("측정할 YAML/JSON 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    skip = {"export_excel" if s == "excel" else "export_csv" if s == "csv" else s for s in args.skip}
+    total_bytes = sum(len(c) for c, _ in inputs)
+    workers = resolve_worker_count(args.workers)
+    print(f"파일 {len(inputs)}개, {total_bytes / 1e6:.1f} MB (YAML 로더: {yaml_parser_name()}, 병렬 워커 {workers}개)")
+
+    records = run_benchmark(inputs, args.workers, skip, trace_memory=not args.no_memory)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)["stages"]
+    print_records(records, previous)
+
+    if args.json:
+        result = {
+            "files": len(inputs),
+            "bytes": total_bytes,
+            "tools": None if args.data else args.tools,
+            "apps": None if args.data else args.apps,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "yaml_loader": yaml_parser_name(),
+            "workers": workers,
+            "stages": records,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
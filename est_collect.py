@@ -0,0 +1,408 @@
+"""EST 장비에서 내보내기 파일을 직접 수집 (asyncio + 표준 라이브러리 HTTP/1.1 클라이언트)
+
+장비 IP 목록에 동시에 요청하고, 응답이 도착하는 순서대로 (파일 이름, 내용, 오류)를 돌려준다.
+- 호스트별 keep-alive 연결 풀 (같은 장비에 다시 요청하면 연결 재사용)
+- 요청마다 제한 시간(연결 + 응답 전체), 실패 시 지수 백오프로 재시도
+- 전체 동시 요청 수 제한
+
+사용 예:
+    python est_collect.py tools.txt -o configs/collected --concurrency 32
+    python est_collect.py tools.txt -o collected --url "https://{host}:8443/est/export.yaml" --insecure
+
+종료 코드: 0 성공, 1 수집한 파일 없음, 3 일부 장비 수집 실패
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import os
+import queue
+import random
+import ssl
+import sys
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+
+# 장비별 내보내기 주소 ({host}는 목록의 IP 또는 IP:포트로 바뀜)
+COLLECT_URL_TEMPLATE = os.environ.get("EST_COLLECT_URL", "http://{host}/api/est/export")
+
+COLLECT_CONCURRENCY = int(os.environ.get("EST_COLLECT_CONCURRENCY", "16"))
+COLLECT_TIMEOUT = float(os.environ.get("EST_COLLECT_TIMEOUT", "10"))
+COLLECT_RETRIES = 2
+COLLECT_BACKOFF = 0.5  # 첫 재시도 대기 시간(초), 재시도마다 두 배
+
+# 응답 하나의 최대 크기 (잘못된 주소가 끝없는 응답을 보내는 경우 차단)
+MAX_RESPONSE_BYTES = 256 * 1024 * 1024
+
+# 이 상태 코드는 잠시 후 다시 시도하면 성공할 수 있음
+RETRY_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+
+USER_AGENT = "est-collector/1.0"
+
+class CollectError(Exception):
+    """장비 하나의 수집 실패 (retryable이면 재시도 대상)"""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+# --- [HTTP/1.1 연결 풀] ---
+class _Connection:
+    __slots__ = ('reader', 'writer', 'reused')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self):
+        self.writer.close()
+
+class HttpPool:
+    """호스트별 keep-alive 연결 풀 (이벤트 루프 하나에서만 사용)"""
+
+    def __init__(self, max_idle_per_host=2, verify_tls=True):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = {}  # (scheme, host, port) -> [_Connection]
+        self._ssl = ssl.create_default_context()
+        if not verify_tls:
+            # 장비는 대부분 자체 서명 인증서를 사용
+            self._ssl.check_hostname = False
+            self._ssl.verify_mode = ssl.CERT_NONE
+
+    async def _connect(self, scheme, host, port):
+        idle = self._idle.get((scheme, host, port))
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof():
+                conn.reused = True
+                return conn
+            conn.close()
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self._ssl if scheme == 'https' else None,
+            limit=1024 * 1024,
+        )
+        return _Connection(reader, writer)
+
+    def _release(self, key, conn, keep_alive):
+        idle = self._idle.setdefault(key, [])
+        if keep_alive and len(idle) < self.max_idle_per_host:
+            idle.append(conn)
+        else:
+            conn.close()
+
+    async def get(self, url):
+        """GET 요청 (반환: 상태 코드, 헤더 dict(소문자 키), 본문 bytes)
+
+        재사용한 연결이 그사이 끊겨 있었으면 새 연결로 한 번 더 보낸다.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        host = parts.hostname
+        port = parts.port or (443 if scheme == 'https' else 80)
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else "")
+        host_header = parts.netloc.rsplit('@', 1)[-1]
+        key = (scheme, host, port)
+
+        request = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            "Accept: application/json, application/x-yaml, text/yaml, */*\r\n"
+            "Accept-Encoding: gzip, deflate\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode('latin-1')
+
+        while True:
+            conn = await self._connect(scheme, host, port)
+            try:
+                conn.writer.write(request)
+                await conn.writer.drain()
+                status, headers, body, keep_alive = await _read_response(conn.reader)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                conn.close()
+                if conn.reused:
+                    continue
+                raise CollectError(f"연결 끊김: {e}") from e
+            except BaseException:
+                # 제한 시간 초과(취소) 등으로 응답을 끝까지 읽지 못한 연결은 재사용하지 않음
+                conn.close()
+                raise
+            self._release(key, conn, keep_alive)
+            return status, headers, _decode_body(headers, body)
+
+    def close(self):
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise asyncio.IncompleteReadError(b"", None)
+    try:
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        status = int(status)
+    except ValueError:
+        raise CollectError(f"HTTP 응답이 아닙니다: {status_line[:60]!r}", retryable=False)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = await _read_chunked(reader)
+    elif 'content-length' in headers:
+        length = int(headers['content-length'])
+        if length > MAX_RESPONSE_BYTES:
+            raise CollectError(f"응답이 너무 큽니다 ({length:,} bytes)", retryable=False)
+        body = await reader.readexactly(length)
+    else:
+        # 길이 정보가 없으면 연결이 닫힐 때까지 읽음
+        chunks = []
+        total = 0
+        while True:
+            chunk = await reader.read(1024 * 1024)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > MAX_RESPONSE_BYTES:
+                raise CollectError("응답이 너무 큽니다", retryable=False)
+            chunks.append(chunk)
+        body = b"".join(chunks)
+        keep_alive = False
+    return status, headers, body, keep_alive
+
+async def _read_chunked(reader):
+    chunks = []
+    total = 0
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b';', 1)[0].strip() or b"0", 16)
+        if size == 0:
+            # 트레일러 헤더 건너뜀
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        total += size
+        if total > MAX_RESPONSE_BYTES:
+            raise CollectError("응답이 너무 큽니다", retryable=False)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)  # 청크 끝의 CRLF
+
+def _decode_body(headers, body):
+    encoding = headers.get('content-encoding', '').lower()
+    try:
+        if encoding == 'gzip':
+            return gzip.decompress(body)
+        if encoding == 'deflate':
+            return zlib.decompress(body)
+    except (OSError, EOFError, zlib.error) as e:
+        raise CollectError(f"압축된 응답을 풀 수 없습니다: {e}", retryable=False) from e
+    return body
+
+# --- [장비별 수집] ---
+def parse_targets(text):
+    """장비 목록 텍스트를 대상 목록으로 (한 줄에 하나 또는 쉼표/공백 구분, # 뒤는 주석, 중복 제외)"""
+    targets = []
+    seen = set()
+    for line in text.splitlines():
+        for target in line.split('#', 1)[0].replace(',', ' ').split():
+            if target not in seen:
+                seen.add(target)
+                targets.append(target)
+    return targets
+
+def target_url(target, url_template=COLLECT_URL_TEMPLATE):
+    """대상(IP, IP:포트 또는 전체 URL)의 요청 주소"""
+    if '://' in target:
+        return target
+    return url_template.format(host=target)
+
+def export_file_name(target, headers, url):
+    """수집한 내용의 파일 이름 (형식 감지용 확장자 포함, 예: 10.0.0.1.json)
+
+    전체 URL 대상은 같은 호스트(게이트웨이 포트 하나 뒤의 여러 장비 등)에 여러 주소가 있을 수 있으므로
+    호스트 뒤에 URL 해시를 붙인다 (예: 10.0.0.1_8080_3f2a9c1d.json).
+    """
+    if '://' in target:
+        host = urlsplit(url).netloc.rsplit('@', 1)[-1]
+        host = f"{host}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}"
+    else:
+        host = target
+    content_type = headers.get('content-type', '').lower()
+    path = urlsplit(url).path.lower()
+    if 'yaml' in content_type or path.endswith(('.yaml', '.yml')):
+        ext = 'yaml'
+    else:
+        ext = 'json'
+    return f"{host.replace(':', '_')}.{ext}"
+
+async def fetch_export(pool, target, url_template=COLLECT_URL_TEMPLATE, timeout=COLLECT_TIMEOUT):
+    """장비 하나의 내보내기 파일 요청 한 번 (반환: 파일 이름, 내용 bytes)
+
+    연결부터 응답 본문까지 timeout초 안에 끝나야 한다. 실패하면 CollectError
+    (연결 실패/시간 초과/일시적 오류 상태 코드는 retryable).
+    """
+    url = target_url(target, url_template)
+    try:
+        status, headers, body = await asyncio.wait_for(pool.get(url), timeout)
+    except asyncio.TimeoutError:
+        raise CollectError(f"응답 시간 초과 ({timeout:g}s)") from None
+    except OSError as e:
+        # 연결 거부, 호스트 없음, TLS 오류 등
+        raise CollectError(str(e) or type(e).__name__) from e
+    except ValueError as e:
+        # 잘못된 주소나 응답 헤더
+        raise CollectError(str(e) or type(e).__name__, retryable=False) from e
+
+    if status != 200:
+        raise CollectError(f"HTTP {status}", retryable=status in RETRY_STATUSES)
+    return export_file_name(target, headers, url), body
+
+def backoff_delay(attempt, backoff=COLLECT_BACKOFF):
+    """attempt번째 재시도 전 대기 시간 (backoff × 2^attempt초, ±50% 지터로 재시도가 몰리지 않게)"""
+    return backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+async def collect(targets, url_template=COLLECT_URL_TEMPLATE, concurrency=COLLECT_CONCURRENCY,
+                  timeout=COLLECT_TIMEOUT, retries=COLLECT_RETRIES, backoff=COLLECT_BACKOFF, verify_tls=True):
+    """장비 목록을 동시에 수집하여 끝나는 순서대로 (대상, 파일 이름, 내용, 오류) 반환 (async 생성기)
+
+    오류는 ("error", 메시지) 형태이며 그때 파일 이름과 내용은 None.
+    동시에 진행하는 요청은 concurrency개 이하이며, 재시도 대기 중에는 자리를 비워 다른 장비가 쓴다.
+    """
+    pool = HttpPool(verify_tls=verify_tls)
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(target):
+        attempt = 0
+        while True:
+            try:
+                async with slots:
+                    name, content = await fetch_export(pool, target, url_template, timeout)
+                return target, name, content, None
+            except CollectError as e:
+                if not e.retryable or attempt >= retries:
+                    suffix = f" ({attempt + 1}회 시도)" if attempt else ""
+                    return target, None, None, ("error", f"{e}{suffix}")
+            await asyncio.sleep(backoff_delay(attempt, backoff))
+            attempt += 1
+
+    tasks = [asyncio.ensure_future(run(target)) for target in targets]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        pool.close()
+
+def iter_collected(targets, **options):
+    """collect()를 백그라운드 스레드의 이벤트 루프에서 실행하며 결과를 (파일 이름, 내용, 오류)로 하나씩 반환
+
+    호출한 쪽이 앞선 결과를 처리(파싱)하는 동안에도 나머지 장비 수집은 계속 진행된다.
+    오류가 난 장비의 파일 이름은 대상 문자열. 생성기를 중간에 닫으면 남은 요청은 취소된다.
+    """
+    results = queue.Queue()
+    done = object()
+    loop = asyncio.new_event_loop()
+    main_task = None
+
+    async def pump():
+        async for target, name, content, error in collect(targets, **options):
+            results.put((name or target, content, error))
+
+    def run():
+        nonlocal main_task
+        try:
+            main_task = loop.create_task(pump())
+            loop.run_until_complete(main_task)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:  # 수집기 자체 오류도 결과로 전달
+            results.put(("collector", None, ("error", str(e))))
+        finally:
+            loop.close()
+            results.put(done)
+
+    thread = threading.Thread(target=run, name="est-collect", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        if thread.is_alive():
+            try:
+                loop.call_soon_threadsafe(lambda: main_task and main_task.cancel())
+            except RuntimeError:  # 그사이 수집이 끝나 루프가 닫힌 경우
+                pass
+        thread.join()
+
+# --- [CLI] ---
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="EST 장비에서 내보내기 파일을 동시에 수집하여 폴더에 저장")
+    parser.add_argument("targets", help="장비 목록 파일 (한 줄에 IP, IP:포트 또는 URL 하나, '-'이면 표준 입력)")
+    parser.add_argument("-o", "--output", required=True, help="저장할 폴더 (예: configs/collected)")
+    parser.add_argument("--url", default=COLLECT_URL_TEMPLATE, help=f"요청 주소 형식 (기본: {COLLECT_URL_TEMPLATE})")
+    parser.add_argument("-c", "--concurrency", type=int, default=COLLECT_CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--timeout", type=float, default=COLLECT_TIMEOUT, help="요청당 제한 시간(초)")
+    parser.add_argument("--retries", type=int, default=COLLECT_RETRIES, help="실패 시 재시도 횟수")
+    parser.add_argument("--insecure", action="store_true", help="HTTPS 인증서 검증 생략 (자체 서명 인증서)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황 출력 생략")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if args.targets == '-':
+        targets = parse_targets(sys.stdin.read())
+    else:
+        with open(args.targets, 'r', encoding='utf-8') as f:
+            targets = parse_targets(f.read())
+    if not targets:
+        print("수집할 장비가 없습니다.", file=sys.stderr)
+        return 1
+
+    os.makedirs(args.output, exist_ok=True)
+    started = time.perf_counter()
+    saved = failed = total_bytes = 0
+    for name, content, error in iter_collected(
+        targets, url_template=args.url, concurrency=args.concurrency, timeout=args.timeout,
+        retries=args.retries, verify_tls=not args.insecure,
+    ):
+        if error is not None:
+            failed += 1
+            print(f"  • {name}: {error[1]}", file=sys.stderr)
+            continue
+        # 다 받은 뒤 이름을 바꿔 configs 폴더 적재가 쓰다 만 파일을 읽지 않도록 함
+        path = os.path.join(args.output, name)
+        with open(path + '.part', 'wb') as f:
+            f.write(content)
+        os.replace(path + '.part', path)
+        saved += 1
+        total_bytes += len(content)
+        if not args.quiet:
+            print(f"  저장: {path} ({len(content):,} bytes)", file=sys.stderr)
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(
+        f"장비 {saved}/{len(targets)}대 수집 ({elapsed:.2f}s, "
+        f"{len(targets) / elapsed:.1f} tools/s, {total_bytes / elapsed / 1e6:.1f} MB/s)"
+    )
+    if not saved:
+        return 1
+    return 0 if not failed else 3
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""장비군 버전 드리프트 분석 (버전 정렬 키 + 그룹별 최신/최다 버전, 뒤처진 IP)"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# 버전 문자열에서 숫자 조각과 문자 조각을 분리
+_VERSION_TOKEN = re.compile(r'\d+|[^\W\d_]+')
+
+# applicationName/name이 없는 장비 행은 장비명을 그룹 이름으로 사용
+DRIFT_FALLBACK_COLUMN = "장비명"
+
+# 기준 버전 선택지: 그룹 내 최신 버전 / 가장 많이 쓰이는 버전
+DRIFT_BASELINES = {
+    "newest": "최신 버전",
+    "mode": "최다 버전",
+}
+
+def version_key(version):
+    """버전 문자열을 비교 가능한 튜플로 변환 (숫자 조각은 숫자로, 문자 조각은 대소문자 무시)
+
+    예: 2025.12.11.3 > 2025.12.5.2, D37486834_V5 > D37486834_V3
+    """
+    key = []
+    for token in _VERSION_TOKEN.findall(str(version)):
+        if token.isdigit():
+            key.append((1, int(token), ""))
+        else:
+            key.append((0, 0, token.lower()))
+    return tuple(key)
+
+def column_codes(series):
+    """컬럼을 (정수 코드 배열, 문자열 고유값 배열)로 변환 (category면 기존 코드 사용, 빈 값은 "-")"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        uniques = np.asarray(series.cat.categories, dtype=object)
+    else:
+        codes, uniques = pd.factorize(series)
+        codes = codes.astype(np.int64)
+        uniques = np.asarray(uniques, dtype=object)
+    # 숫자로 읽힌 값(예: YAML의 255558785)도 표시/비교는 문자열로
+    # 문자열로 바꾼 뒤 같아지는 값(255558785와 "255558785")은 코드 하나로 합침
+    merged, uniques = pd.factorize(np.array([str(v) for v in uniques], dtype=object))
+    uniques = np.asarray(uniques, dtype=object)
+    missing = codes < 0
+    codes = merged.astype(np.int64)[np.where(missing, 0, codes)] if len(merged) else codes
+    if missing.any():
+        dash = np.flatnonzero(uniques == "-")
+        if len(dash):
+            codes[missing] = dash[0]
+        else:
+            codes[missing] = len(uniques)
+            uniques = np.append(uniques, "-")
+    return codes, uniques
+
+def version_ranks(uniques):
+    """고유 버전 목록의 정렬 순위 (없는 값 "-"는 -1)
+
+    파이썬 비교는 고유값 수만큼만 하고, 행 단위 비교는 정수 순위로 한다.
+    """
+    order = sorted(
+        (i for i, v in enumerate(uniques) if v != "-"),
+        key=lambda i: (version_key(uniques[i]), str(uniques[i])),
+    )
+    ranks = np.full(len(uniques), -1, dtype=np.int32)
+    ranks[order] = np.arange(len(order), dtype=np.int32)
+    return ranks
+
+def version_sort_keys(series):
+    """버전 컬럼 전체를 정수 정렬 키로 변환 (없는 값은 -1)"""
+    codes, uniques = column_codes(series)
+    return version_ranks(uniques)[codes]
+
+def _group_codes(df):
+    """(applicationName, name) 그룹 코드와 그룹 이름 배열"""
+    n = len(df)
+    dash = np.array(["-"], dtype=object)
+
+    if "applicationName" in df.columns:
+        app_codes, app_uniques = column_codes(df["applicationName"])
+    else:
+        app_codes, app_uniques = np.zeros(n, dtype=np.int64), dash
+    if DRIFT_FALLBACK_COLUMN in df.columns:
+        fb_codes, fb_uniques = column_codes(df[DRIFT_FALLBACK_COLUMN])
+    else:
+        fb_codes, fb_uniques = np.zeros(n, dtype=np.int64), dash
+
+    # applicationName이 비어 있으면 장비명 코드로 대체 (두 고유값 목록을 이어 붙인 코드 공간)
+    app_missing = app_uniques[app_codes] == "-"
+    app_part = np.where(app_missing, len(app_uniques) + fb_codes, app_codes)
+    app_labels = np.concatenate([app_uniques, fb_uniques])
+
+    if "name" in df.columns:
+        name_codes, name_uniques = column_codes(df["name"])
+    else:
+        name_codes, name_uniques = np.zeros(n, dtype=np.int64), dash
+
+    return app_part, app_labels, name_codes, name_uniques
+
+def _unique(values):
+    """정렬 기반 고유값 (정수 배열은 해시 방식보다 빠름)"""
+    values = np.sort(values)
+    if len(values) == 0:
+        return values
+    return values[np.append(True, values[1:] != values[:-1])]
+
+def _take_labels(labels, codes):
+    """고유값 배열 + 코드로 category 컬럼 생성 (행마다 문자열을 만들지 않음)"""
+    return pd.Categorical(labels).take(codes)
+
+def _last_per_group(groups, *sort_keys):
+    """groups 기준으로 묶었을 때 sort_keys 순서상 마지막 원소의 위치"""
+    order = np.lexsort(sort_keys[::-1] + (groups,)) if sort_keys else np.argsort(groups, kind='stable')
+    sorted_groups = groups[order]
+    last = np.flatnonzero(np.append(sorted_groups[1:] != sorted_groups[:-1], True))
+    return order[last]
+
+def analyze_version_drift(df, baseline="newest"):
+    """applicationName/name별 최신 버전, 최다 버전, 기준 버전보다 뒤처진 IP 분석
+
+    반환: {'summary': 그룹별 요약, 'lagging': 뒤처진 (IP, 그룹, 버전) 목록, 'baseline': 기준}
+    버전이 "-"인 행은 제외한다. 모든 행 단위 계산은 정수 코드 배열로 한다.
+    """
+    if df is None or df.empty or "Version" not in df.columns:
+        return None
+    if baseline not in DRIFT_BASELINES:
+        raise ValueError(f"지원하지 않는 기준: {baseline}")
+
+    version_codes, version_uniques = column_codes(df["Version"])
+    ranks_of = version_ranks(version_uniques)
+    ranks = ranks_of[version_codes]
+    valid = ranks >= 0
+
+    app_part, app_labels, name_codes, name_labels = _group_codes(df)
+    if "IP" in df.columns:
+        ip_codes, ip_labels = column_codes(df["IP"])
+    else:
+        ip_codes, ip_labels = np.zeros(len(df), dtype=np.int64), np.array(["-"], dtype=object)
+
+    # 버전이 있는 행만 남기고 그룹 번호를 0..G-1로 압축
+    pair = app_part[valid] * (len(name_labels) + 1) + name_codes[valid]
+    group_keys, groups = np.unique(pair, return_inverse=True)
+    r = ranks[valid].astype(np.int64)
+    ip = ip_codes[valid]
+    n_groups = len(group_keys)
+
+    empty = {
+        'summary': pd.DataFrame(columns=["applicationName", "name", "최신 버전", "최다 버전",
+                                         "버전 종류", "IP 수", "뒤처진 IP 수"]),
+        'lagging': pd.DataFrame(columns=["IP", "applicationName", "name", "Version", "기준 버전"]),
+        'baseline': baseline,
+    }
+    if n_groups == 0:
+        return empty
+
+    # 버전 순위 → 버전 문자열
+    sorted_versions = np.empty(int(ranks_of.max()) + 1, dtype=object)
+    has_rank = ranks_of >= 0
+    sorted_versions[ranks_of[has_rank]] = version_uniques[has_rank]
+
+    n_ranks = len(sorted_versions)
+    n_ips = len(ip_labels) + 1
+
+    # 그룹별 최신 버전
+    newest = np.full(n_groups, -1, dtype=np.int64)
+    np.maximum.at(newest, groups, r)
+
+    # 그룹별 최다 버전 (동률이면 더 최신 버전)
+    version_pairs, pair_counts = np.unique(groups * n_ranks + r, return_counts=True)
+    pair_groups = version_pairs // n_ranks
+    pair_ranks = version_pairs % n_ranks
+    mode_idx = _last_per_group(pair_groups, pair_counts, pair_ranks)
+    mode = np.empty(n_groups, dtype=np.int64)
+    mode[pair_groups[mode_idx]] = pair_ranks[mode_idx]
+    kinds = np.bincount(pair_groups, minlength=n_groups)
+
+    # 그룹별 IP 수
+    ip_pairs = _unique(groups * n_ips + ip)
+    ip_count = np.bincount(ip_pairs // n_ips, minlength=n_groups)
+
+    # 기준 버전보다 낮은 버전을 쓰는 (그룹, IP, 버전) 조합
+    base = newest if baseline == "newest" else mode
+    lag = r < base[groups]
+    lag_triples = _unique((groups[lag] * n_ips + ip[lag]) * n_ranks + r[lag])
+    lag_groups = lag_triples // n_ranks // n_ips
+    lag_ips = lag_triples // n_ranks % n_ips
+    lag_ranks = lag_triples % n_ranks
+    lag_ip_count = np.bincount(_unique(lag_triples // n_ranks) // n_ips, minlength=n_groups)
+
+    group_apps = app_labels[group_keys // (len(name_labels) + 1)]
+    group_names = name_labels[group_keys % (len(name_labels) + 1)]
+
+    summary = pd.DataFrame({
+        "applicationName": group_apps,
+        "name": group_names,
+        "최신 버전": sorted_versions[newest],
+        "최다 버전": sorted_versions[mode],
+        "버전 종류": kinds,
+        "IP 수": ip_count,
+        "뒤처진 IP 수": lag_ip_count,
+    })
+    summary = summary.sort_values(
+        ["뒤처진 IP 수", "applicationName", "name"], ascending=[False, True, True], kind='stable'
+    ).reset_index(drop=True)
+
+    # 뒤처진 목록은 행이 많을 수 있으므로 정수 코드로 정렬한 뒤 category 컬럼으로 생성
+    group_order = np.empty(n_groups, dtype=np.int64)
+    group_order[np.lexsort((group_names.astype(str), group_apps.astype(str)))] = np.arange(n_groups)
+    order = np.lexsort((lag_ips, group_order[lag_groups]))
+    lag_groups, lag_ips, lag_ranks = lag_groups[order], lag_ips[order], lag_ranks[order]
+    
+    lagging = pd.DataFrame({
+        "IP": _take_labels(ip_labels, lag_ips),
+        "applicationName": _take_labels(group_apps, lag_groups),
+        "name": _take_labels(group_names, lag_groups),
+        "Version": _take_labels(sorted_versions, lag_ranks),
+        "기준 버전": _take_labels(sorted_versions, base[lag_groups]),
+    })
+    
+    return {'summary': summary, 'lagging': lagging, 'baseline': baseline}
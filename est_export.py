@@ -0,0 +1,75 @@
+"""리포트 내보내기 (청크 단위 CSV, write-only 모드 다중 시트 엑셀)"""
+from io import BytesIO
+
+from est_drift import analyze_version_drift
+from est_stats import ip_summary
+
+# 한 번에 텍스트/셀로 변환하는 행 수
+CSV_CHUNK_ROWS = 50_000
+EXCEL_CHUNK_ROWS = 10_000
+
+# 엑셀 시트 하나에 들어가는 최대 행 수 (헤더 제외)
+EXCEL_MAX_ROWS = 1_048_575
+
+def write_csv_report(df, output, chunk_rows=CSV_CHUNK_ROWS):
+    """데이터프레임을 청크 단위로 CSV 변환하여 output(바이너리)에 기록 (엑셀 호환 BOM 포함)"""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        text = chunk.to_csv(index=False, header=(start == 0))
+        output.write(text.encode('utf-8-sig' if start == 0 else 'utf-8'))
+    return output
+
+def csv_report_bytes(df, chunk_rows=CSV_CHUNK_ROWS):
+    return write_csv_report(df, BytesIO(), chunk_rows).getvalue()
+
+def _cell_values(series):
+    """셀에 쓸 파이썬 값 목록 (NaN은 빈 셀)"""
+    return [None if v is None or v != v else v for v in series.tolist()]
+
+def _append_frame(workbook, title, df, chunk_rows=EXCEL_CHUNK_ROWS):
+    """write-only 시트에 행 단위로 기록 (행 수가 한도를 넘으면 시트를 나눔)"""
+    header = [str(col) for col in df.columns]
+    sheet_no = 0
+    start = 0
+
+    while True:
+        sheet_no += 1
+        ws = workbook.create_sheet(title if sheet_no == 1 else f"{title} ({sheet_no})")
+        ws.append(header)
+        end = min(start + EXCEL_MAX_ROWS, len(df))
+
+        for chunk_start in range(start, end, chunk_rows):
+            chunk = df.iloc[chunk_start:min(chunk_start + chunk_rows, end)]
+            columns = [_cell_values(chunk[col]) for col in chunk.columns]
+            for row in zip(*columns):
+                ws.append(row)
+
+        start = end
+        if start >= len(df):
+            break
+
+def generate_excel_report(df, baseline="newest", output=None):
+    """엑셀 리포트 생성 (원본 데이터 / IP별 요약 / 버전 드리프트 요약 시트)
+
+    write-only 모드로 행을 바로 기록하므로 셀 객체를 메모리에 쌓지 않는다.
+    """
+    # openpyxl은 불러오는 데 시간이 오래 걸려 엑셀을 처음 만들 때 불러옴 (앱 시작 시간 단축)
+    from openpyxl import Workbook
+
+    if output is None:
+        output = BytesIO()
+
+    workbook = Workbook(write_only=True)
+    _append_frame(workbook, 'Equipment Data', df)
+
+    summary = ip_summary(df)
+    if summary is not None:
+        _append_frame(workbook, 'IP Summary', summary)
+
+    drift = analyze_version_drift(df, baseline)
+    if drift is not None:
+        _append_frame(workbook, 'Version Drift', drift['summary'])
+
+    workbook.save(output)
+    output.seek(0)
+    return output
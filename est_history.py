@@ -0,0 +1,362 @@
+"""통합 데이터 스냅샷 이력 (SQLite, 직전 스냅샷 대비 변경분만 저장)
+
+행 키(IP + applicationName + name, est_patches.RowKeys와 같은 규칙)마다 컬럼 값이 바뀐 셀만
+changes 테이블에 기록하므로 매일 쌓아도 크기는 바뀐 값 수에 비례한다.
+조회는 (키, 컬럼, 스냅샷) 색인으로 필요한 변경 기록만 찾으며 스냅샷 전체를 다시 만들지 않는다.
+시각은 모두 UTC ISO 문자열(예: 2026-01-01T07:00:00+00:00)로 맞춰 저장하고 비교한다.
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from est_drift import column_codes
+from est_patches import RowKeys
+
+# 값 변경을 추적하지 않는 컬럼 (파일 이름은 수집할 때마다 바뀜)
+UNTRACKED_COLUMNS = ("Source_File",)
+
+# 행이 생기거나 사라진 것을 기록하는 가상 컬럼 (값: 1 = 있음, NULL = 사라짐)
+PRESENCE_COLUMN = "(행)"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    source TEXT,
+    dataset_key TEXT,
+    rows INTEGER NOT NULL,
+    changes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_taken_at ON snapshots (taken_at);
+CREATE TABLE IF NOT EXISTS row_keys (
+    id INTEGER PRIMARY KEY,
+    ip TEXT NOT NULL,
+    application TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (ip, application, name)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    key_id INTEGER NOT NULL,
+    column_name TEXT NOT NULL,
+    snapshot_id INTEGER NOT NULL,
+    value TEXT,
+    PRIMARY KEY (key_id, column_name, snapshot_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS changes_snapshot ON changes (snapshot_id);
+CREATE TABLE IF NOT EXISTS current_rows (
+    key_id INTEGER PRIMARY KEY,
+    row_hash INTEGER NOT NULL,
+    row_values TEXT NOT NULL
+);
+"""
+
+def normalize_timestamp(value):
+    """시각(ISO 문자열, datetime 등)을 UTC ISO 문자열로 (읽을 수 없으면 ValueError)
+
+    시간대가 없는 시각은 이 컴퓨터의 현지 시각으로 본다.
+    """
+    try:
+        ts = pd.Timestamp(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"시각을 읽을 수 없습니다: {value!r}") from e
+    if pd.isna(ts):
+        raise ValueError(f"시각을 읽을 수 없습니다: {value!r}")
+    if ts.tzinfo is None:
+        ts = pd.Timestamp(ts.to_pydatetime().astimezone())
+    return ts.tz_convert("UTC").isoformat(timespec='seconds')
+
+def _snapshot_rows(df):
+    """스냅샷으로 기록할 (행 키 목록, 컬럼별 (코드, 문자열 고유값), 행 해시)
+
+    같은 키의 행이 여럿이면 처음 나온 행을 사용한다. 빈 값("-")은 없는 값으로 본다.
+    행 해시는 (컬럼, 값) 쌍 해시의 합이므로 컬럼 순서나 값이 없는 컬럼 추가에 영향받지 않는다.
+    """
+    row_keys = RowKeys(df)
+    _, first = np.unique(row_keys.combined, return_index=True)
+    first.sort()
+    keys = [row_keys.key(p) for p in first.tolist()]
+
+    columns = {}
+    row_hash = np.zeros(len(first), dtype=np.uint64)
+    for col in df.columns:
+        if col in UNTRACKED_COLUMNS or col in row_keys.columns:
+            continue
+        codes, uniques = column_codes(df[col])
+        codes = codes[first]
+        pair_hash = pd.util.hash_array(np.array([f"{col}\x1f{u}" for u in uniques], dtype=object))
+        pair_hash[uniques == "-"] = 0
+        row_hash += pair_hash[codes]
+        columns[col] = (codes, uniques)
+    return keys, columns, row_hash.view(np.int64)
+
+def _row_values(columns, i):
+    """i번째 행의 {컬럼: 값} (빈 값 제외)"""
+    values = {}
+    for col, (codes, uniques) in columns.items():
+        value = uniques[codes[i]]
+        if value != "-":
+            values[col] = value
+    return values
+
+class SnapshotHistory:
+    """통합 데이터 스냅샷 이력 저장소
+
+    스냅샷은 기록 순서대로 하나의 사슬을 이루며(taken_at은 앞선 스냅샷보다 이르면 안 됨),
+    current_rows에 마지막 스냅샷의 행 해시/값을 두어 새 스냅샷은 해시가 다른 행만 비교한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        con = sqlite3.connect(self.path)
+        con.execute("PRAGMA journal_mode=WAL")  # 여러 세션이 동시에 읽을 수 있도록
+        con.executescript(SCHEMA)
+        return con
+
+    def record(self, df, taken_at=None, source="", dataset_key=None):
+        """데이터프레임을 새 스냅샷으로 기록 (반환: {snapshot_id, added, removed, changed, skipped})
+
+        dataset_key가 마지막 스냅샷과 같으면 기록하지 않는다 (같은 데이터를 다시 연 경우).
+        taken_at이 없으면 데이터가 유효한 시각인 파일의 내보낸 시각(df.attrs["generated_at"]),
+        그것도 없으면 기록 시각을 사용한다. 읽을 수 없는 시각이면 ValueError.
+        """
+        recorded_at = normalize_timestamp(datetime.now(timezone.utc))
+        taken_at = normalize_timestamp(taken_at or df.attrs.get("generated_at") or recorded_at)
+        con = self._connect()
+        try:
+            with con:
+                # 마지막 스냅샷 확인부터 기록까지 다른 세션이 끼어들지 않도록
+                con.execute("BEGIN IMMEDIATE")
+                last = con.execute(
+                    "SELECT id, taken_at, dataset_key FROM snapshots ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+                if last is not None:
+                    if dataset_key is not None and last[2] == dataset_key:
+                        return {"snapshot_id": last[0], "added": 0, "removed": 0, "changed": 0, "skipped": True}
+                    if taken_at < normalize_timestamp(last[1]):
+                        raise ValueError(f"마지막 스냅샷({last[1]})보다 이른 시각으로 기록할 수 없습니다: {taken_at}")
+
+                keys, columns, row_hash = _snapshot_rows(df)
+                snapshot_id = con.execute(
+                    "INSERT INTO snapshots (taken_at, recorded_at, source, dataset_key, rows, changes) "
+                    "VALUES (?, ?, ?, ?, ?, 0)",
+                    (taken_at, recorded_at, source, dataset_key, len(df)),
+                ).lastrowid
+
+                key_ids = self._key_ids(con, keys)
+                current = dict(con.execute("SELECT key_id, row_hash FROM current_rows"))
+
+                # 해시가 같은 행은 그대로이므로 새 행/해시가 바뀐 행/사라진 행만 셀 단위로 비교
+                changes = []
+                updates = []
+                added = changed_rows = 0
+                old_values = self._old_values(con, [
+                    key_id for key_id, h in zip(key_ids, row_hash.tolist()) if current.get(key_id, h) != h
+                ])
+                for i, (key_id, h) in enumerate(zip(key_ids, row_hash.tolist())):
+                    previous = current.pop(key_id, None)
+                    if previous == h:
+                        continue
+                    values = _row_values(columns, i)
+                    if previous is None:
+                        added += 1
+                        changes.append((key_id, PRESENCE_COLUMN, snapshot_id, "1"))
+                        old = {}
+                    else:
+                        changed_rows += 1
+                        old = old_values.get(key_id, {})
+                    for col in values.keys() | old.keys():
+                        if values.get(col) != old.get(col):
+                            changes.append((key_id, col, snapshot_id, values.get(col)))
+                    updates.append((key_id, h, json.dumps(values, ensure_ascii=False)))
+
+                # 이번 스냅샷에 없는 행은 사라진 것으로 기록 (값은 current_rows에서 지움)
+                removed = list(current)
+                changes.extend((key_id, PRESENCE_COLUMN, snapshot_id, None) for key_id in removed)
+                for chunk in _chunks(removed):
+                    con.execute(
+                        f"DELETE FROM current_rows WHERE key_id IN ({','.join('?' * len(chunk))})", chunk
+                    )
+
+                con.executemany("INSERT INTO changes VALUES (?, ?, ?, ?)", changes)
+                con.executemany("INSERT OR REPLACE INTO current_rows VALUES (?, ?, ?)", updates)
+                con.execute("UPDATE snapshots SET changes = ? WHERE id = ?", (len(changes), snapshot_id))
+        finally:
+            con.close()
+        return {
+            "snapshot_id": snapshot_id, "added": added, "removed": len(removed),
+            "changed": changed_rows, "skipped": False,
+        }
+
+    def _key_ids(self, con, keys):
+        """행 키 목록의 id (처음 보는 키는 새로 등록)"""
+        known = {(ip, app, name): key_id for key_id, ip, app, name in con.execute("SELECT * FROM row_keys")}
+        new_keys = [key for key in keys if key not in known]
+        if new_keys:
+            start = con.execute("SELECT COALESCE(MAX(id), 0) FROM row_keys").fetchone()[0] + 1
+            con.executemany(
+                "INSERT INTO row_keys VALUES (?, ?, ?, ?)",
+                ((start + i, *key) for i, key in enumerate(new_keys)),
+            )
+            known.update((key, start + i) for i, key in enumerate(new_keys))
+        return [known[key] for key in keys]
+
+    def _old_values(self, con, key_ids):
+        values = {}
+        for chunk in _chunks(key_ids):
+            for key_id, row_values in con.execute(
+                f"SELECT key_id, row_values FROM current_rows WHERE key_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                values[key_id] = json.loads(row_values)
+        return values
+
+    def snapshots(self):
+        """기록된 스냅샷 목록 (오래된 순)"""
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=["id", "taken_at", "recorded_at", "source", "rows", "changes"])
+        con = self._connect()
+        try:
+            return pd.read_sql_query(
+                "SELECT id, taken_at, recorded_at, source, rows, changes FROM snapshots ORDER BY id", con
+            )
+        finally:
+            con.close()
+
+    def _snapshot_at(self, con, when):
+        """when(시각 또는 스냅샷 id) 시점의 스냅샷 id (그 전 스냅샷이 없으면 0)"""
+        if isinstance(when, (int, np.integer)):
+            return int(when)
+        row = con.execute(
+            "SELECT MAX(id) FROM snapshots WHERE taken_at <= ?", (normalize_timestamp(when),)
+        ).fetchone()
+        return row[0] or 0
+
+    def changes_between(self, start, end):
+        """start 시점과 end 시점 사이에 값이 바뀐 셀 (시점은 ISO 날짜/시각 문자열 또는 스냅샷 id)
+
+        두 시점 사이에 바뀌었다가 원래 값으로 돌아온 셀은 제외한다.
+        반환 컬럼: IP, applicationName, name, 컬럼, 이전 값, 새 값, 변경 시각
+        """
+        con = self._connect()
+        try:
+            a = self._snapshot_at(con, start)
+            b = self._snapshot_at(con, end)
+            rows = con.execute(
+                """
+                WITH touched AS (
+                    SELECT DISTINCT key_id, column_name FROM changes WHERE snapshot_id > ?1 AND snapshot_id <= ?2
+                )
+                SELECT k.ip, k.application, k.name, t.column_name,
+                    (SELECT value FROM changes c WHERE c.key_id = t.key_id AND c.column_name = t.column_name
+                        AND c.snapshot_id <= ?1 ORDER BY c.snapshot_id DESC LIMIT 1),
+                    (SELECT value FROM changes c WHERE c.key_id = t.key_id AND c.column_name = t.column_name
+                        AND c.snapshot_id <= ?2 ORDER BY c.snapshot_id DESC LIMIT 1),
+                    (SELECT s.taken_at FROM changes c JOIN snapshots s ON s.id = c.snapshot_id
+                        WHERE c.key_id = t.key_id AND c.column_name = t.column_name
+                        AND c.snapshot_id <= ?2 ORDER BY c.snapshot_id DESC LIMIT 1)
+                FROM touched t JOIN row_keys k ON k.id = t.key_id
+                ORDER BY k.ip, k.application, k.name, t.column_name
+                """,
+                (a, b),
+            ).fetchall()
+        finally:
+            con.close()
+
+        rows = [row for row in rows if row[4] != row[5]]
+        return pd.DataFrame(
+            [(*row[:4], _display(row[4]), _display(row[5]), row[6]) for row in rows],
+            columns=["IP", "applicationName", "name", "컬럼", "이전 값", "새 값", "변경 시각"],
+        )
+
+    def history(self, ip, application=None, name=None, column=None):
+        """IP(와 applicationName/name/컬럼)의 값 변경 이력 (시각 순)
+
+        반환 컬럼: 변경 시각, IP, applicationName, name, 컬럼, 값
+        """
+        conditions = ["k.ip = ?"]
+        params = [str(ip)]
+        for field, value in (("k.application", application), ("k.name", name), ("c.column_name", column)):
+            if value is not None:
+                conditions.append(f"{field} = ?")
+                params.append(str(value))
+
+        con = self._connect()
+        try:
+            rows = con.execute(
+                f"""
+                SELECT s.taken_at, k.ip, k.application, k.name, c.column_name, c.value
+                FROM row_keys k
+                JOIN changes c ON c.key_id = k.id
+                JOIN snapshots s ON s.id = c.snapshot_id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY c.snapshot_id, k.application, k.name, c.column_name
+                """,
+                params,
+            ).fetchall()
+        finally:
+            con.close()
+        return pd.DataFrame(
+            [(*row[:5], _display(row[5])) for row in rows],
+            columns=["변경 시각", "IP", "applicationName", "name", "컬럼", "값"],
+        )
+
+    def state_at(self, when, ip=None):
+        """when 시점의 데이터 (행 키 + 추적 컬럼, ip를 주면 그 IP만)
+
+        (키, 컬럼)마다 when 이전 마지막 변경 기록만 읽으며 스냅샷을 처음부터 재생하지 않는다.
+        """
+        con = self._connect()
+        try:
+            s = self._snapshot_at(con, when)
+            key_filter = "AND key_id IN (SELECT id FROM row_keys WHERE ip = ?)" if ip is not None else ""
+            params = [s] + ([str(ip)] if ip is not None else [])
+            # SQLite는 MAX()와 함께 고른 나머지 컬럼을 최댓값 행에서 가져옴
+            rows = con.execute(
+                f"""
+                SELECT key_id, column_name, value, MAX(snapshot_id) FROM changes
+                WHERE snapshot_id <= ? {key_filter}
+                GROUP BY key_id, column_name
+                """,
+                params,
+            ).fetchall()
+            keys = dict(
+                (key_id, (ip_, app, name))
+                for key_id, ip_, app, name in con.execute("SELECT * FROM row_keys")
+            ) if rows else {}
+        finally:
+            con.close()
+
+        present = {key_id for key_id, col, value, _ in rows if col == PRESENCE_COLUMN and value is not None}
+        records = {}
+        for key_id, col, value, _ in rows:
+            if key_id in present and col != PRESENCE_COLUMN:
+                records.setdefault(key_id, {})[col] = _display(value)
+        frame = pd.DataFrame(
+            [dict(zip(("IP", "applicationName", "name"), keys[key_id]), **values) for key_id, values in records.items()]
+            + [dict(zip(("IP", "applicationName", "name"), keys[key_id])) for key_id in present - records.keys()]
+        )
+        return frame.fillna("-")
+
+    def clear(self):
+        con = self._connect()
+        try:
+            with con:
+                for table in ("snapshots", "row_keys", "changes", "current_rows"):
+                    con.execute(f"DELETE FROM {table}")
+        finally:
+            con.close()
+
+def _display(value):
+    return "-" if value is None else value
+
+def _chunks(items, size=500):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
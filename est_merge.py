@@ -0,0 +1,291 @@
+"""파일별 행 블록을 하나의 통합 데이터프레임으로 병합 (Streamlit 없이 사용 가능)"""
+import hashlib
+import posixpath
+
+import numpy as np
+import pandas as pd
+
+from est_parser import COLUMN_MAPPER, ColumnBlock
+
+# --- [통합 데이터프레임 생성] ---
+# 값 종류가 적고 반복이 많은 컬럼은 category 타입으로 저장
+CATEGORY_COLUMNS = (
+    "IP", "장비명", "Source_File", "applicationName", "name", "보고명",
+    "Pump Type", "ToolType", "SliceType", "FeedEngine", "LineTag",
+)
+
+def _fill_missing(values):
+    """None/NaN을 "-"로 바꿈 (기존 fillna("-")와 동일)"""
+    return ["-" if v is None or v != v else v for v in values]
+
+def make_dataset_key(parts):
+    """통합 데이터를 이루는 파일 키 목록으로 데이터셋 식별자 생성"""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+# --- [IP 기준 통합] ---
+# 정해진 행 목록 배열이 없는 파일(ColumnBlock.ip_merge)의 행은 모든 파일을 모아 키별 한 행으로 합침
+MERGE_POLICIES = {
+    "first": "먼저 읽은 파일 우선",
+    "newest": "generatedAt이 최신인 파일 우선",
+    "priority": "지정한 파일 순서 우선",
+}
+
+MERGE_KEYS = {
+    "IP": ("IP",),
+    "IP + 시리얼 번호": ("IP", "System Serial Number"),
+}
+
+DEFAULT_MERGE = {"policy": "first", "key_columns": ("IP",), "priority": ()}
+
+# 값이 없는 것으로 보고 다음 순위 파일의 값으로 채우는 값
+MERGE_EMPTY_VALUES = ("-", "")
+
+def _column_values(blocks, col):
+    """블록들의 col 값을 이어 붙인 object 배열 (없는 값은 "-")"""
+    values = []
+    for block in blocks:
+        part = block.columns.get(col)
+        if part is None:
+            values.extend(["-"] * len(block))
+        else:
+            values.extend(part)
+    array = np.empty(len(values), dtype=object)
+    array[:] = _fill_missing(values)
+    return array
+
+def _block_source(block):
+    names = block.columns.get("Source_File")
+    return names[0] if names else None
+
+def _generated_stamps(blocks):
+    """블록별 내보낸 시각 (UTC, 없거나 읽을 수 없으면 NaT)"""
+    return pd.to_datetime(
+        pd.Series([b.generated_at for b in blocks], dtype=object), utc=True, errors='coerce', format='mixed'
+    )
+
+def _newest_generated_at(blocks):
+    """블록들의 가장 늦은 내보낸 시각 (ISO 문자열, 없으면 None)"""
+    newest = _generated_stamps([b for b in blocks if len(b)]).max()
+    return None if pd.isna(newest) else newest.isoformat()
+
+def _block_ranks(blocks, policy, priority=()):
+    """블록(파일)별 우선순위 (0이 가장 우선, 같은 조건이면 입력 순서)"""
+    if policy == "newest":
+        # 시각이 없거나 읽을 수 없는 파일은 가장 뒤로
+        stamps = _generated_stamps(blocks)
+        keys = [(pd.isna(t), -t.value if not pd.isna(t) else 0) for t in stamps]
+    elif policy == "priority":
+        # 전체 경로(압축 파일 항목은 "압축 파일/항목 경로") 또는 파일 이름으로 지정
+        lookup = {}
+        for i, name in enumerate(priority):
+            lookup.setdefault(name, i)
+        keys = []
+        for block in blocks:
+            name = _block_source(block) or ""
+            keys.append(lookup.get(name, lookup.get(posixpath.basename(name), len(priority))))
+    elif policy == "first":
+        keys = [0] * len(blocks)
+    else:
+        raise ValueError(f"알 수 없는 통합 기준: {policy}")
+    
+    ranks = np.empty(len(blocks), dtype=np.int64)
+    ranks[sorted(range(len(blocks)), key=lambda i: (keys[i], i))] = np.arange(len(blocks))
+    return ranks
+
+def merge_ip_blocks(blocks, policy="first", key_columns=("IP",), priority=(), conflicts=None):
+    """IP 통합 대상 블록들의 행을 키(IP 또는 IP + 시리얼 번호)별 한 행으로 합침 (반환: ColumnBlock)
+    
+    컬럼마다 우선순위가 가장 높은 행의 값을 쓰고, 그 값이 비어 있으면 다음 순위 행의 값을 쓴다.
+    우선순위는 policy에 따라 입력 순서(first), 파일 generatedAt 최신순(newest),
+    priority에 적은 파일 순서(priority)이며 같은 파일 안에서는 행 순서를 따른다.
+    행 단위 반복 없이 키 코드 정렬 한 번 + 컬럼별 배열 연산으로 처리한다.
+    conflicts 리스트를 넘기면 같은 키에서 서로 다른 값이 나온 컬럼마다 충돌 표(DataFrame:
+    키 컬럼, 컬럼, 값, 파일, 선택)를 추가한다.
+    """
+    lengths = np.array([len(b) for b in blocks], dtype=np.int64)
+    n = int(lengths.sum())
+    
+    seen = {}
+    for block in blocks:
+        for col in block.columns:
+            seen.setdefault(col, None)
+    values = {col: _column_values(blocks, col) for col in seen}
+    
+    # 키 컬럼 코드를 하나로 합친 뒤 처음 나온 순서의 그룹 번호로
+    group = np.zeros(n, dtype=np.int64)
+    for col in key_columns:
+        codes, uniques = pd.factorize(values[col]) if col in values else (np.zeros(n, dtype=np.int64), [None])
+        group = group * len(uniques) + codes
+    group, group_uniques = pd.factorize(group)
+    n_groups = len(group_uniques)
+    
+    # 그룹 -> 우선순위 -> 입력 순서로 정렬 (lexsort는 안정 정렬)
+    row_rank = np.repeat(_block_ranks(blocks, policy, priority), lengths)
+    order = np.lexsort((row_rank, group))
+    sorted_group = group[order]
+    sorted_source = values["Source_File"][order] if "Source_File" in values else None
+    
+    merged = ColumnBlock()
+    merged.length = n_groups
+    conflict_parts = {}
+    for col, col_values in values.items():
+        col_values = col_values[order]
+        codes, uniques = pd.factorize(col_values)
+        empty = np.fromiter((u in MERGE_EMPTY_VALUES for u in uniques), dtype=bool, count=len(uniques))
+        valid = np.flatnonzero(~empty[codes])
+        
+        # 그룹마다 값이 있는 첫 행 (정렬 순서상 가장 우선)
+        valid_group = sorted_group[valid]
+        first = np.flatnonzero(np.append(True, valid_group[1:] != valid_group[:-1])) if len(valid) else valid
+        result = np.full(n_groups, "-", dtype=object)
+        result[valid_group[first]] = col_values[valid[first]]
+        merged.columns[col] = result.tolist()
+        if conflicts is not None and col not in key_columns and col != "Source_File":
+            conflict_parts[col] = (valid_group, valid, codes, uniques)
+    
+    if conflicts is not None:
+        keys = [merged.columns.get(col, ["-"] * n_groups) for col in key_columns]
+        for col, (valid_group, valid, codes, uniques) in conflict_parts.items():
+            frame = _conflict_frame(col, key_columns, keys, valid_group, valid, codes, uniques, sorted_source)
+            if frame is not None:
+                conflicts.append(frame)
+    
+    return merged
+
+def _conflict_frame(col, key_columns, keys, valid_group, valid, codes, uniques, sources):
+    """한 컬럼에서 같은 키에 서로 다른 값이 나온 그룹의 값 목록 (그룹마다 우선순위 순, 선택된 값이 첫 행)"""
+    if not len(valid):
+        return None
+    
+    # (그룹, 값)마다 우선순위가 가장 높은 행만 남김
+    # 행은 그룹 -> 우선순위 순으로 정렬되어 있으므로 위치 순서가 곧 그룹별 우선순위 순서
+    pairs = valid_group * len(uniques) + codes[valid]
+    _, firsts = np.unique(pairs, return_index=True)
+    firsts.sort()
+    pair_group = valid_group[firsts]
+    firsts = firsts[np.bincount(pair_group)[pair_group] > 1]
+    if not len(firsts):
+        return None
+    
+    groups = valid_group[firsts]
+    rows = valid[firsts]
+    frame = {k: pd.Categorical(np.asarray(keys[j], dtype=object)[groups]) for j, k in enumerate(key_columns)}
+    frame["컬럼"] = pd.Categorical([col] * len(rows))
+    frame["값"] = uniques[codes[rows]]
+    frame["파일"] = pd.Categorical(sources[rows]) if sources is not None else "-"
+    frame["선택"] = np.append(True, groups[1:] != groups[:-1])
+    return pd.DataFrame(frame)
+
+def _merge_ip_targets(blocks, merge=None, conflicts=None):
+    """IP 통합 대상 블록들을 합친 블록 하나로 바꾼 블록 목록 (첫 대상 블록 자리에 둠)"""
+    targets = [b for b in blocks if b.ip_merge]
+    if not targets:
+        return blocks
+    
+    merged = merge_ip_blocks(targets, conflicts=conflicts, **{**DEFAULT_MERGE, **(merge or {})})
+    result = []
+    for block in blocks:
+        if not block.ip_merge:
+            result.append(block)
+        elif block is targets[0]:
+            result.append(merged)
+    return result
+
+def build_merged_frame(blocks, dataset_key=None, merge=None, conflicts=None):
+    """파일별 행 블록을 컬럼 단위로 이어 붙여 데이터프레임 한 번에 생성
+    
+    dataset_key를 넘기면 df.attrs["dataset_key"]에 기록해 필터 색인 재사용에 쓴다.
+    파일들의 내보낸 시각(generatedAt) 중 가장 늦은 시각은 df.attrs["generated_at"]에 기록한다 (스냅샷 시각).
+    IP 통합 대상 블록은 merge 설정(DEFAULT_MERGE 형식)으로 먼저 합치며,
+    conflicts 리스트를 넘기면 통합 중 값이 서로 다른 컬럼의 충돌 표를 추가한다 (merge_ip_blocks 참고).
+    """
+    if not blocks or not any(len(b) for b in blocks):
+        return pd.DataFrame()
+    generated_at = _newest_generated_at(blocks)
+    blocks = _merge_ip_targets(blocks, merge, conflicts)
+    
+    # 표준 컬럼 순서로 정렬, 나머지 컬럼은 처음 나온 순서대로
+    seen = {}
+    for block in blocks:
+        for col in block.columns:
+            seen.setdefault(col, None)
+    standard_cols = [col for col in COLUMN_MAPPER if col in seen]
+    other_cols = [col for col in seen if col not in COLUMN_MAPPER]
+    
+    data = {}
+    for col in standard_cols + other_cols:
+        values = []
+        for block in blocks:
+            part = block.columns.get(col)
+            if part is None:
+                values.extend(["-"] * len(block))
+            else:
+                values.extend(part)
+        values = _fill_missing(values)
+        
+        if col in CATEGORY_COLUMNS:
+            data[col] = pd.Categorical(values)
+        else:
+            data[col] = values
+    
+    df = pd.DataFrame(data)
+    if dataset_key is not None:
+        df.attrs["dataset_key"] = dataset_key
+    if generated_at is not None:
+        df.attrs["generated_at"] = generated_at
+    return df
+
+# --- [필터 색인] ---
+FILTER_COLUMNS = ("IP", "장비명")
+
+def _sorted_options(values):
+    try:
+        return sorted(values)
+    except TypeError:  # 문자열/숫자가 섞인 경우
+        return sorted(values, key=str)
+
+class FilterIndex:
+    """데이터셋마다 한 번 만드는 필터 색인 (컬럼별 정렬된 고유값 + 값별 행 위치)"""
+    
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.options = {}
+        self.postings = {}
+        
+        for col in columns:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes = series.cat.codes.to_numpy()
+                uniques = series.cat.categories
+            else:
+                codes, uniques = pd.factorize(series)
+            
+            # 코드 기준으로 한 번 정렬해 값별 행 위치를 잘라냄
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            postings = {}
+            for code, value in enumerate(uniques):
+                start, end = bounds[code], bounds[code + 1]
+                if end > start:
+                    postings[value] = order[start:end]
+            
+            self.postings[col] = postings
+            self.options[col] = _sorted_options([v for v in postings if v != "-"])
+    
+    def select(self, selections):
+        """{컬럼: 선택값 목록} 조건을 모두 만족하는 행 위치 (조건이 없으면 None)"""
+        result = None
+        for col, values in selections.items():
+            if not values or col not in self.postings:
+                continue
+            postings = self.postings[col]
+            parts = [postings[v] for v in values if v in postings]
+            # 값마다 행 위치가 겹치지 않으므로 이어 붙여 정렬하면 합집합
+            matched = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+            if result is None:
+                result = matched
+            else:
+                result = np.intersect1d(result, matched, assume_unique=True)
+        return result
@@ -0,0 +1,1082 @@
+"""EST 파일 파싱 및 표준 컬럼 매핑 (Streamlit 없이 사용 가능한 핵심 로직)"""
+import codecs
+import json
+import os
+import hashlib
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from est_archive import ArchiveError, is_archive_name, iter_archive_members
+from est_profile import NULL_PROFILER, StageProfiler
+
+# --- [표준 컬럼 매핑 - Edwards 표준] ---
+COLUMN_MAPPER = {
+    "LineTag": ["lineTag", "id", "Line Tag", "tag", "line_tag"],
+    "장비명": ["name", "applicationName", "장비명", "Device_Name", "deviceName", "equipmentName"],
+    "IP": ["ipAddress", "IP Address", "address", "IP", "ip", "ip_address"],
+    "보고명": ["reportName", "name", "보고명", "description", "report_name"],
+    "System Serial Number": ["systemSerialNumber", "Controller Serial Number", "System Serial Number", "Serial", "serial", "system_serial"],
+    "Pump Type": ["Pump Type", "applicationName", "model", "Application Version", "pumpType", "pump_type"],
+    "Pump Node Module": ["Pump Node Module", "Project Version", "version", "module", "pumpNodeModule", "name"],
+    "SliceType": ["SliceType", "id", "type", "slice", "sliceType"],
+    "FeedEngine": ["feedEngine", "FeedEngine", "engine", "feed_engine"],
+    "ToolType": ["ToolType", "toolType", "tool_type"],
+    "Version": ["version", "Version", "projectVersion", "Project Version"]
+}
+
+# 값을 찾는 범위 등 행 변환 규칙이 바뀌면 올림 (COLUMN_MAPPER와 함께 캐시 버전에 반영)
+MAPPING_RULES_REVISION = 3
+
+# 파일의 내보낸 시각을 찾는 헤더 키 (앞에 있을수록 우선)
+GENERATED_AT_KEYS = ("generatedAt", "exportedAt", "generated_at", "timestamp")
+
+# COLUMN_MAPPER가 바뀌면 캐시가 자동으로 무효화되도록 매핑 내용으로 버전 생성
+COLUMN_MAPPER_VERSION = hashlib.sha1(
+    json.dumps([COLUMN_MAPPER, MAPPING_RULES_REVISION], ensure_ascii=False, sort_keys=True).encode('utf-8')
+).hexdigest()[:12]
+
+# --- [지능형 데이터 추출 함수] ---
+def _enter_node(node, pool, stack):
+    """dict/list 노드를 순회 스택에 추가 (dict의 name-version 쌍은 먼저 기록)"""
+    if isinstance(node, dict):
+        n, v = node.get('name'), node.get('version') or node.get('value')
+        if n and v is not None:
+            pool[str(n)] = v
+        stack.append((iter(node.items()), True))
+    elif isinstance(node, list):
+        stack.append((iter(node), False))
+
+def extract_all_kv(obj, pool=None):
+    """중첩된 구조에서 모든 키-값 쌍을 추출 (나중에 나온 값이 덮어씀)
+    
+    깊게 중첩된 문서에서도 재귀 한도에 걸리지 않도록 명시적 스택으로 순회한다.
+    """
+    if pool is None:
+        pool = {}
+    
+    stack = []
+    _enter_node(obj, pool, stack)
+    while stack:
+        it, is_dict = stack[-1]
+        for entry in it:
+            if is_dict:
+                k, v_ = entry
+            else:
+                k, v_ = None, entry
+            if isinstance(v_, (dict, list)):
+                # 하위 노드를 먼저 끝까지 순회한 뒤 현재 노드의 나머지 항목으로 돌아옴
+                _enter_node(v_, pool, stack)
+                break
+            if is_dict:
+                pool[k] = v_
+        else:
+            stack.pop()
+    
+    return pool
+
+def extract_header_kv(raw, pool=None):
+    """문서 최상위(헤더) 범위의 키-값 쌍만 추출
+    
+    최상위 배열(equipment, summaryVersionInformation 등 행 목록)은 제외하고
+    최상위 스칼라 값과 dict 값(메타데이터 블록)만 평탄화한다.
+    """
+    if pool is None:
+        pool = {}
+    if not isinstance(raw, dict):
+        return pool
+    
+    n, v = raw.get('name'), raw.get('version') or raw.get('value')
+    if n and v is not None:
+        pool[str(n)] = v
+    for k, v_ in raw.items():
+        if isinstance(v_, dict):
+            extract_all_kv(v_, pool)
+        elif not isinstance(v_, list):
+            pool[k] = v_
+    return pool
+
+class KeyPools:
+    """파일 하나의 키-값 조회 범위 (헤더 범위는 처음 필요할 때 한 번만 만들고,
+    항목별 범위는 항목마다 한 번만 평탄화하여 재사용)"""
+    
+    __slots__ = ('raw', '_header', '_items')
+    
+    def __init__(self, raw=None, header=None):
+        self.raw = raw
+        self._header = header
+        self._items = {}  # id(항목) -> (항목, 평탄화 결과)
+    
+    @property
+    def header(self):
+        if self._header is None:
+            self._header = extract_header_kv(self.raw)
+        return self._header
+    
+    def item(self, item):
+        """항목 하나의 평탄화 결과 (같은 항목은 다시 순회하지 않음)"""
+        cached = self._items.get(id(item))
+        if cached is None:
+            # 항목 객체를 함께 보관해야 id가 다른 객체에 재사용되지 않음
+            cached = self._items[id(item)] = (item, extract_all_kv(item))
+        return cached[1]
+    
+    def lookup(self, item_pool, key):
+        """항목 범위에 키가 있으면 그 값, 없으면 헤더 범위 값"""
+        if key in item_pool:
+            return item_pool[key]
+        return self.header.get(key)
+
+# --- [파일 형식 자동 감지 및 파싱] ---
+class _YamlSupport:
+    """yaml 모듈, 로더, 스트리밍용 노드 조립기 (YAML을 처음 읽을 때 한 번 만듦)"""
+    
+    def __init__(self):
+        import yaml
+        self.yaml = yaml
+        # libyaml(C 확장)이 설치되어 있으면 CSafeLoader 사용, 없으면 순수 Python 로더
+        self.loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        self.name = 'yaml-c' if self.loader is not yaml.SafeLoader else 'yaml-py'
+        self.composer = _yaml_node_composer_class(yaml)
+
+_yaml_support = None
+
+def yaml_support():
+    """YAML 파싱 도구 (yaml 모듈은 YAML 파일을 처음 읽을 때 불러오므로 앱 시작 시간에 포함되지 않음)"""
+    global _yaml_support
+    if _yaml_support is None:
+        _yaml_support = _YamlSupport()
+    return _yaml_support
+
+def yaml_parser_name():
+    """YAML 파서 이름 ('yaml-c' 또는 'yaml-py')"""
+    return yaml_support().name
+
+JSON_EXTENSIONS = ('.json',)
+YAML_EXTENSIONS = ('.yml', '.yaml')
+
+def sniff_format(head, file_name):
+    """확장자와 앞부분 바이트로 파일 형식 추정 ('json' 또는 'yaml')"""
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext in JSON_EXTENSIONS:
+        return 'json'
+    if ext in YAML_EXTENSIONS:
+        return 'yaml'
+    
+    # 확장자로 알 수 없으면 첫 글자로 판단 (BOM/공백 무시)
+    first = head.lstrip(b'\xef\xbb\xbf \t\r\n')[:1]
+    return 'json' if first in (b'{', b'[') else 'yaml'
+
+def _load_json(content):
+    return json.loads(content)
+
+def _load_yaml(content):
+    support = yaml_support()
+    return support.yaml.load(content, Loader=support.loader)
+
+# 형식별 로더
+PARSERS = {
+    'json': _load_json,
+    'yaml': _load_yaml,
+}
+
+def parser_name(fmt):
+    return yaml_parser_name() if fmt == 'yaml' else fmt
+
+class ParseError(ValueError):
+    """파일을 JSON/YAML 어느 쪽으로도 해석할 수 없을 때 발생"""
+
+def parse_content(content, file_name):
+    """파일 내용(bytes)을 감지된 형식으로 파싱 (반환: 데이터, 사용한 파서 경로)"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    
+    # 감지한 형식을 먼저 시도하고, 실패한 경우에만 다른 형식으로 한 번 더 시도
+    sniffed = sniff_format(content[:64], file_name)
+    order = [sniffed, 'yaml' if sniffed == 'json' else 'json']
+    
+    first_error = None
+    tried = []
+    for fmt in order:
+        tried.append(parser_name(fmt))
+        try:
+            data = PARSERS[fmt](content)
+        except Exception as e:
+            if first_error is None:
+                first_error = e
+            continue
+        
+        if data is not None:
+            # 예: 'json', 'yaml-c', 'json→yaml-c' (앞 파서 실패 후 대체)
+            return data, '→'.join(tried)
+    
+    if isinstance(first_error, json.JSONDecodeError):
+        raise ParseError("JSON 형식 오류") from first_error
+    if first_error is not None:
+        raise ParseError(str(first_error)) from first_error
+    raise ParseError("내용이 비어 있습니다")
+
+# --- [컬럼 해석 계획 (COLUMN_MAPPER 사전 컴파일)] ---
+# versionInformation 행에서 직접 채우는 컬럼 (계획에서 제외)
+VERSION_ROW_FIXED_COLUMNS = ("IP", "장비명", "Version")
+
+# 행의 name이 컬럼명과 같으면 그 행의 version 값을 사용하는 컬럼
+NAME_MATCH_COLUMNS = ("Pump Type", "Pump Node Module")
+
+# 행의 name 값이 있으면 무조건 name을 사용하는 컬럼
+NAME_FIRST_COLUMNS = ("보고명",)
+
+_NAME = object()  # 후보 목록에서 "행의 name 값" 자리 표시
+
+def compile_column_plan(mapper, skip_columns=()):
+    """COLUMN_MAPPER를 컬럼별 후보 목록과 원본 키 -> 표준 컬럼 역색인으로 컴파일"""
+    columns = []
+    key_index = {}
+    
+    for std_name, candidates in mapper.items():
+        if std_name in skip_columns:
+            continue
+        
+        if std_name in NAME_MATCH_COLUMNS:
+            mode = 'name_match'
+        elif std_name in NAME_FIRST_COLUMNS:
+            mode = 'name_first'
+        else:
+            mode = None
+        columns.append((std_name, tuple(candidates), mode))
+        
+        # applicationName/name은 행에서 직접 가져오므로 스코프 조회 대상이 아님
+        for c in candidates:
+            if c in ("applicationName", "name"):
+                continue
+            cols = key_index.setdefault(c, [])
+            if std_name not in cols:
+                cols.append(std_name)
+    
+    return columns, key_index
+
+VERSION_ROW_COLUMNS, SOURCE_KEY_INDEX = compile_column_plan(COLUMN_MAPPER, VERSION_ROW_FIXED_COLUMNS)
+
+def resolve_scope(parent_scope, scope):
+    """상위 스코프에 현재 스코프의 매핑 대상 키만 덮어쓴 조회용 딕셔너리 생성"""
+    resolved = dict(parent_scope)
+    for k, v in scope.items():
+        if k in SOURCE_KEY_INDEX:
+            resolved[k] = v
+    return resolved
+
+def _column_steps(candidates, scope, app_name, version_info=None):
+    """후보 목록을 실제 값(또는 name 자리 표시) 순서로 해석, 첫 확정 값에서 중단"""
+    steps = []
+    for c in candidates:
+        if c == "applicationName":
+            val = app_name
+        elif c == "name":
+            steps.append(_NAME)
+            continue
+        elif version_info is not None and c in version_info:
+            val = version_info[c]
+        else:
+            val = scope.get(c)
+        
+        if val:
+            steps.append(val)
+            break
+    return tuple(steps)
+
+def build_app_plan(app_scope, app_name):
+    """애플리케이션 단위로 컬럼별 값 후보를 미리 해석"""
+    return [
+        (std_name, candidates, mode, _column_steps(candidates, app_scope, app_name))
+        for std_name, candidates, mode in VERSION_ROW_COLUMNS
+    ]
+
+def resolve_version_row(row, app_plan, app_scope, app_name, version_info):
+    """versionInformation 한 행의 표준 컬럼 값을 계획에 따라 채움"""
+    version_name = row["name"]
+    version_value = row["Version"]
+    
+    # versionInformation 자체에 매핑 대상 키가 있으면 해당 컬럼만 다시 해석
+    overridden = set()
+    for k in version_info:
+        if k in SOURCE_KEY_INDEX:
+            overridden.update(SOURCE_KEY_INDEX[k])
+    
+    for std_name, candidates, mode, steps in app_plan:
+        if mode == 'name_match' and version_name == std_name:
+            row[std_name] = version_value
+            continue
+        if mode == 'name_first' and version_name:
+            row[std_name] = version_name
+            continue
+        
+        if std_name in overridden:
+            steps = _column_steps(candidates, app_scope, app_name, version_info)
+        
+        val = "-"
+        for step in steps:
+            step_val = version_name if step is _NAME else step
+            if step_val:
+                val = step_val
+                break
+        row[std_name] = val
+    
+    return row
+
+# --- [열 단위 행 누적] ---
+class ColumnBlock:
+    """행을 컬럼별 리스트로 누적하는 블록 (행 딕셔너리를 보관하지 않아 메모리 절약)"""
+    
+    __slots__ = ('columns', 'length', 'ip_merge', 'generated_at')
+    
+    def __init__(self):
+        self.columns = {}  # 컬럼명 -> 값 리스트 (처음 나온 순서 유지)
+        self.length = 0
+        self.ip_merge = False      # 다른 파일의 행과 IP 기준으로 통합할 블록인지
+        self.generated_at = None   # 파일의 내보낸 시각 (IP 통합 우선순위, 스냅샷 시각에 사용)
+    
+    def __len__(self):
+        return self.length
+    
+    def append(self, row):
+        columns = self.columns
+        n = self.length
+        for key, val in row.items():
+            col = columns.get(key)
+            if col is None:
+                # 중간에 새로 나온 컬럼은 앞선 행을 None으로 채움
+                col = columns[key] = [None] * n
+            col.append(val)
+        self.length = n + 1
+        
+        # 이번 행에 없는 컬럼은 None으로 채움
+        if len(row) != len(columns):
+            for col in columns.values():
+                if len(col) == n:
+                    col.append(None)
+    
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+# --- [파일 단위 행 추출] ---
+def iter_equipment_rows(equipments, pools, file_name):
+    """equipment -> applications -> versionInformation 구조에서 행을 하나씩 생성"""
+    # 스코프 값은 파일/장비/애플리케이션 단위로 한 번만 해석 (가까운 스코프 우선)
+    file_scope = resolve_scope({}, pools.header)
+    
+    for equipment in equipments:
+        equip_ip = equipment.get('ipAddress', '-')
+        equip_name = equipment.get('name', '-')
+        equip_scope = resolve_scope(file_scope, equipment)
+        
+        # applications 배열 처리
+        if 'applications' in equipment and isinstance(equipment['applications'], list):
+            for app in equipment['applications']:
+                app_name = app.get('applicationName', '-')
+                app_scope = resolve_scope(equip_scope, app)
+                app_plan = build_app_plan(app_scope, app_name)
+                
+                # versionInformation 배열 처리
+                if 'versionInformation' in app and isinstance(app['versionInformation'], list):
+                    for version_info in app['versionInformation']:
+                        version_name = version_info.get('name', '-')
+                        version_value = version_info.get('version', '-')
+                        
+                        row = {
+                            "Source_File": file_name,
+                            "IP": equip_ip,
+                            "장비명": equip_name,
+                            "applicationName": app_name,
+                            "name": version_name,
+                            "Version": version_value
+                        }
+                        
+                        # 각 표준 컬럼별로 값 채우기 (사전 계산된 계획 사용)
+                        resolve_version_row(row, app_plan, app_scope, app_name, version_info)
+                        
+                        yield row
+
+def iter_summary_rows(items, pools, file_name):
+    """항목(summaryVersionInformation 등)마다 행을 하나씩 생성"""
+    for item in items:
+        item_pool = pools.item(item)
+        
+        # IP 찾기 (항목 값 우선, 없으면 헤더 값)
+        ip = "-"
+        for ip_key in COLUMN_MAPPER["IP"]:
+            val = pools.lookup(item_pool, ip_key)
+            if val:
+                ip = str(val)
+                break
+        
+        # 각 항목을 개별 행으로 추가
+        row = {"Source_File": file_name, "IP": ip}
+        
+        # 각 표준 컬럼별로 값 채우기
+        for std_name, candidates in COLUMN_MAPPER.items():
+            if std_name == "IP":
+                continue
+            for c in candidates:
+                val = pools.lookup(item_pool, c)
+                if val:
+                    row[std_name] = val
+                    break
+            # 값이 없으면 "-"로 설정
+            if std_name not in row:
+                row[std_name] = "-"
+        
+        yield row
+
+def parse_file_rows(raw, file_name, profiler=NULL_PROFILER):
+    """파싱된 파일 하나를 표준 컬럼 행 블록(ColumnBlock)으로 변환"""
+    all_rows = ColumnBlock()
+    
+    # 파일 공통 정보는 헤더 범위만 사용 (행 목록 배열은 항목별로 따로 평탄화)
+    with profiler.stage("extract_kv", file_name) as stage:
+        pools = KeyPools(raw)
+        stage.rows = len(pools.header)
+    
+    with profiler.stage("column_mapping", file_name) as stage:
+        _fill_file_rows(all_rows, raw, pools, file_name)
+        stage.rows = len(all_rows)
+    
+    return all_rows
+
+def header_generated_at(header):
+    """헤더 범위 값에서 파일의 내보낸 시각 (없으면 None)"""
+    for key in GENERATED_AT_KEYS:
+        if header.get(key):
+            return str(header[key])
+    return None
+
+def _fill_file_rows(all_rows, raw, pools, file_name):
+    """파일 구조(equipment / summaryVersionInformation / 기타)에 맞게 행 생성"""
+    all_rows.generated_at = header_generated_at(pools.header)
+    # equipment 배열 처리 (새로운 형식: equipment -> applications -> versionInformation)
+    if 'equipment' in raw and isinstance(raw['equipment'], list):
+        all_rows.extend(iter_equipment_rows(raw['equipment'], pools, file_name))
+    
+    # summaryVersionInformation 처리 (기존 형식)
+    elif 'summaryVersionInformation' in raw and isinstance(raw['summaryVersionInformation'], list):
+        all_rows.extend(iter_summary_rows(raw['summaryVersionInformation'], pools, file_name))
+    else:
+        # 그 밖의 구조: 항목마다 행을 만들고, IP 기준 통합은 모든 파일을 모은 뒤 est_merge에서 수행
+        all_rows.extend(iter_summary_rows(generic_items(raw), pools, file_name))
+        all_rows.ip_merge = True
+
+def generic_items(raw):
+    """정해진 행 목록 배열이 없는 문서의 항목 목록
+    
+    최상위가 배열이면 그 dict 원소들, 최상위 dict 값 중 dict 배열이 있으면 그 원소들,
+    둘 다 아니면 문서 전체를 항목 하나로 본다.
+    """
+    if isinstance(raw, list):
+        return [item for item in raw if isinstance(item, dict)]
+    if not isinstance(raw, dict):
+        return []
+    items = [
+        item
+        for value in raw.values() if isinstance(value, list)
+        for item in value if isinstance(item, dict)
+    ]
+    return items or [raw]
+
+# --- [대용량 파일 스트리밍 파싱] ---
+# 이 크기 이상인 파일은 전체 객체 트리를 만들지 않고 항목 단위로 스트리밍 처리
+STREAM_PARSE_MIN_BYTES = int(os.environ.get("EST_STREAM_MIN_BYTES", str(16 * 1024 * 1024)))
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# 항목 단위로 하나씩 읽어 들이는 최상위 배열
+STREAM_KEYS = ('equipment', 'summaryVersionInformation')
+
+class _JsonStreamReader:
+    """바이너리 스트림에서 JSON 값을 필요한 만큼만 읽어 디코딩"""
+    
+    def __init__(self, fp, chunk_size=STREAM_CHUNK_SIZE):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+    
+    def _fill(self, size):
+        """버퍼에 데이터를 더 읽어 옴 (파일 끝이면 False)"""
+        if self._eof:
+            return False
+        
+        # 이미 처리한 앞부분은 버려서 버퍼가 항목 하나 크기 정도로 유지되게 함
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        
+        chunk = self._fp.read(size)
+        if not chunk:
+            self._buf += self._decoder.decode(b'', final=True)
+            self._eof = True
+            return False
+        self._buf += self._decoder.decode(chunk)
+        return True
+    
+    def peek(self):
+        """공백을 건너뛴 다음 글자 (파일 끝이면 빈 문자열)"""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill(self._chunk_size):
+                return ''
+    
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ParseError(f"JSON 형식 오류: '{ch}'가 필요합니다")
+        self._pos += 1
+    
+    def value(self):
+        """다음 JSON 값 하나를 디코딩"""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                obj, end = self._json.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # 값이 버퍼 끝에서 잘린 경우 더 읽고 다시 시도 (큰 항목이면 읽는 양을 늘림)
+                if not self._fill(size):
+                    raise ParseError("JSON 형식 오류") from e
+                size *= 2
+                continue
+            
+            # 숫자 등은 버퍼 끝에서 잘려도 디코딩되므로 끝에 닿았으면 더 읽고 확인
+            if end == len(self._buf) and self._fill(size):
+                continue
+            self._pos = end
+            return obj
+    
+    def iter_array(self):
+        """배열 요소를 하나씩 디코딩"""
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self._pos += 1
+                continue
+            self.expect(']')
+            return
+
+def _iter_json_document(fp):
+    """JSON 최상위 매핑을 (키, 값, 스트리밍 여부)로 순회"""
+    reader = _JsonStreamReader(fp)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key in STREAM_KEYS and reader.peek() == '[':
+            items = reader.iter_array()
+            yield key, items, True
+            for _ in items:  # 소비되지 않은 나머지 항목은 건너뜀
+                pass
+        else:
+            yield key, reader.value(), False
+        
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+        reader.expect('}')
+        return
+
+def _yaml_node_composer_class(yaml):
+    """yaml 기반 클래스를 상속하므로 yaml을 불러온 뒤에 만듦 (yaml_support에서 한 번 호출)"""
+    
+    class _YamlNodeComposer(yaml.composer.Composer, yaml.constructor.SafeConstructor, yaml.resolver.Resolver):
+        """외부 파서의 이벤트로 노드 하나씩 조립하여 Python 객체로 변환"""
+        
+        def __init__(self, parser):
+            self._parser = parser
+            yaml.composer.Composer.__init__(self)
+            yaml.constructor.SafeConstructor.__init__(self)
+            yaml.resolver.Resolver.__init__(self)
+        
+        def check_event(self, *choices):
+            return self._parser.check_event(*choices)
+        
+        def peek_event(self):
+            return self._parser.peek_event()
+        
+        def get_event(self):
+            return self._parser.get_event()
+        
+        def next_value(self):
+            return self.construct_document(self.compose_node(None, None))
+    
+    return _YamlNodeComposer
+
+def _iter_yaml_document(fp):
+    """YAML 최상위 매핑을 (키, 값, 스트리밍 여부)로 순회 (libyaml 이벤트 파서 사용)"""
+    support = yaml_support()
+    yaml = support.yaml
+    parser = support.loader(fp)
+    composer = support.composer(parser)
+    
+    def iter_items():
+        parser.get_event()  # SequenceStartEvent
+        while not parser.check_event(yaml.SequenceEndEvent):
+            yield composer.next_value()
+        parser.get_event()
+    
+    try:
+        parser.get_event()  # StreamStartEvent
+        if parser.check_event(yaml.StreamEndEvent):
+            return
+        parser.get_event()  # DocumentStartEvent
+        if not parser.check_event(yaml.MappingStartEvent):
+            raise ParseError("최상위 구조가 매핑이 아닙니다")
+        parser.get_event()
+        
+        while not parser.check_event(yaml.MappingEndEvent):
+            key = composer.next_value()
+            if key in STREAM_KEYS and parser.check_event(yaml.SequenceStartEvent):
+                items = iter_items()
+                yield key, items, True
+                for _ in items:  # 소비되지 않은 나머지 항목은 건너뜀
+                    pass
+            else:
+                yield key, composer.next_value(), False
+    finally:
+        parser.dispose()
+
+def _iter_document(open_stream, fmt):
+    if fmt == 'json':
+        return _iter_json_document(open_stream())
+    return _iter_yaml_document(open_stream())
+
+def stream_file_rows(open_stream, file_name):
+    """대용량 파일을 항목 단위로 스트리밍하여 행 생성기 반환 (반환: 행 생성기, 파서 경로, 내보낸 시각)
+    
+    open_stream은 처음부터 읽는 새 바이너리 스트림을 돌려주는 함수.
+    1차 순회에서 헤더 범위 값(extract_header_kv 결과와 동일)과 구조를 파악하고,
+    2차 순회에서 항목을 하나씩 읽으며 행을 만든다. 메모리 사용량은 파일 전체가
+    아니라 항목 하나 + 보조값 크기에 비례한다.
+    equipment/summaryVersionInformation 형식이 아니면 None 반환.
+    """
+    with open_stream() as head_fp:
+        fmt = sniff_format(head_fp.read(64), file_name)
+    
+    # 1차 순회: 구조 파악 + 헤더 범위 값 수집 (행 목록 배열은 평탄화하지 않고 건너뜀)
+    header = {}
+    has_equipment = has_summary = False
+    for key, value, is_stream in _iter_document(open_stream, fmt):
+        if is_stream:
+            has_equipment |= key == 'equipment'
+            has_summary |= key == 'summaryVersionInformation'
+        elif not isinstance(value, list):
+            header[key] = value
+    pools = KeyPools(header=extract_header_kv(header))
+    
+    if has_equipment:
+        target, iter_rows = 'equipment', iter_equipment_rows
+    elif has_summary:
+        target, iter_rows = 'summaryVersionInformation', iter_summary_rows
+    else:
+        return None
+    
+    def rows():
+        # 2차 순회: 대상 배열의 항목을 하나씩 행으로 변환
+        for key, value, is_stream in _iter_document(open_stream, fmt):
+            if is_stream and key == target:
+                yield from iter_rows(value, pools, file_name)
+    
+    return rows(), f"{parser_name(fmt)}-stream", header_generated_at(pools.header)
+
+# --- [파일 단위 작업 (프로세스 풀에서 실행)] ---
+def parse_file_job(content, file_name, profiler=NULL_PROFILER):
+    """파일 하나를 파싱하고 행으로 변환 (반환: 행 블록, 파서 경로, 오류 메시지)
+    
+    프로세스 풀 워커에서 실행되므로 예외 대신 오류 메시지를 돌려준다.
+    파싱 실패는 ("parse", 메시지), 그 외 오류는 ("error", 메시지) 형태.
+    """
+    if len(content) >= STREAM_PARSE_MIN_BYTES:
+        # 대용량 파일은 스트리밍 처리, 지원하지 않는 구조이거나 실패하면 일반 파싱으로 대체
+        try:
+            with profiler.stage("stream_parse", file_name, len(content)) as stage:
+                streamed = stream_file_rows(lambda: BytesIO(content), file_name)
+                if streamed is not None:
+                    rows, parser, generated_at = streamed
+                    block = ColumnBlock().extend(rows)
+                    block.generated_at = generated_at
+                    stage.rows = len(block)
+            if streamed is not None:
+                return block, parser, None
+        except Exception:
+            pass
+    
+    try:
+        with profiler.stage("parse", file_name, len(content)):
+            raw, parser = parse_content(content, file_name)
+    except ParseError as e:
+        return None, None, ("parse", str(e))
+    
+    try:
+        return parse_file_rows(raw, file_name, profiler), parser, None
+    except Exception as e:
+        return None, parser, ("error", str(e))
+
+def profiled_parse_file_job(content, file_name):
+    """parse_file_job + 단계별 측정 기록 (프로세스 풀에서 기록을 함께 돌려받기 위함)"""
+    profiler = StageProfiler()
+    result = parse_file_job(content, file_name, profiler)
+    return result, profiler.records
+
+# --- [병렬 파싱 설정] ---
+# 0이면 CPU 코어 수만큼 사용, 1이면 항상 순차 처리
+PARSE_WORKERS = int(os.environ.get("EST_PARSE_WORKERS", "0"))
+
+# 새로 파싱할 파일이 이 개수 미만이면 프로세스 풀 없이 순차 처리 (풀 기동 비용이 더 큼)
+PARALLEL_MIN_FILES = 8
+
+def resolve_worker_count(workers=None):
+    """설정값을 실제 워커 수로 변환 (0 또는 음수면 CPU 코어 수)"""
+    if workers is None:
+        workers = PARSE_WORKERS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+def run_parse_jobs(jobs, workers=None, profiler=NULL_PROFILER):
+    """(내용, 파일명) 목록을 파싱하여 입력 순서대로 parse_file_job 결과 반환
+    
+    profiler가 활성화되어 있으면 파일별 단계 측정 기록을 profiler에 모은다.
+    """
+    workers = min(resolve_worker_count(workers), len(jobs))
+    
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_FILES:
+        contents = [content for content, _ in jobs]
+        names = [name for _, name in jobs]
+        chunksize = max(1, len(jobs) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map은 제출 순서대로 결과를 돌려주므로 병합 순서가 항상 동일
+                if not profiler.enabled:
+                    return list(executor.map(parse_file_job, contents, names, chunksize=chunksize))
+                
+                results = []
+                for result, records in executor.map(
+                    profiled_parse_file_job, contents, names, chunksize=chunksize
+                ):
+                    results.append(result)
+                    profiler.extend(records)
+                return results
+        except (BrokenProcessPool, OSError):
+            pass  # 프로세스를 띄울 수 없는 환경이면 순차 처리로 대체
+    
+    return [parse_file_job(content, name, profiler) for content, name in jobs]
+
+# --- [입력 파일 읽기 (압축 파일 항목 포함)] ---
+CONFIG_EXTENSIONS = JSON_EXTENSIONS + YAML_EXTENSIONS
+
+# 파싱 대기 중인 파일 내용이 이 크기를 넘으면 먼저 파싱 (압축 파일 항목이 많아도 메모리 사용량 제한)
+PARSE_BATCH_BYTES = int(os.environ.get("EST_PARSE_BATCH_BYTES", str(64 * 1024 * 1024)))
+
+def is_input_name(name):
+    """읽을 수 있는 입력 파일인지 (YAML/JSON 또는 압축 파일)"""
+    return name.endswith(CONFIG_EXTENSIONS) or is_archive_name(name)
+
+def iter_source_contents(name, fp, profiler=NULL_PROFILER):
+    """입력 하나를 (표시 이름, 내용 bytes)로 하나씩 읽음
+    
+    압축 파일은 디스크에 풀지 않고 YAML/JSON 항목마다 하나씩 돌려주며,
+    항목의 표시 이름은 "압축 파일 이름/항목 경로" 형태.
+    fp는 처음부터 읽는 바이너리 파일 객체. 압축 파일을 읽을 수 없으면 ArchiveError 발생.
+    """
+    if not is_archive_name(name):
+        with profiler.stage("read", name) as stage:
+            content = fp.read()
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            stage.nbytes = len(content)
+        yield name, content
+        return
+    
+    # 항목의 압축 해제 시간을 항목별 읽기 시간으로 기록
+    started = time.perf_counter()
+    for member, content in iter_archive_members(fp, name, CONFIG_EXTENSIONS):
+        display = f"{name}/{member}"
+        profiler.record("read", display, time.perf_counter() - started, nbytes=len(content))
+        yield display, content
+        started = time.perf_counter()
+
+# --- [configs 폴더 증분 적재] ---
+MANIFEST_FILE = "manifest.json"
+
+class LocalFile:
+    """디스크 파일을 업로드 파일처럼 다루는 래퍼 (읽을 때 원본 바이트를 그대로 반환)"""
+    
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+    
+    def seek(self, pos):
+        pass
+    
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+    
+    def open(self):
+        return open(self.path, 'rb')
+
+def scan_config_files(configs_dir, recursive=False):
+    """configs 폴더의 YAML/JSON/압축 파일을 (상대 경로, 전체 경로) 목록으로 반환"""
+    found = []
+    if not os.path.isdir(configs_dir):
+        return found
+    
+    for root, dirs, files in os.walk(configs_dir):
+        # 숨김 폴더(캐시 등)는 건너뜀
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.')) if recursive else []
+        for f in files:
+            if is_input_name(f):
+                path = os.path.join(root, f)
+                rel = os.path.relpath(path, configs_dir).replace(os.sep, '/')
+                found.append((rel, path))
+    
+    found.sort()
+    return found
+
+def _load_manifest(manifest_dir):
+    path = os.path.join(manifest_dir, MANIFEST_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    # 매핑 규칙이 바뀌었으면 저장된 행은 모두 무효
+    if manifest.get('mapper_version') != COLUMN_MAPPER_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+def _save_manifest(manifest_dir, entries):
+    path = os.path.join(manifest_dir, MANIFEST_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'mapper_version': COLUMN_MAPPER_VERSION, 'files': entries}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+def _block_file(rel, digest):
+    name_hash = hashlib.blake2b(rel.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{digest}-{name_hash}.pkl"
+
+def _read_block(manifest_dir, entry):
+    try:
+        with open(os.path.join(manifest_dir, entry['block']), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+def _entry_records(entry):
+    """매니페스트 항목의 행 블록 기록 목록 (압축 파일은 항목별 기록, 일반 파일은 자기 자신)"""
+    return entry['members'] if 'members' in entry else [entry]
+
+def _referenced_blocks(entries):
+    return {
+        record['block']
+        for entry in entries.values()
+        for record in _entry_records(entry)
+        if 'block' in record
+    }
+
+def load_configs_folder(configs_dir, manifest_dir, recursive=False, workers=None, report=None, sources=None,
+                        profiler=NULL_PROFILER):
+    """configs 폴더 전체를 매니페스트 기반으로 증분 적재 (반환: 행 블록 목록, 오류 목록)
+    
+    매니페스트에는 파일별 경로/크기/수정 시각/내용 해시와 파싱된 행 블록 위치가 저장된다.
+    크기와 수정 시각이 같으면 파일을 읽지 않고, 내용 해시가 같으면 다시 파싱하지 않는다.
+    새로 생기거나 바뀐 파일만 파싱하며, 사라진 파일은 매니페스트에서 제거한다.
+    압축 파일은 항목별로 해시/행 블록을 기록하여, 압축 파일이 바뀌어도 내용이 같은 항목은 다시 파싱하지 않는다.
+    오류 목록은 (상대 경로, 종류, 메시지) 형태이며 종류는 parse_file_job과 같다.
+    sources 리스트를 넘기면 반환 블록 순서대로 (상대 경로, 내용 해시)를 기록한다.
+    """
+    os.makedirs(manifest_dir, exist_ok=True)
+    entries = _load_manifest(manifest_dir)
+    files = scan_config_files(configs_dir, recursive)
+    
+    units = []    # 반환할 블록 단위 (파일 또는 압축 파일 항목): [이름, 블록, 파서, 캐시 상태, 크기, 해시]
+    pending = []  # (units 위치, 매니페스트 기록, 내용)
+    pending_bytes = 0
+    errors = []
+    changed = False
+    
+    def reuse(entry):
+        """저장된 행 블록을 그대로 사용 (블록 파일을 읽을 수 없으면 False)"""
+        if entry.get('error'):
+            errors.append((entry['path'], *entry['error']))
+            return True
+        loaded = []
+        for record in _entry_records(entry):
+            if record.get('error'):
+                loaded.append((record, None))
+                continue
+            block = _read_block(manifest_dir, record)
+            if block is None:
+                return False
+            loaded.append((record, block))
+        for record, block in loaded:
+            if block is None:
+                errors.append((record['path'], *record['error']))
+            else:
+                units.append([record['path'], block, record['parser'], "매니페스트", record['size'], record['hash']])
+        return True
+    
+    def add_content(record, content, previous):
+        """내용 해시가 이전 기록과 같으면 저장된 블록을 사용하고, 아니면 파싱 대기 목록에 추가"""
+        nonlocal pending_bytes
+        record['hash'] = hashlib.blake2b(content, digest_size=16).hexdigest()
+        record['size'] = len(content)
+        
+        # 수정 시각만 바뀌고 내용이 같으면 다시 파싱하지 않음
+        if previous and previous.get('hash') == record['hash'] and not previous.get('error'):
+            block = _read_block(manifest_dir, previous)
+            if block is not None:
+                record.update(parser=previous['parser'], rows=previous['rows'], block=previous['block'])
+                units.append([record['path'], block, record['parser'], "매니페스트", len(content), record['hash']])
+                return
+        
+        units.append([record['path'], None, None, "-", len(content), record['hash']])
+        pending.append((len(units) - 1, record, content))
+        pending_bytes += len(content)
+        if pending_bytes >= PARSE_BATCH_BYTES:
+            flush()
+    
+    def flush():
+        """대기 중인 파일을 파싱하여 행 블록 저장 (파일이 많으면 프로세스 풀 사용)"""
+        nonlocal pending_bytes
+        if not pending:
+            return
+        results = run_parse_jobs([(content, record['path']) for _, record, content in pending], workers, profiler)
+        
+        for (u, record, _), (block, parser, error) in zip(pending, results):
+            if error is not None:
+                # 실패한 파일도 기록해 두어 바뀌기 전까지 다시 파싱하지 않음
+                record['error'] = list(error)
+                errors.append((record['path'], *error))
+                continue
+            
+            record.update(parser=parser, rows=len(block), block=_block_file(record['path'], record['hash']))
+            with open(os.path.join(manifest_dir, record['block']), 'wb') as f:
+                pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+            units[u][1:3] = [block, parser]
+        
+        pending.clear()
+        pending_bytes = 0
+    
+    for rel, path in files:
+        try:
+            stat = os.stat(path)
+            entry = entries.get(rel)
+            
+            # 크기/수정 시각이 그대로면 파일을 열지 않고 저장된 결과 사용
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                if reuse(entry):
+                    continue
+            
+            if not is_archive_name(rel):
+                with open(path, 'rb') as f:
+                    [(_, content)] = iter_source_contents(rel, f, profiler)
+                record = {'path': rel, 'mtime_ns': stat.st_mtime_ns}
+                add_content(record, content, entry)
+                record['size'] = stat.st_size
+                entries[rel] = record
+                changed = True
+                continue
+            
+            # 압축 파일은 항목을 하나씩 풀어 읽음 (이전 기록과 내용이 같은 항목은 다시 파싱하지 않음)
+            previous = {r['path']: r for r in _entry_records(entry)} if entry and 'members' in entry else {}
+            first_unit = len(units)
+            members = []
+            try:
+                with open(path, 'rb') as f:
+                    for name, content in iter_source_contents(rel, f, profiler):
+                        record = {'path': name}
+                        add_content(record, content, previous.get(name))
+                        members.append(record)
+            except ArchiveError as e:
+                # 읽다가 실패한 압축 파일은 일부 항목만 반영하지 않고 통째로 오류 처리
+                del units[first_unit:]
+                pending[:] = [job for job in pending if job[0] < first_unit]
+                pending_bytes = sum(len(content) for _, _, content in pending)
+                entries[rel] = {
+                    'path': rel,
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'hash': None,
+                    'error': ["error", str(e)],
+                }
+                errors.append((rel, "error", str(e)))
+                changed = True
+                continue
+            
+            entries[rel] = {
+                'path': rel,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'hash': hashlib.blake2b(
+                    "".join(f"{r['path']}:{r['hash']};" for r in members).encode('utf-8'), digest_size=16
+                ).hexdigest(),
+                'members': members,
+            }
+            changed = True
+        except OSError as e:
+            errors.append((rel, "error", str(e)))
+    
+    flush()
+    
+    # 디스크에서 사라진 파일은 매니페스트에서 제거 (이번에 스캔하지 않은 하위 폴더 항목은 유지)
+    current = {rel for rel, _ in files}
+    for rel in list(entries):
+        if rel not in current and not os.path.isfile(os.path.join(configs_dir, rel)):
+            del entries[rel]
+            changed = True
+    
+    if changed:
+        _save_manifest(manifest_dir, entries)
+        
+        # 어떤 항목도 참조하지 않는 행 블록 파일 정리
+        referenced = _referenced_blocks(entries)
+        for name in os.listdir(manifest_dir):
+            if name.endswith('.pkl') and name not in referenced:
+                try:
+                    os.remove(os.path.join(manifest_dir, name))
+                except OSError:
+                    pass
+    
+    blocks = []
+    for name, block, parser, cache_state, size, digest in units:
+        if block is None:
+            continue
+        blocks.append(block)
+        if sources is not None:
+            sources.append((name, digest))
+        if report is not None:
+            report.append({
+                "파일": name,
+                "파서": parser,
+                "캐시": cache_state,
+                "크기(bytes)": size,
+                "행 수": len(block),
+            })
+    
+    return blocks, errors
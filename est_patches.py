@@ -0,0 +1,252 @@
+"""장비 리스트 편집 내역 (행 키 + 컬럼 단위 패치 로그, SQLite에 영구 저장)
+
+편집 값은 (행 키, 컬럼, 이전 값, 새 값)으로만 보관하고, 통합 데이터에는 화면에 보이는 행과
+내보내는 행에만 덮어쓴다. 행 키는 IP + applicationName + name(비어 있으면 장비명 / Pump Type)이므로 파일을 다시 올리거나
+다른 세션에서 같은 데이터를 열어도 같은 행에 적용된다 (같은 키의 행이 여럿이면 모두 적용).
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from est_drift import column_codes
+
+# 행을 식별하는 컬럼 (없는 컬럼은 "-"로 취급)
+ROW_KEY_COLUMNS = ("IP", "applicationName", "name")
+
+# applicationName/name이 비어 있는 행(summary 형식 등)에서 대신 쓰는 컬럼
+ROW_KEY_FALLBACKS = {"applicationName": "장비명", "name": "Pump Type"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS patches (
+    row_key TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    old_value TEXT,
+    new_value TEXT,
+    edited_at TEXT NOT NULL,
+    PRIMARY KEY (row_key, column_name)
+);
+"""
+
+def _same(a, b):
+    """셀 값 비교 (None/NaN끼리는 같은 값)"""
+    a_missing = a is None or (isinstance(a, float) and a != a)
+    b_missing = b is None or (isinstance(b, float) and b != b)
+    if a_missing or b_missing:
+        return a_missing and b_missing
+    return a == b
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        value = None
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+class RowKeys:
+    """데이터셋 행 위치 <-> 행 키 변환 (데이터셋마다 한 번 만듦)
+    
+    키 컬럼의 정수 코드를 하나의 int64로 합쳐 두어, 행 위치 목록에서 편집된 행을 찾을 때
+    문자열을 만들지 않는다.
+    """
+    
+    def __init__(self, df, columns=ROW_KEY_COLUMNS):
+        self.columns = columns
+        self.n_rows = len(df)
+        self._uniques = []
+        self._lookup = []
+        combined = np.zeros(len(df), dtype=np.int64)
+        for col in columns:
+            codes, uniques = self._codes(df, col)
+            fallback = ROW_KEY_FALLBACKS.get(col)
+            if fallback is not None and fallback in df.columns:
+                # 비어 있는 값은 대체 컬럼 코드로 (두 고유값 목록을 이어 붙인 코드 공간)
+                fb_codes, fb_uniques = self._codes(df, fallback)
+                codes = np.where(uniques[codes] == "-", len(uniques) + fb_codes, codes)
+                # 두 목록에 같은 값이 있으면 하나의 코드로 합침 (키 문자열 <-> 코드가 1:1이 되도록)
+                merged, uniques = pd.factorize(np.concatenate([uniques, fb_uniques]))
+                codes = merged.astype(np.int64)[codes]
+                uniques = np.asarray(uniques, dtype=object)
+            combined = combined * len(uniques) + codes
+            self._uniques.append(uniques)
+            self._lookup.append({v: i for i, v in enumerate(uniques)})
+        self.combined = combined
+    
+    @staticmethod
+    def _codes(df, col):
+        if col in df.columns:
+            return column_codes(df[col])
+        return np.zeros(len(df), dtype=np.int64), np.array(["-"], dtype=object)
+    
+    def key(self, position):
+        """행 위치의 행 키 (문자열 튜플)"""
+        codes = []
+        value = int(self.combined[position])
+        for uniques in reversed(self._uniques):
+            value, code = divmod(value, len(uniques))
+            codes.append(code)
+        return tuple(str(u[c]) for u, c in zip(self._uniques, reversed(codes)))
+    
+    def encode(self, key):
+        """행 키를 합친 정수 키로 (이 데이터셋에 없는 키면 None)"""
+        value = 0
+        for part, uniques, lookup in zip(key, self._uniques, self._lookup):
+            code = lookup.get(part)
+            if code is None:
+                return None
+            value = value * len(uniques) + code
+        return value
+
+class PatchLog:
+    """행 키 기준 편집 내역 (모든 세션이 공유, 바뀔 때마다 SQLite에 바로 기록)
+    
+    연결은 PatchLog마다 하나만 열어 두고 (스키마도 여기서 한 번만 만듦) 모든 기록을 _lock으로 직렬화한다.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._patches = {}  # 행 키 -> {컬럼: (이전 값, 새 값, 편집 시각)}
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # 세션 스레드마다 같은 연결을 쓰므로 check_same_thread를 끄고 _lock으로 보호
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.executescript(SCHEMA)
+        for row_key, column, old, new, edited_at in self._con.execute(
+            "SELECT row_key, column_name, old_value, new_value, edited_at FROM patches ORDER BY edited_at"
+        ):
+            self._patches.setdefault(tuple(json.loads(row_key)), {})[column] = (
+                json.loads(old), json.loads(new), edited_at,
+            )
+    
+    def close(self):
+        with self._lock:
+            self._con.close()
+    
+    def __len__(self):
+        with self._lock:
+            return sum(len(cols) for cols in self._patches.values())
+    
+    def get(self, row_key, column):
+        """(이전 값, 새 값, 편집 시각), 편집하지 않았으면 None"""
+        with self._lock:
+            return self._patches.get(row_key, {}).get(column)
+    
+    def set(self, row_key, column, old, new):
+        """편집 기록 (새 값이 원래 값과 같으면 기록을 지움). 내용이 바뀌었으면 True"""
+        return self.set_many([(row_key, column, old, new)]) > 0
+    
+    def set_many(self, edits):
+        """[(행 키, 컬럼, 이전 값, 새 값)]을 한 트랜잭션으로 기록. 내용이 바뀐 편집 수를 반환
+        
+        같은 셀이 여러 번 나오면 뒤의 편집이 이긴다. SQLite 기록이 실패하면 메모리 내역도 바꾸지 않는다.
+        """
+        edited_at = datetime.now().isoformat(timespec='seconds')
+        changed = 0
+        with self._lock:
+            pending = {}  # (행 키, 컬럼) -> (이전 값, 새 값, 편집 시각), 기록을 지우면 None
+            for row_key, column, old, new in edits:
+                cell = (row_key, column)
+                current = pending[cell] if cell in pending else self._patches.get(row_key, {}).get(column)
+                if current is not None:
+                    old = current[0]  # 처음 편집하기 전 값을 유지
+                    if _same(current[1], new):
+                        continue
+                elif _same(old, new):
+                    continue
+                pending[cell] = None if _same(old, new) else (old, new, edited_at)
+                changed += 1
+            if not pending:
+                return 0
+            
+            deletes = [(_to_json(list(row_key)), column)
+                       for (row_key, column), patch in pending.items() if patch is None]
+            inserts = [(_to_json(list(row_key)), column, _to_json(patch[0]), _to_json(patch[1]), patch[2])
+                       for (row_key, column), patch in pending.items() if patch is not None]
+            with self._con:
+                if deletes:
+                    self._con.executemany(
+                        "DELETE FROM patches WHERE row_key = ? AND column_name = ?", deletes,
+                    )
+                if inserts:
+                    self._con.executemany("INSERT OR REPLACE INTO patches VALUES (?, ?, ?, ?, ?)", inserts)
+            
+            for (row_key, column), patch in pending.items():
+                if patch is not None:
+                    self._patches.setdefault(row_key, {})[column] = patch
+                    continue
+                cols = self._patches.get(row_key, {})
+                cols.pop(column, None)
+                if not cols:
+                    self._patches.pop(row_key, None)
+        return changed
+    
+    def clear(self):
+        with self._lock:
+            with self._con:
+                self._con.execute("DELETE FROM patches")
+            self._patches.clear()
+    
+    def entries(self):
+        """편집 내역 목록 [(행 키, 컬럼, 이전 값, 새 값, 편집 시각)] (편집 시각 순)"""
+        with self._lock:
+            rows = [
+                (row_key, column, old, new, edited_at)
+                for row_key, cols in self._patches.items()
+                for column, (old, new, edited_at) in cols.items()
+            ]
+        return sorted(rows, key=lambda r: r[4])
+    
+    def apply(self, frame, positions, row_keys):
+        """positions 행으로 만든 frame에 편집 값을 직접 덮어씀 (편집된 셀만 바꾸며 복사하지 않음)"""
+        with self._lock:
+            encoded = {}
+            for row_key, cols in self._patches.items():
+                value = row_keys.encode(row_key)
+                if value is not None:
+                    encoded[value] = cols
+        if not encoded or not len(positions):
+            return frame
+        
+        keys = row_keys.combined[positions]
+        rows = np.flatnonzero(np.isin(keys, np.fromiter(encoded, dtype=np.int64, count=len(encoded))))
+        
+        # 컬럼별로 (행, 값)을 모아 한 번에 기록
+        updates = {}
+        for row in rows.tolist():
+            for column, (_, new, _) in encoded[int(keys[row])].items():
+                if column in frame.columns:
+                    cells = updates.setdefault(column, ([], []))
+                    cells[0].append(row)
+                    cells[1].append(new)
+        
+        for column, (cell_rows, values) in updates.items():
+            if frame[column].dtype != object:
+                frame[column] = frame[column].astype(object)
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            frame.iloc[cell_rows, frame.columns.get_loc(column)] = array
+        return frame
+    
+    def record_editor_state(self, state, df, positions, row_keys):
+        """st.data_editor 상태의 edited_rows(표시 행 번호 -> {컬럼: 새 값})를 편집 내역에 반영
+        
+        positions는 편집기에 보여 준 행들의 데이터셋 행 위치. 바뀐 셀 수를 반환한다.
+        """
+        edits = []
+        for row, cells in (state or {}).get("edited_rows", {}).items():
+            row = int(row)
+            if row >= len(positions):
+                continue
+            position = int(positions[row])
+            row_key = row_keys.key(position)
+            for column, new in cells.items():
+                if column not in df.columns:
+                    continue
+                edits.append((row_key, column, df[column].iat[position], new))
+        return self.set_many(edits)
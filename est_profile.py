@@ -0,0 +1,152 @@
+"""처리 단계별 계측 (파일/단계별 소요 시간, 메모리, 행 수, 바이트)
+
+비활성 상태에서는 stage()가 아무것도 하지 않는 공용 객체를 돌려주므로
+파일당 함수 호출 몇 번 외에는 비용이 없다. 행 단위 반복 안에서는 사용하지 않는다.
+
+메모리는 두 가지로 기록한다.
+- peak_mb: tracemalloc이 켜져 있을 때 단계 시작 대비 최대 할당량 (est_bench와 같은 방식, 실행이 느려짐)
+- rss_mb: 단계 전후 프로세스 RSS 변화 (항상 측정, /proc를 읽을 수 없는 환경에서는 None)
+tracemalloc과 RSS는 프로세스 전체 값이므로 여러 세션이 동시에 실행되면 서로의 할당이 섞일 수 있다.
+"""
+import json
+import os
+import time
+import tracemalloc
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # Windows 등
+    _PAGE_SIZE = None
+
+def rss_bytes():
+    """현재 프로세스 RSS (바이트, Linux /proc 기준, 읽을 수 없으면 None)"""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+class _Stage:
+    """with 블록 하나의 측정 (rows/nbytes는 블록 안에서 채울 수 있음)"""
+    __slots__ = ('profiler', 'name', 'file', 'rows', 'nbytes', '_start', '_rss', '_traced', '_peak')
+
+    def __init__(self, profiler, name, file, nbytes):
+        self.profiler = profiler
+        self.name = name
+        self.file = file
+        self.rows = None
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self._traced = None
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # 안쪽 단계가 최대값을 초기화하므로 바깥 단계의 지금까지 최대값은 따로 보관
+            active = self.profiler._active
+            if active and active[-1]._traced is not None:
+                active[-1]._peak = max(active[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            self._traced = current
+            self._peak = current
+        self.profiler._active.append(self)
+        self._rss = rss_bytes()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        self.profiler._active.pop()
+        peak_mb = rss_mb = None
+        if self._traced is not None and tracemalloc.is_tracing():
+            peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            peak_mb = (peak - self._traced) / 1e6
+        if self._rss is not None:
+            rss = rss_bytes()
+            if rss is not None:
+                rss_mb = (rss - self._rss) / 1e6
+        self.profiler.record(self.name, self.file, seconds, self.rows, self.nbytes, peak_mb, rss_mb)
+        return False
+
+class _NullStage:
+    """비활성 계측용 (속성을 써도 버려짐)"""
+    rows = None
+    nbytes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+NULL_STAGE = _NullStage()
+
+class StageProfiler:
+    """단계별 측정 기록 모음 (records: file, stage, seconds, rows, bytes, peak_mb, rss_mb)"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = []
+        self._active = []  # 진행 중인 단계 (바깥 → 안쪽)
+
+    def stage(self, name, file=None, nbytes=None):
+        if not self.enabled:
+            return NULL_STAGE
+        return _Stage(self, name, file, nbytes)
+
+    def record(self, name, file, seconds, rows=None, nbytes=None, peak_mb=None, rss_mb=None):
+        """with 블록으로 감쌀 수 없는 구간(생성기 등)의 측정값을 직접 기록"""
+        if self.enabled:
+            self.records.append({
+                "file": file,
+                "stage": name,
+                "seconds": seconds,
+                "rows": rows,
+                "bytes": nbytes,
+                "peak_mb": None if peak_mb is None else round(peak_mb, 3),
+                "rss_mb": None if rss_mb is None else round(rss_mb, 3),
+            })
+
+    def extend(self, records):
+        """다른 프로세스에서 측정한 기록을 합침"""
+        if self.enabled:
+            self.records.extend(records)
+
+    def summary(self):
+        """단계별 합계 (측정 순서대로): [{stage, files, seconds, rows, bytes, peak_mb, rss_mb}]
+
+        peak_mb는 파일/호출 중 가장 큰 값, 나머지는 합계.
+        """
+        totals = {}
+        for rec in self.records:
+            total = totals.setdefault(rec["stage"], {
+                "stage": rec["stage"], "files": 0, "seconds": 0.0, "rows": None, "bytes": None,
+                "peak_mb": None, "rss_mb": None,
+            })
+            total["files"] += rec["file"] is not None
+            total["seconds"] += rec["seconds"]
+            for key in ("rows", "bytes", "rss_mb"):
+                if rec.get(key) is not None:
+                    total[key] = (total[key] or 0) + rec[key]
+            if rec.get("peak_mb") is not None:
+                total["peak_mb"] = max(total["peak_mb"] or 0, rec["peak_mb"])
+        return list(totals.values())
+
+    def to_jsonl(self, **context):
+        """기록을 JSON Lines 문자열로 변환 (context는 모든 줄에 함께 기록)"""
+        return "".join(
+            json.dumps({**context, **rec}, ensure_ascii=False) + "\n" for rec in self.records
+        )
+
+    def append_log(self, path, **context):
+        """JSON Lines 로그 파일에 기록 추가 (오프라인 분석용)"""
+        if self.records:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(self.to_jsonl(**context))
+
+# 계측하지 않을 때 기본값으로 쓰는 비활성 프로파일러
+NULL_PROFILER = StageProfiler(enabled=False)
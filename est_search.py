@@ -0,0 +1,128 @@
+"""통합 데이터 값 검색 (토큰/3-gram 역색인)
+
+검색은 행이 아니라 고유값 단위로 한다.
+- TermIndex: 값(대소문자 무시) 사전. 값마다 3-gram과 토큰(영숫자 조각, 값 전체 포함)을 색인한다.
+- SearchIndex: 데이터셋 하나의 컬럼별 (행 코드, 고유값 -> 값 id)와 그 데이터셋의 TermIndex.
+  데이터셋마다 한 번 만들며, 세션 공용 데이터셋 캐시에 데이터셋과 함께 보관되고 함께 제거된다.
+
+조회는 검색어에 맞는 값 id를 색인에서 찾은 뒤, 그 값을 가진 행만 코드 배열로 골라낸다.
+"""
+import bisect
+import re
+import threading
+
+import numpy as np
+
+from est_drift import column_codes
+from est_parser import COLUMN_MAPPER
+
+# 검색 대상 기본 컬럼 (표준 컬럼)
+SEARCH_COLUMNS = tuple(COLUMN_MAPPER)
+
+NGRAM = 3
+
+# 토큰 구분 (예: "Edwards.CoreService" -> edwards, coreservice / "D37486834_V5" -> d37486834, v5)
+TOKEN_SPLIT = re.compile(r'[\W_]+')
+
+class TermIndex:
+    """값 사전 + 3-gram/토큰 역색인 (SearchIndex 하나가 소유, 같은 데이터셋을 연 세션들이 함께 조회)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.terms = []       # 값 id -> 값 (casefold)
+        self._ids = {}        # 값 -> 값 id
+        self._grams = {}      # 3-gram -> [값 id]
+        self._tokens = {}     # 토큰 -> [값 id]
+        self._sorted_tokens = None  # 앞부분 일치 검색용 (값이 추가되면 다시 정렬)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def ids(self, values):
+        """값 목록의 값 id 배열 (빈 값 "-"는 -1, 처음 보는 값은 사전에 추가)"""
+        out = np.full(len(values), -1, dtype=np.int64)
+        with self._lock:
+            for i, value in enumerate(values):
+                if value == "-":
+                    continue
+                term = str(value).casefold()
+                term_id = self._ids.get(term)
+                if term_id is None:
+                    term_id = self._add(term)
+                out[i] = term_id
+        return out
+
+    def _add(self, term):
+        term_id = len(self.terms)
+        self.terms.append(term)
+        self._ids[term] = term_id
+        for gram in {term[i:i + NGRAM] for i in range(len(term) - NGRAM + 1)}:
+            self._grams.setdefault(gram, []).append(term_id)
+        for token in {t for t in TOKEN_SPLIT.split(term) if t} | {term}:
+            self._tokens.setdefault(token, []).append(term_id)
+        self._sorted_tokens = None
+        return term_id
+
+    def match(self, query, prefix=False):
+        """검색어에 맞는 값 id (정렬된 배열, 검색어가 비어 있으면 None)
+
+        prefix=False: 값 어디에든 검색어가 들어 있으면 일치 (3-gram 후보를 고른 뒤 확인)
+        prefix=True: 값 전체 또는 토큰 하나가 검색어로 시작하면 일치
+        """
+        query = query.strip().casefold()
+        if not query:
+            return None
+
+        with self._lock:
+            if prefix:
+                if self._sorted_tokens is None:
+                    self._sorted_tokens = sorted(self._tokens)
+                tokens = self._sorted_tokens
+                start = bisect.bisect_left(tokens, query)
+                end = bisect.bisect_left(tokens, query + '\U0010ffff')
+                found = set()
+                for token in tokens[start:end]:
+                    found.update(self._tokens[token])
+            elif len(query) >= NGRAM:
+                # 검색어의 모든 3-gram을 가진 값만 후보 (가장 짧은 목록부터 교집합)
+                postings = sorted(
+                    (self._grams.get(query[i:i + NGRAM], ()) for i in range(len(query) - NGRAM + 1)), key=len,
+                )
+                found = set(postings[0])
+                for posting in postings[1:]:
+                    if not found:
+                        break
+                    found.intersection_update(posting)
+                if len(query) > NGRAM:
+                    found = {t for t in found if query in self.terms[t]}
+            else:
+                # 3-gram보다 짧은 검색어는 값 사전 전체를 확인 (사전은 행 수보다 훨씬 작음)
+                found = {t for t, term in enumerate(self.terms) if query in term}
+        return np.fromiter(sorted(found), dtype=np.int64, count=len(found))
+
+class SearchIndex:
+    """데이터셋 하나의 값 검색 색인 (컬럼별 행 코드와 고유값의 값 id, 값 사전은 이 데이터셋 값만)"""
+
+    def __init__(self, df, columns=SEARCH_COLUMNS):
+        self.terms = TermIndex()
+        self.n_rows = len(df)
+        self.columns = [col for col in columns if col in df.columns]
+        self._columns = {}
+        for col in self.columns:
+            codes, uniques = column_codes(df[col])
+            self._columns[col] = (codes, self.terms.ids(uniques))
+
+    def search(self, query, columns=None, prefix=False):
+        """검색어에 맞는 값이 columns(기본: 모든 색인 컬럼) 중 하나라도 있는 행 위치 (검색어가 비어 있으면 None)"""
+        matched = self.terms.match(query, prefix)
+        if matched is None:
+            return None
+
+        mask = np.zeros(self.n_rows, dtype=bool)
+        if len(matched):
+            for col in columns or self.columns:
+                codes, term_ids = self._columns[col]
+                hit = np.isin(term_ids, matched)
+                if hit.any():
+                    mask |= hit[codes]
+        return np.flatnonzero(mask)
@@ -0,0 +1,175 @@
+"""세션 공용 데이터셋 캐시 (프로세스 하나에 통합 데이터프레임 한 벌, 참조 수 + LRU 제거)
+
+여러 세션이 같은 데이터셋(같은 dataset_key)을 열면 처음 만든 데이터프레임 하나를 함께 쓴다.
+세션은 얕은 복사 뷰를 받으므로(Copy-on-Write) 뷰를 고쳐도 공유 데이터는 바뀌지 않고,
+(pandas 3 미만은 앱 시작 시 enable_copy_on_write()로 켜며, 꺼져 있으면 뷰는 깊은 복사)
+필터/검색/편집은 지금처럼 행 위치와 편집 내역으로 세션마다 따로 유지한다.
+참조하는 세션이 없는 데이터셋은 메모리 한도를 넘을 때 오래 안 쓴 것부터 버린다.
+"""
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+# 참조하는 세션이 없는 데이터셋까지 합쳐 이 크기를 넘으면 오래 안 쓴 것부터 제거
+SHARED_CACHE_MAX_BYTES = int(os.environ.get("EST_SHARED_CACHE_MB", "2048")) * 1024 * 1024
+
+# pandas는 앱 시작 시간에 들어가지 않도록 처음 쓸 때 불러옴 (데이터셋을 만들 때 이미 불러와 있음)
+def _cow_always(pd):
+    """pandas 3부터는 Copy-on-Write가 항상 켜져 있음"""
+    return int(pd.__version__.split(".")[0]) >= 3
+
+def copy_on_write_enabled():
+    import pandas as pd
+    return _cow_always(pd) or bool(pd.get_option("mode.copy_on_write"))
+
+def enable_copy_on_write():
+    """pandas 3 미만에서 Copy-on-Write를 켬 (프로세스 전체 설정이므로 앱 진입점에서 한 번 호출)"""
+    import pandas as pd
+    if not _cow_always(pd):
+        pd.set_option("mode.copy_on_write", True)
+
+class _Entry:
+    """공유 데이터셋 하나 (frame은 만든 뒤 바꾸지 않음)"""
+    __slots__ = ('key', 'frame', 'extras', 'nbytes', 'refs', 'derived', 'lock', 'locks')
+
+    def __init__(self, key, frame, extras):
+        self.key = key
+        self.frame = frame
+        self.extras = extras
+        self.nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        self.refs = 0
+        self.derived = {}   # 이름 -> 데이터셋에서 계산한 결과 (색인, 통계 등)
+        self.lock = threading.Lock()
+        self.locks = {}     # 이름 -> 계산 중 잠금 (같은 결과를 두 세션이 동시에 계산하지 않도록)
+
+class DatasetLease:
+    """세션 하나가 잡고 있는 공유 데이터셋 참조 (release하거나 가비지 수집되면 참조 수 감소)"""
+
+    def __init__(self, cache, entry):
+        self.key = entry.key
+        self._entry = entry
+        self._finalizer = weakref.finalize(self, cache._release, entry)
+
+    @property
+    def extras(self):
+        """데이터셋을 만들 때 함께 돌려준 결과 (예: IP 통합 값 충돌 목록)"""
+        return self._entry.extras
+
+    def view(self):
+        """세션용 뷰 (데이터는 공유, 고치면 그 세션 뷰만 복사됨)
+
+        Copy-on-Write가 꺼져 있으면 얕은 복사를 고칠 때 공유 데이터까지 바뀌므로 깊은 복사를 돌려준다.
+        """
+        return self._entry.frame.copy(deep=not copy_on_write_enabled())
+
+    def derived(self, name, build):
+        """데이터셋에서 계산한 결과를 모든 세션이 공유 (처음 요청한 세션이 한 번만 계산)"""
+        entry = self._entry
+        with entry.lock:
+            if name in entry.derived:
+                return entry.derived[name]
+            lock = entry.locks.setdefault(name, threading.Lock())
+        with lock:
+            with entry.lock:
+                if name in entry.derived:
+                    return entry.derived[name]
+            value = build()
+            with entry.lock:
+                entry.derived[name] = value
+        return value
+
+    def release(self):
+        self._finalizer()
+
+    @property
+    def released(self):
+        return not self._finalizer.alive
+
+class SharedDatasetCache:
+    """dataset_key -> 통합 데이터프레임 (프로세스 전체 공유)
+
+    참조 중인 데이터셋은 버리지 않으며, 같은 데이터셋을 여러 세션이 동시에 요청하면
+    한 세션만 만들고 나머지는 기다렸다가 같은 결과를 받는다.
+    """
+
+    def __init__(self, max_bytes=SHARED_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # 오래 안 쓴 것부터
+        self._building = {}            # 만드는 중인 dataset_key -> threading.Event
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, key, build):
+        """key 데이터셋의 참조 (없으면 build()로 만듦, build는 (데이터프레임, 부가 결과 dict)를 반환)"""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    entry.refs += 1
+                    self.hits += 1
+                    return DatasetLease(self, entry)
+                event = self._building.get(key)
+                if event is None:
+                    event = self._building[key] = threading.Event()
+                    break
+            # 다른 세션이 같은 데이터셋을 만드는 중 (실패했으면 다시 시도)
+            event.wait()
+
+        try:
+            frame, extras = build()
+            entry = _Entry(key, frame, extras)
+        finally:
+            with self._lock:
+                del self._building[key]
+            event.set()
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._nbytes += entry.nbytes
+            entry.refs += 1
+            self._evict()
+        return DatasetLease(self, entry)
+
+    def _release(self, entry):
+        with self._lock:
+            entry.refs -= 1
+            self._evict()
+
+    def _evict(self):
+        """한도를 넘으면 참조 없는 데이터셋을 오래 안 쓴 것부터 제거 (self._lock 안에서 호출)"""
+        if self._nbytes <= self.max_bytes:
+            return
+        for key, entry in list(self._entries.items()):
+            if self._nbytes <= self.max_bytes:
+                break
+            if entry.refs == 0:
+                del self._entries[key]
+                self._nbytes -= entry.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        """참조 없는 데이터셋을 모두 제거"""
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.refs == 0:
+                    del self._entries[key]
+                    self._nbytes -= entry.nbytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                "datasets": len(self._entries),
+                "in_use": sum(1 for e in self._entries.values() if e.refs),
+                "sessions": sum(e.refs for e in self._entries.values()),
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,146 @@
+"""앱 시작(import) 시간 측정과 예산 검사
+
+새 프로세스에서 `python -X importtime -c "import app"`을 여러 번 실행하여
+app 모듈을 불러오는 시간 중 Streamlit을 뺀 앱 자체 몫이 예산 안에 드는지,
+처음 쓸 때 불러오도록 한 모듈(pandas, numpy, openpyxl, yaml)이 시작할 때 불러와지지 않는지 확인한다.
+
+사용 예:
+    python est_startup.py
+    python est_startup.py --runs 9 --budget-ms 80 --json startup.json
+
+종료 코드: 0 예산 안, 1 예산 초과 또는 시작할 때 불러오면 안 되는 모듈을 불러옴
+"""
+import argparse
+import compileall
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 측정할 모듈 (Streamlit이 실행하는 앱 스크립트)
+STARTUP_MODULE = "app"
+
+# 앱이 항상 쓰는 프레임워크 (앱 자체 시작 시간에서 제외)
+# pandas/numpy는 앱 자체 몫으로 세며, 데이터를 처리할 때 불러와야 함
+FRAMEWORK_MODULES = ("streamlit",)
+
+# 해당 기능을 처음 쓸 때 불러와야 하는 모듈 (데이터 처리, 엑셀 내보내기, YAML 파싱)
+LAZY_MODULES = ("pandas", "numpy", "openpyxl", "yaml")
+
+# 앱 자체 시작 시간 예산 (밀리초)
+IMPORT_BUDGET_MS = float(os.environ.get("EST_IMPORT_BUDGET_MS", "100"))
+
+def parse_importtime(stderr):
+    """-X importtime 출력을 [(깊이, 모듈, 자체 us, 누적 us)]로 변환 (출력 순서: 하위 모듈이 먼저)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        head, cumulative_us, name = line.split("|", 2)
+        try:
+            self_us = int(head.rsplit(":", 1)[1])
+            cumulative_us = int(cumulative_us)
+        except ValueError:
+            continue  # 머리글 줄
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), self_us, cumulative_us))
+    return entries
+
+def measure_import(module=STARTUP_MODULE):
+    """새 프로세스에서 module을 불러오는 시간 측정 (반환: {total_ms, framework_ms, own_ms, children, lazy_loaded})"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} 불러오기 실패:\n{proc.stderr[-2000:]}")
+
+    entries = parse_importtime(proc.stderr)
+    # 최상위(깊이 0) 항목 앞에 나온 깊이 1 항목이 그 모듈이 직접 불러온 모듈
+    children = []
+    pending = []
+    total_us = None
+    for depth, name, _, cumulative_us in entries:
+        if depth == 1:
+            pending.append((name, cumulative_us))
+        elif depth == 0:
+            if name == module:
+                total_us = cumulative_us
+                children = pending
+            pending = []
+    if total_us is None:
+        raise RuntimeError(f"importtime 출력에서 {module}을 찾을 수 없습니다")
+
+    framework_us = sum(us for name, us in children if name in FRAMEWORK_MODULES)
+    lazy_loaded = sorted({
+        name.split(".")[0] for _, name, _, _ in entries if name.split(".")[0] in LAZY_MODULES
+    })
+    return {
+        "total_ms": total_us / 1000,
+        "framework_ms": framework_us / 1000,
+        "own_ms": (total_us - framework_us) / 1000,
+        "children": [(name, us / 1000) for name, us in children if name not in FRAMEWORK_MODULES],
+        "lazy_loaded": lazy_loaded,
+    }
+
+def run_startup_benchmark(runs=5, module=STARTUP_MODULE):
+    """runs번 측정한 중앙값 (첫 실행 전 .pyc를 만들어 배포 환경과 같은 조건으로 측정)"""
+    compileall.compile_dir(BASE_DIR, maxlevels=0, quiet=1)
+    samples = [measure_import(module) for _ in range(runs)]
+
+    slowest = {}
+    for sample in samples:
+        for name, ms in sample["children"]:
+            slowest.setdefault(name, []).append(ms)
+    return {
+        "runs": runs,
+        "total_ms": round(statistics.median(s["total_ms"] for s in samples), 1),
+        "framework_ms": round(statistics.median(s["framework_ms"] for s in samples), 1),
+        "own_ms": round(statistics.median(s["own_ms"] for s in samples), 1),
+        "slowest": sorted(
+            ((name, round(statistics.median(ms), 1)) for name, ms in slowest.items()),
+            key=lambda item: -item[1],
+        )[:10],
+        "lazy_loaded": sorted({name for s in samples for name in s["lazy_loaded"]}),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="앱 시작(import) 시간 측정과 예산 검사")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수 (중앙값 사용)")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help="앱 자체 시작 시간 예산 (기본: EST_IMPORT_BUDGET_MS 또는 100)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장")
+    args = parser.parse_args(argv)
+
+    result = run_startup_benchmark(max(1, args.runs))
+    print(
+        f"import {STARTUP_MODULE}: 전체 {result['total_ms']:.1f} ms "
+        f"(프레임워크 {result['framework_ms']:.1f} ms, 앱 자체 {result['own_ms']:.1f} ms / 예산 {args.budget_ms:.0f} ms)"
+    )
+    for name, ms in result["slowest"][:5]:
+        print(f"  {name}: {ms:.1f} ms")
+
+    failures = []
+    if result["own_ms"] > args.budget_ms:
+        failures.append(f"앱 자체 시작 시간 {result['own_ms']:.1f} ms가 예산 {args.budget_ms:.0f} ms를 넘었습니다")
+    if result["lazy_loaded"]:
+        failures.append(f"시작할 때 불러오면 안 되는 모듈을 불러왔습니다: {', '.join(result['lazy_loaded'])}")
+    for message in failures:
+        print(f"❌ {message}", file=sys.stderr)
+
+    if args.json:
+        result.update({
+            "budget_ms": args.budget_ms,
+            "python": platform.python_version(),
+            "passed": not failures,
+        })
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""장비군 통계 (펌프 분포, ToolType 정보, IP/애플리케이션별 레코드 수)"""
+import numpy as np
+import pandas as pd
+
+from est_drift import column_codes
+
+# 펌프 분포를 셀 때 우선 사용하는 컬럼 (앞에 있는 컬럼부터)
+PUMP_COLUMNS = ("장비명", "Pump Type", "applicationName")
+
+def _label_mask(series, text):
+    """값에 text가 들어 있는 행 (대소문자 무시, 고유값마다 한 번만 검사)"""
+    codes, labels = column_codes(series)
+    text = text.lower()
+    label_mask = np.array([text in label.lower() for label in labels], dtype=bool)
+    return codes, labels, label_mask[codes]
+
+def _count_codes(codes, labels, mask=None):
+    """코드별 행 수 (0건 제외, 많은 순)"""
+    if mask is not None:
+        codes = codes[mask]
+    counts = pd.Series(np.bincount(codes, minlength=len(labels)), index=labels)
+    counts = counts[counts > 0]
+    return counts.sort_values(ascending=False, kind='stable')
+
+def value_counts(series, exclude=("-",)):
+    """컬럼 값별 행 수 (빈 값 "-" 제외, 많은 순)"""
+    codes, labels = column_codes(series)
+    counts = _count_codes(codes, labels)
+    return counts[~counts.index.isin(exclude)]
+
+def compute_fleet_stats(df):
+    """펌프 분포, ToolType 정보, IP/애플리케이션별 레코드 수 계산
+
+    반환 키: total_records, unique_ips, unique_pumps, pump_breakdown(dict), tooltype_info(dict),
+    ip_counts(Series), application_counts(Series)
+    """
+    if df is None or df.empty:
+        return None
+
+    result = {
+        'total_records': len(df),
+        'unique_ips': 0,
+        'unique_pumps': 0,
+        'pump_breakdown': {},
+        'tooltype_info': {},
+        'ip_counts': pd.Series(dtype='int64'),
+        'application_counts': pd.Series(dtype='int64'),
+    }
+
+    if 'IP' in df.columns:
+        result['unique_ips'] = df['IP'].nunique()
+        result['ip_counts'] = value_counts(df['IP'])
+
+    # 펌프만 집계 (이름에 Pump가 포함된 항목)
+    pump_col = next((col for col in PUMP_COLUMNS if col in df.columns), None)
+    if pump_col:
+        codes, labels, pump_mask = _label_mask(df[pump_col], 'Pump')
+        pump_counts = _count_codes(codes, labels, pump_mask)
+        result['unique_pumps'] = len(pump_counts)
+        result['pump_breakdown'] = pump_counts.to_dict()
+
+    if 'applicationName' in df.columns:
+        result['application_counts'] = value_counts(df['applicationName'])
+
+        # ToolType 정보 (해당 행만 골라 name → Version, 같은 name은 마지막 값)
+        _, _, tooltype_mask = _label_mask(df['applicationName'], 'ToolType')
+        if tooltype_mask.any() and 'name' in df.columns and 'Version' in df.columns:
+            positions = np.flatnonzero(tooltype_mask)
+            names = df['name'].take(positions).astype(str)
+            versions = df['Version'].take(positions).astype(str)
+            result['tooltype_info'] = {
+                name: version for name, version in zip(names, versions) if name and version
+            }
+
+    return result
+
+def ip_summary(df):
+    """IP별 레코드 수, 장비명/파일/버전 종류 수 (리포트 요약 시트용)"""
+    if df is None or df.empty or 'IP' not in df.columns:
+        return None
+
+    ip = df['IP'].astype(str)
+    aggregations = {"레코드 수": ('IP', 'size')}
+    for col, label in (("장비명", "장비명 수"), ("Source_File", "파일 수"), ("Version", "버전 종류")):
+        if col in df.columns:
+            aggregations[label] = (col, 'nunique')
+
+    summary = df.groupby(ip, sort=True, observed=True).agg(**aggregations)
+    summary.index.name = 'IP'
+    return summary.reset_index()
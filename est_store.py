@@ -0,0 +1,144 @@
+"""통합 장비 데이터 영구 저장소 (SQLite, 컬럼 단위 사전 인코딩)
+
+저장할 때의 컬럼 매핑 버전(COLUMN_MAPPER_VERSION)을 함께 기록하며, 매핑이 바뀐 뒤에는
+예전 컬럼 의미로 저장된 데이터를 불러오지 않는다 (원본 파일에서 다시 통합하여 저장해야 함).
+"""
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from est_parser import COLUMN_MAPPER_VERSION
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS column_data (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    is_category INTEGER NOT NULL,
+    categories TEXT NOT NULL,
+    codes BLOB NOT NULL
+);
+"""
+
+def _encode_column(series):
+    """컬럼을 (정수 코드 배열, 고유값 리스트)로 사전 인코딩"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype='<i4'), series.cat.categories.tolist()
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes.astype('<i4'), list(uniques)
+
+def _decode_column(is_category, categories, codes):
+    if is_category and pd.Index(categories).is_unique:
+        return pd.Categorical.from_codes(codes, categories=categories)
+    lookup = np.empty(len(categories), dtype=object)
+    lookup[:] = categories
+    return lookup[codes]
+
+class StoreError(ValueError):
+    """저장소를 불러올 수 없을 때 발생 (예: 저장 후 컬럼 매핑이 바뀜)"""
+
+class FleetStore:
+    """parse_with_ip_merge 결과를 SQLite 파일 하나에 저장/조회
+    
+    각 컬럼은 고유값 목록 + 정수 코드 배열(BLOB)로 저장되어 불러올 때 행 단위 변환이 없다.
+    필터/검색은 불러온 데이터프레임의 세션 공용 색인(FilterIndex, SearchIndex)으로 처리한다.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+    
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        con = sqlite3.connect(self.path)
+        con.execute("PRAGMA journal_mode=WAL")  # 여러 세션이 동시에 읽을 수 있도록
+        con.executescript(SCHEMA)
+        return con
+    
+    def save(self, df, source=""):
+        """데이터프레임 전체를 저장 (기존 내용은 교체)"""
+        con = self._connect()
+        try:
+            with con:
+                con.execute("DELETE FROM meta")
+                con.execute("DELETE FROM column_data")
+                # 예전 버전 저장소의 값 색인 (더 이상 쓰지 않음)
+                con.execute("DROP TABLE IF EXISTS value_index")
+                
+                for position, col in enumerate(df.columns):
+                    codes, categories = _encode_column(df[col])
+                    con.execute(
+                        "INSERT INTO column_data VALUES (?, ?, ?, ?, ?)",
+                        (
+                            col,
+                            position,
+                            int(isinstance(df[col].dtype, pd.CategoricalDtype)),
+                            json.dumps(categories, ensure_ascii=False, default=str),
+                            codes.tobytes(),
+                        ),
+                    )
+                
+                meta = {
+                    "rows": str(len(df)),
+                    "revision": uuid.uuid4().hex,  # 저장할 때마다 바뀌는 식별자 (캐시 키용)
+                    "saved_at": datetime.now().isoformat(timespec='seconds'),
+                    "source": source,
+                    "mapper_version": COLUMN_MAPPER_VERSION,
+                }
+                con.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        finally:
+            con.close()
+    
+    def info(self):
+        """저장된 데이터 정보 (rows, revision, saved_at, source, mapper_version, stale), 없으면 None
+        
+        stale은 저장한 뒤 컬럼 매핑이 바뀌어 불러올 수 없는 상태 (load가 StoreError 발생)
+        """
+        if not os.path.exists(self.path):
+            return None
+        con = self._connect()
+        try:
+            meta = dict(con.execute("SELECT key, value FROM meta").fetchall())
+        finally:
+            con.close()
+        if not meta:
+            return None
+        meta["rows"] = int(meta.get("rows", 0))
+        meta["stale"] = meta.get("mapper_version") != COLUMN_MAPPER_VERSION
+        return meta
+    
+    def load(self):
+        """저장된 데이터프레임 읽기 (저장한 뒤 컬럼 매핑이 바뀌었으면 StoreError)"""
+        con = self._connect()
+        try:
+            row = con.execute("SELECT value FROM meta WHERE key = 'mapper_version'").fetchone()
+            if row is not None and row[0] != COLUMN_MAPPER_VERSION:
+                raise StoreError("저장한 뒤 컬럼 매핑이 바뀌었습니다. 원본 파일에서 다시 통합하여 저장하세요.")
+            records = con.execute(
+                "SELECT name, is_category, categories, codes FROM column_data ORDER BY position"
+            ).fetchall()
+        finally:
+            con.close()
+        
+        data = {}
+        for name, is_category, categories, codes in records:
+            codes = np.frombuffer(codes, dtype='<i4')
+            data[name] = _decode_column(is_category, json.loads(categories), codes)
+        return pd.DataFrame(data)
+    
+    def clear(self):
+        con = self._connect()
+        try:
+            with con:
+                con.execute("DELETE FROM meta")
+                con.execute("DELETE FROM column_data")
+                con.execute("DROP TABLE IF EXISTS value_index")
+        finally:
+            con.close()
@@ -0,0 +1,172 @@
+"""가상 EST 내보내기 파일 생성기 (성능 측정/부하 테스트용)
+
+실제 EST 파일과 같은 두 가지 구조를 만든다.
+- equipment: equipment[].applications[].versionInformation[] (+ summaryVersionInformation)
+- summary: name/ipAddress + summaryVersionInformation[]
+
+사용 예:
+    python est_synth.py bench_data --tools 500 --apps 40 --format both --shape both
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+import yaml
+
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+SERVICE_NAMES = (
+    "Authentication", "CoreService", "CustomerInterfaces.EdCentraGateway",
+    "CustomerInterfaces.Modbus", "CustomerInterfaces.SecsGem", "CustomerInterfaces.UiClientGateway",
+    "DataLoggers.Alert", "DataLoggers.AuditTrail", "DataLoggers.EquipmentStatus",
+    "DataLoggers.Event", "DataLoggers.Parameter", "DataLoggers.SerialNumber",
+    "FeedEngines.HardwareMonitor", "FeedEngines.Modbus", "FeedEngines.Plf",
+    "FeedEngines.ToolType", "FeedEngines.Udp", "NetworkApi", "PurgeManager",
+    "ServiceManager", "UpgradeService",
+)
+PUMP_PREFIXES = ("S", "RS", "RB", "EXP")
+
+FORMATS = ("json", "yaml")
+SHAPES = ("equipment", "summary")
+
+def _release_versions(rng, count):
+    """애플리케이션 하나의 배포 이력 (오래된 것 → 최신 순)"""
+    versions = set()
+    while len(versions) < count:
+        versions.add((2025, rng.randint(1, 12), rng.randint(1, 28), rng.randint(1, 5)))
+    return [".".join(map(str, v)) for v in sorted(versions)]
+
+class FleetSpec:
+    """장비군 전체가 공유하는 애플리케이션 목록과 버전 분포 (같은 seed면 항상 같은 결과)"""
+
+    def __init__(self, apps=40, seed=0, versions_per_app=4):
+        rng = random.Random(seed)
+        self.services = []
+        self.pumps = []
+
+        # 애플리케이션의 절반 정도는 서비스, 나머지는 펌프 (펌프는 이름 2개씩)
+        n_services = max(1, apps // 2)
+        for i in range(n_services):
+            base = SERVICE_NAMES[i % len(SERVICE_NAMES)]
+            name = f"Edwards.{base}" if i < len(SERVICE_NAMES) else f"Edwards.{base}{i // len(SERVICE_NAMES)}"
+            self.services.append((name, _release_versions(rng, versions_per_app)))
+
+        for i in range(max(1, (apps - n_services) // 2)):
+            prefix = PUMP_PREFIXES[i % len(PUMP_PREFIXES)]
+            name = f"{prefix}{i // len(PUMP_PREFIXES) + 1} Pump"
+            drawing = rng.randint(37000000, 37999999)
+            tags = [f"D{drawing}_V{v}" for v in range(1, versions_per_app + 1)]
+            modules = sorted(rng.sample(range(255500000, 255599999), versions_per_app))
+            self.pumps.append((name, tags, modules))
+
+    @staticmethod
+    def pick(rng, versions):
+        """대부분은 최신 버전, 일부는 이전 버전 (버전 드리프트 재현)"""
+        roll = rng.random()
+        if roll < 0.7 or len(versions) == 1:
+            return versions[-1]
+        if roll < 0.9:
+            return versions[-2]
+        return rng.choice(versions[:-2] or versions)
+
+def tool_ip(index):
+    return f"10.{index // 62500 % 256}.{index // 250 % 250}.{index % 250 + 1}"
+
+def tool_entries(spec, rng, fmt):
+    """장비 하나의 (applicationName, name, version) 목록"""
+    entries = []
+    for app, versions in spec.services:
+        entries.append((app, app, spec.pick(rng, versions)))
+    for app, tags, modules in spec.pumps:
+        module = spec.pick(rng, modules)
+        # 실제 YAML 내보내기는 숫자 버전을 따옴표 없이 써서 정수로 읽힌다
+        entries.append((app, "Pump Node - User Tag", spec.pick(rng, tags)))
+        entries.append((app, "Pump Node Module", module if fmt == "yaml" else str(module)))
+    entries.append(("ToolType", "System Name", rng.choice(("VIZEON", "EUVZenith", "DEMO-TOOL"))))
+    entries.append(("ToolType", "Location", f"LINE-{rng.randint(1, 20):02d}"))
+    return entries
+
+def generate_tool(spec, index, shape="equipment", fmt="json", seed=0):
+    """장비 하나의 EST 문서 (dict)"""
+    rng = random.Random(seed * 1_000_003 + index)
+    ip = tool_ip(index)
+    entries = tool_entries(spec, rng, fmt)
+    summary = [{"applicationName": a, "name": n, "version": v} for a, n, v in entries]
+
+    if shape == "summary":
+        return {"name": "Summary", "ipAddress": ip, "applications": [], "summaryVersionInformation": summary}
+
+    # 애플리케이션별로 묶어 equipment 구조로 (서비스 묶음 + 펌프마다 하나 + ToolType)
+    grouped = {}
+    for app, name, version in entries:
+        grouped.setdefault(app, []).append({"name": name, "version": version})
+
+    equipment = [{
+        "name": f"Tool-{index:05d}",
+        "ipAddress": ip,
+        "applications": [
+            {"applicationName": app, "versionInformation": infos}
+            for app, infos in grouped.items()
+            if not app.endswith(" Pump")
+        ],
+    }]
+    for app, infos in grouped.items():
+        if app.endswith(" Pump"):
+            equipment.append({
+                "name": app,
+                "ipAddress": ip,
+                "applications": [{"applicationName": app, "versionInformation": infos}],
+            })
+
+    return {
+        "generatedAt": "2026-01-01T07:00:00Z",
+        "equipment": equipment,
+        "summaryVersionInformation": summary,
+    }
+
+def dump_document(doc, fmt):
+    if fmt == "yaml":
+        return yaml.dump(doc, Dumper=YAML_DUMPER, sort_keys=False, allow_unicode=True).encode('utf-8')
+    return json.dumps(doc, ensure_ascii=False, indent=2).encode('utf-8')
+
+def write_fleet(out_dir, tools=100, apps=40, formats=FORMATS, shapes=SHAPES, seed=0):
+    """장비 tools대 × 애플리케이션 apps개의 EST 파일을 out_dir에 생성 (반환: 파일 경로 목록)
+
+    형식(json/yaml)과 구조(equipment/summary)는 장비마다 번갈아 사용한다.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    spec = FleetSpec(apps, seed)
+    paths = []
+
+    for index in range(tools):
+        fmt = formats[index % len(formats)]
+        shape = shapes[index // len(formats) % len(shapes)]
+        doc = generate_tool(spec, index, shape, fmt, seed)
+        path = os.path.join(out_dir, f"tool_{index:05d}_{shape}.{fmt}")
+        with open(path, 'wb') as f:
+            f.write(dump_document(doc, fmt))
+        paths.append(path)
+
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가상 EST 내보내기 파일 생성")
+    parser.add_argument("out_dir", help="생성할 폴더")
+    parser.add_argument("--tools", type=int, default=100, help="장비(파일) 수")
+    parser.add_argument("--apps", type=int, default=40, help="장비당 애플리케이션 수")
+    parser.add_argument("--format", choices=FORMATS + ("both",), default="both")
+    parser.add_argument("--shape", choices=SHAPES + ("both",), default="both")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    formats = FORMATS if args.format == "both" else (args.format,)
+    shapes = SHAPES if args.shape == "both" else (args.shape,)
+    paths = write_fleet(args.out_dir, args.tools, args.apps, formats, shapes, args.seed)
+    total = sum(os.path.getsize(p) for p in paths)
+    print(f"{len(paths)}개 파일 생성 ({total / 1e6:.1f} MB): {args.out_dir}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
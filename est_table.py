@@ -0,0 +1,49 @@
+"""장비 리스트 표의 서버 측 처리 (정렬, 페이지 나누기)
+
+브라우저에는 현재 페이지의 행만 보내고, 정렬은 통합 데이터 전체를 대상으로 계산한다.
+행은 통합 데이터프레임의 행 위치로 식별한다 (값 검색은 est_search).
+"""
+import numpy as np
+import pandas as pd
+
+from est_drift import column_codes, version_ranks
+
+PAGE_SIZES = (50, 100, 200, 500)
+
+def sort_order(df, column, descending=False):
+    """column 기준 전체 행 순서 (숫자 조각은 숫자로 비교, 같은 값은 원래 순서, 빈 값은 항상 마지막)"""
+    codes, uniques = column_codes(df[column])
+    # 버전 정렬 키는 IP(10.0.0.9 < 10.0.0.10)나 장비명(S2 < S10)에도 자연스러운 순서
+    keys = version_ranks(uniques)[codes].astype(np.int64)
+    missing = keys < 0
+    if descending:
+        keys = keys.max(initial=0) - keys
+    keys[missing] = len(uniques)
+    return np.argsort(keys, kind='stable')
+
+def view_positions(n_rows, positions=None, order=None):
+    """필터/검색 결과(positions)와 정렬 순서(order)를 합친 표시 행 위치"""
+    keep = None
+    if positions is not None:
+        keep = np.zeros(n_rows, dtype=bool)
+        keep[positions] = True
+
+    if order is None:
+        return np.arange(n_rows) if keep is None else np.flatnonzero(keep)
+    return order if keep is None else order[keep[order]]
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+def page_positions(positions, page, page_size):
+    """1부터 시작하는 page 번호의 행 위치"""
+    start = (page - 1) * page_size
+    return positions[start:start + page_size]
+
+def table_frame(df, positions, columns):
+    """표시/내보내기용 프레임 (category 컬럼은 편집할 수 있도록 일반 값으로)"""
+    frame = df.take(positions)[columns]
+    return frame.astype({
+        col: object for col in columns
+        if isinstance(frame[col].dtype, pd.CategoricalDtype)
+    })
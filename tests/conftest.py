@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 모듈이 저장소 최상위에 있으므로 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,165 @@
+"""장비 수집기 테스트 (로컬 스텁 HTTP 서버)"""
+import gzip
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import est_collect
+from est_collect import export_file_name, iter_collected
+from est_merge import build_merged_frame
+from est_parser import parse_file_job, run_parse_jobs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _read(name):
+    with open(os.path.join(ROOT, name), 'rb') as f:
+        return f.read()
+
+# 실제 장비 내보내기 샘플 (경로 -> 파일 이름, Content-Type, gzip 전송 여부)
+SAMPLES = {
+    "/export/json": ("est_real_sample.json", "application/json", False),
+    "/export/yaml": ("est_real_sample.yaml", "application/x-yaml; charset=utf-8", True),
+}
+EXPORT = _read("est_real_sample.json")
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+
+        if self.path in SAMPLES:
+            name, content_type, compressed = SAMPLES[self.path]
+            headers = [("Content-Type", content_type)]
+            body = _read(name)
+            if compressed:
+                body = gzip.compress(body)
+                headers.append(("Content-Encoding", "gzip"))
+            self._send(200, body, headers)
+        elif self.path.startswith("/ok/"):
+            with server.lock:
+                server.active += 1
+                server.max_active = max(server.max_active, server.active)
+            time.sleep(0.1)
+            with server.lock:
+                server.active -= 1
+            self._send(200, EXPORT, [("Content-Type", "application/json")])
+        elif self.path == "/flaky":
+            if hits == 1:
+                self._send(503, b"busy")
+            else:
+                self._send(200, EXPORT)
+        elif self.path == "/slow":
+            time.sleep(1.0)
+            self._send(200, EXPORT)
+        elif self.path == "/chunked":
+            body = gzip.compress(EXPORT)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 7):
+                chunk = body[start:start + 7]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self._send(404, b"")
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = {}
+    server.active = server.max_active = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_concurrency_is_limited(stub):
+    server, base = stub
+    targets = [f"{base}/ok/{i}" for i in range(8)]
+    results = list(iter_collected(targets, concurrency=3, timeout=5))
+    assert all(error is None and content == EXPORT for _, content, error in results)
+    assert len({name for name, _, _ in results}) == len(targets)
+    assert 2 <= server.max_active <= 3
+
+def test_retries_on_503(stub):
+    server, base = stub
+    [(name, content, error)] = iter_collected([f"{base}/flaky"], retries=2, backoff=0.01, timeout=5)
+    assert error is None and content == EXPORT
+    assert server.hits["/flaky"] == 2
+
+def test_timeout(stub):
+    _, base = stub
+    [(name, content, error)] = iter_collected([f"{base}/slow"], retries=0, timeout=0.2)
+    assert content is None
+    assert "시간 초과" in error[1]
+
+def test_chunked_gzip(stub):
+    _, base = stub
+    [(name, content, error)] = iter_collected([f"{base}/chunked"], timeout=5)
+    assert error is None
+    assert content == EXPORT
+
+def test_urls_on_one_host_get_distinct_names(stub, tmp_path):
+    _, base = stub
+    urls = [f"{base}/ok/a", f"{base}/ok/b", f"{base}/ok/a?tool=2"]
+    names = {export_file_name(url, {}, url) for url in urls}
+    assert len(names) == len(urls)
+
+    targets = tmp_path / "tools.txt"
+    targets.write_text("\n".join(urls), encoding="utf-8")
+    out = tmp_path / "out"
+    assert est_collect.main([str(targets), "-o", str(out), "-q"]) == 0
+    assert sorted(p.name for p in out.iterdir()) == sorted(names)
+
+def _frame(results):
+    blocks = []
+    for block, _, error in results:
+        assert error is None
+        blocks.append(block)
+    # 수집한 파일 이름은 장비 주소 기준이므로 원본 파일 컬럼만 빼고 비교
+    return build_merged_frame(blocks).drop(columns="Source_File")
+
+def test_collected_exports_parse_like_files(stub):
+    _, base = stub
+    urls = [f"{base}{path}" for path in SAMPLES]
+    collected = {}
+    for name, content, error in iter_collected(urls, timeout=5):
+        assert error is None
+        collected[name] = content
+    
+    # Content-Type으로 형식을 정하고, gzip 응답은 풀어서 원본과 같은 내용
+    names = [export_file_name(url, {"content-type": SAMPLES[path][1]}, url) for url, path in zip(urls, SAMPLES)]
+    assert sorted(collected) == sorted(names)
+    assert [name.rsplit(".", 1)[1] for name in names] == ["json", "yaml"]
+    for name, (file_name, _, _) in zip(names, SAMPLES.values()):
+        assert collected[name] == _read(file_name)
+    
+    merged = _frame(run_parse_jobs([(collected[name], name) for name in names], workers=1))
+    direct = _frame([parse_file_job(_read(file_name), file_name) for file_name, _, _ in SAMPLES.values()])
+    assert len(merged) > 0
+    pd.testing.assert_frame_equal(merged, direct)
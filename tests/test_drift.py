@@ -0,0 +1,31 @@
+"""버전 드리프트 분석 테스트"""
+import pandas as pd
+
+from est_batch import collect_inputs, parse_inputs
+from est_drift import analyze_version_drift, column_codes
+from est_merge import build_merged_frame
+from est_synth import write_fleet
+
+def test_column_codes_merges_values_equal_as_strings():
+    codes, uniques = column_codes(pd.Series([255593094, "255593094", None, "-", "x"], dtype=object))
+    assert list(uniques) == ["255593094", "-", "x"]
+    assert list(codes) == [0, 0, 1, 1, 2]
+
+def test_mixed_json_yaml_fleet_has_no_lagging_baseline_versions(tmp_path):
+    # YAML은 숫자 버전(예: 255593094)을 int로, JSON은 문자열로 읽으므로 같은 버전이 두 타입으로 섞임
+    write_fleet(str(tmp_path), tools=40, apps=10, formats=("json", "yaml"))
+    blocks, errors, _ = parse_inputs(collect_inputs([str(tmp_path)]), workers=1)
+    assert not errors
+    df = build_merged_frame(blocks)
+    assert {type(v) for v in df["Version"].astype(object)} >= {int, str}
+
+    for baseline in ("newest", "mode"):
+        drift = analyze_version_drift(df, baseline)
+        lagging = drift["lagging"]
+        assert len(lagging)
+        assert not (lagging["Version"].astype(str) == lagging["기준 버전"].astype(str)).any()
+
+        # 버전을 모두 문자열로 바꾼 데이터와 같은 결과 (버전 종류 수가 부풀지 않음)
+        as_text = analyze_version_drift(df.assign(Version=df["Version"].astype(str)), baseline)
+        pd.testing.assert_frame_equal(drift["summary"], as_text["summary"])
+        assert len(lagging) == len(as_text["lagging"])
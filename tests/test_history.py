@@ -0,0 +1,44 @@
+"""스냅샷 이력 테스트"""
+import pandas as pd
+import pytest
+
+from est_history import SnapshotHistory, normalize_timestamp
+
+def _fleet(version, generated_at=None):
+    df = pd.DataFrame({
+        "IP": ["10.0.0.1", "10.0.0.2"],
+        "applicationName": ["CoreService", "CoreService"],
+        "name": ["-", "-"],
+        "Version": [version, "1.0"],
+    })
+    if generated_at is not None:
+        df.attrs["generated_at"] = generated_at
+    return df
+
+def test_normalize_timestamp():
+    assert normalize_timestamp("2026-01-01T07:00:00Z") == "2026-01-01T07:00:00+00:00"
+    assert normalize_timestamp("2026-01-01 16:00:00+09:00") == "2026-01-01T07:00:00+00:00"
+    for bad in ("yesterday", "", None):
+        with pytest.raises(ValueError):
+            normalize_timestamp(bad)
+
+def test_snapshots_use_export_time(tmp_path):
+    history = SnapshotHistory(str(tmp_path / "history.sqlite"))
+    history.record(_fleet("1.0", "2026-01-01T07:00:00Z"))
+    history.record(_fleet("2.0", "2026-01-02T07:00:00+00:00"))
+    assert list(history.snapshots()["taken_at"]) == ["2026-01-01T07:00:00+00:00", "2026-01-02T07:00:00+00:00"]
+
+    # 시간대가 다른 표기도 같은 시각으로 비교
+    state = history.state_at("2026-01-01 20:00:00+09:00", ip="10.0.0.1")
+    assert list(state["Version"]) == ["1.0"]
+    diff = history.changes_between("2026-01-01T07:00:00Z", "2026-01-03")
+    assert list(diff["새 값"]) == ["2.0"]
+
+    # 마지막 스냅샷보다 오래된 내보내기 파일과 읽을 수 없는 시각은 거부
+    with pytest.raises(ValueError):
+        history.record(_fleet("3.0", "2025-12-31T00:00:00Z"))
+    with pytest.raises(ValueError):
+        history.record(_fleet("3.0"), taken_at="not a time")
+    with pytest.raises(ValueError):
+        history.state_at("not a time")
+    assert len(history.snapshots()) == 2
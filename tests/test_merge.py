@@ -0,0 +1,48 @@
+"""IP 기준 통합 테스트"""
+import pytest
+
+from est_merge import merge_ip_blocks
+from est_parser import ColumnBlock
+
+def _block(source, generated_at, version, model):
+    block = ColumnBlock().extend([{
+        "IP": "10.0.0.1", "Source_File": source, "Version": version, "Model": model,
+    }])
+    block.ip_merge = True
+    block.generated_at = generated_at
+    return block
+
+def _blocks():
+    # 먼저 읽은 파일이 더 오래된 내보내기
+    return [
+        _block("configs/old.json", "2026-01-01T07:00:00Z", "1.0", "A"),
+        _block("configs/new.json", "2026-01-02T07:00:00+00:00", "2.0", "-"),
+    ]
+
+@pytest.mark.parametrize("policy, priority, version, files", [
+    ("first", (), "1.0", ["configs/old.json", "configs/new.json"]),
+    ("newest", (), "2.0", ["configs/new.json", "configs/old.json"]),
+    ("priority", ("new.json",), "2.0", ["configs/new.json", "configs/old.json"]),
+    ("priority", ("configs/old.json", "new.json"), "1.0", ["configs/old.json", "configs/new.json"]),
+])
+def test_merge_policies(policy, priority, version, files):
+    conflicts = []
+    merged = merge_ip_blocks(_blocks(), policy=policy, priority=priority, conflicts=conflicts)
+    
+    assert len(merged) == 1
+    assert merged.columns["IP"] == ["10.0.0.1"]
+    assert merged.columns["Version"] == [version]
+    assert merged.columns["Source_File"] == [files[0]]
+    # 우선 파일의 값이 비어 있으면 다음 파일 값으로 채움 (충돌 아님)
+    assert merged.columns["Model"] == ["A"]
+    
+    [frame] = conflicts
+    assert list(frame["IP"]) == ["10.0.0.1", "10.0.0.1"]
+    assert list(frame["컬럼"]) == ["Version", "Version"]
+    assert list(frame["값"]) == [version, "2.0" if version == "1.0" else "1.0"]
+    assert list(frame["파일"]) == files
+    assert list(frame["선택"]) == [True, False]
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        merge_ip_blocks(_blocks(), policy="latest")
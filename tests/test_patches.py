@@ -0,0 +1,19 @@
+"""편집 내역 테스트"""
+from est_patches import PatchLog
+
+KEY = ("10.0.0.1", "CoreService", "-")
+
+def test_set_many_writes_one_batch(tmp_path):
+    path = str(tmp_path / "patches.sqlite")
+    log = PatchLog(path)
+    edits = [(KEY, "Version", "1.0", "2.0"), (KEY, "Model", "A", "B"), (KEY, "Model", "A", "A")]
+    assert log.set_many(edits) == 3
+    assert [(column, old, new) for _, column, old, new, _ in log.entries()] == [("Version", "1.0", "2.0")]
+    assert log.set_many(edits[:1]) == 0
+    log.close()
+    
+    reopened = PatchLog(path)
+    assert reopened.get(KEY, "Version")[:2] == ("1.0", "2.0")
+    assert reopened.set(KEY, "Version", "2.0", "1.0")
+    assert len(reopened) == 0
+    reopened.close()
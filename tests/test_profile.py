@@ -0,0 +1,43 @@
+"""단계별 계측 테스트"""
+import tracemalloc
+
+from est_profile import StageProfiler
+
+def test_stage_records_time_and_memory():
+    profiler = StageProfiler()
+    tracemalloc.start()
+    try:
+        with profiler.stage("outer") as outer:
+            big = bytearray(8_000_000)
+            del big
+            with profiler.stage("inner", "a.json", 10) as inner:
+                small = bytearray(1_000_000)
+                inner.rows = 1
+                del small
+            outer.rows = 2
+    finally:
+        tracemalloc.stop()
+
+    records = {rec["stage"]: rec for rec in profiler.records}
+    # 바깥 단계의 최대값은 안쪽 단계가 초기화한 뒤에도 유지
+    assert records["outer"]["peak_mb"] >= 8
+    assert 1 <= records["inner"]["peak_mb"] < 8
+    assert records["inner"]["bytes"] == 10 and records["inner"]["rows"] == 1
+
+    summary = {row["stage"]: row for row in profiler.summary()}
+    assert summary["inner"]["files"] == 1
+    assert summary["outer"]["peak_mb"] == records["outer"]["peak_mb"]
+
+def test_memory_without_tracing():
+    profiler = StageProfiler()
+    with profiler.stage("work"):
+        pass
+    [rec] = profiler.records
+    assert rec["peak_mb"] is None
+    assert "rss_mb" in rec
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler(enabled=False)
+    with profiler.stage("work") as stage:
+        stage.rows = 3
+    assert profiler.records == []
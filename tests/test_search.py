@@ -0,0 +1,49 @@
+"""값 검색 색인 테스트"""
+import numpy as np
+import pandas as pd
+
+from est_search import SearchIndex
+from est_table import view_positions
+
+DF = pd.DataFrame({
+    "IP": pd.Categorical(["10.0.0.1", "10.0.0.2", "10.0.0.10", "10.0.0.2"]),
+    "applicationName": ["Edwards.CoreService", "DataLoggers.Alert", None, "CoreService"],
+    "Version": [255593094, "2025.12.11.3", "D37486834_V5", "-"],
+})
+
+def _scan(df, query, columns):
+    """모든 값을 직접 확인하는 기준 결과"""
+    query = query.casefold()
+    return [
+        i for i in range(len(df))
+        if any(df[c].iloc[i] is not None and query in str(df[c].iloc[i]).casefold() for c in columns)
+    ]
+
+def test_substring_search_matches_scan():
+    index = SearchIndex(DF, columns=tuple(DF.columns))
+    for query in ("10.0.0.1", "core", "2025", "V5", "5", "9309", "zzz", "s.a"):
+        assert index.search(query).tolist() == _scan(DF, query, DF.columns), query
+    assert index.search("  ") is None
+
+def test_column_and_prefix_search():
+    index = SearchIndex(DF, columns=tuple(DF.columns))
+    assert index.search("10", columns=["Version"]).tolist() == []
+    assert index.search("core", prefix=True).tolist() == [0, 3]
+    assert index.search("ervice", prefix=True).tolist() == []
+    assert index.search("d374", prefix=True).tolist() == [2]
+
+def test_term_index_is_per_dataset():
+    index = SearchIndex(DF, columns=("IP",))
+    more = SearchIndex(pd.DataFrame({"IP": ["10.0.0.1", "10.0.0.99"]}), columns=("IP",))
+    # 값 사전은 각 데이터셋의 값만 가짐 (다른 데이터셋을 버리면 그 값도 함께 버려짐)
+    assert index.terms is not more.terms
+    assert sorted(index.terms.terms) == ["10.0.0.1", "10.0.0.10", "10.0.0.2"]
+    assert sorted(more.terms.terms) == ["10.0.0.1", "10.0.0.99"]
+    assert more.search("0.99").tolist() == [1]
+    assert index.search("0.99").tolist() == []
+
+def test_view_positions():
+    order = np.array([3, 2, 1, 0])
+    assert view_positions(4).tolist() == [0, 1, 2, 3]
+    assert view_positions(4, np.array([0, 2])).tolist() == [0, 2]
+    assert view_positions(4, np.array([0, 2]), order).tolist() == [2, 0]